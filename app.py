@@ -1,12 +1,25 @@
 import os
 from flask import Flask, render_template
 from flask_login import LoginManager
-from flask_pymongo import PyMongo
 from flask_wtf import CSRFProtect
 from config import Config
 from bson.objectid import ObjectId
+from services.db_utils import mongo, get_db, init_db
+from services.user_cache import user_cache
+from services.purge import purge_worker
+from services.password_hasher import password_hasher, PasswordHasherBusy
+from services.worker_gauge import worker_gauge
+from services.json_provider import OrjsonProvider
+from services.response_cache import response_cache
+from services.assets import assets
+from services.admission import admission
+from services.capture_pacing import capture_pacer
+from services.stage_metrics import stage_metrics, stage
+from services.profiling import request_profiler
+from services.thread_budget import thread_budget
+from services.face_detectors import face_detector
+from services.face_tracking import face_trackers
 
-mongo = PyMongo()
 login_manager = LoginManager()
 csrf = CSRFProtect()
 login_manager.login_view = 'auth.login'
@@ -14,21 +27,48 @@ login_manager.login_message_category = 'info'
 
 def create_app():
     app = Flask(__name__, static_folder="static", template_folder="templates")
+    app.json = OrjsonProvider(app)
     app.config.from_object(Config)
 
+    # Before anything can import torch/TensorFlow/OpenCV/BLAS
+    thread_budget.init_app(app)
+
     # Initialize extensions
-    mongo.init_app(app)
+    init_db(app)
     login_manager.init_app(app)
     csrf.init_app(app)
+    user_cache.init_app(app)
+    purge_worker.init_app(app)
+    worker_gauge.init_app(app)
+    password_hasher.init_app(app)
+    response_cache.init_app(app)
+    assets.init_app(app)
+    admission.init_app(app)
+    capture_pacer.init_app(app)
+    stage_metrics.init_app(app)
+    request_profiler.init_app(app)
+    face_detector.init_app(app)
+    face_trackers.init_app(app)
 
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+    # Resume purges that failed or were left behind by a worker that died
+    purge_worker.start(get_db())
+
     # User loader callback
     @login_manager.user_loader
     def load_user(user_id):
         from models.user import User
         try:
-            user_data = mongo.db.users.find_one({'_id': ObjectId(user_id)})
+            with stage('auth'):
+                user_data = user_cache.get(user_id)
+                if user_data is None:
+                    user_data = get_db().users.find_one(
+                        {'_id': ObjectId(user_id), 'deleted': {'$ne': True}},
+                        user_cache.projection()
+                    )
+                    if user_data:
+                        user_cache.set(user_id, user_data)
             if user_data:
                 return User(user_data)
         except Exception as e:
@@ -42,6 +82,7 @@ def create_app():
     from routes.admin import admin_bp
     from routes.wellness import wellness_bp
     from routes.settings import settings_bp
+    from routes.liveclass import liveclass_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(emotion_bp, url_prefix='/emotion')
@@ -49,6 +90,15 @@ def create_app():
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(wellness_bp, url_prefix='/wellness')
     app.register_blueprint(settings_bp, url_prefix='/settings')
+    app.register_blueprint(liveclass_bp, url_prefix='/liveclass')
+
+    from cli import register_commands
+    register_commands(app)
+
+    # Heavy ML modules load lazily; optionally start loading them right away
+    if app.config.get('ML_WARMUP') == 'background':
+        from services.lazy_loader import warm_up_in_background
+        warm_up_in_background()
 
     # Error handlers
     @app.errorhandler(404)
@@ -59,11 +109,13 @@ def create_app():
     def internal_error(error):
         return render_template('error.html', error_code=500), 500
 
-    return app
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        return render_template('error.html', error_code=503,
+                               error_message='We are handling a lot of sign-ins right now. Please try again in a moment.'), \
+            503, {'Retry-After': str(error.retry_after)}
 
-# Global get_db function
-def get_db():
-    return mongo.db
+    return app
 
 # Create the application instance
 app = create_app()
@@ -0,0 +1,3 @@
+"""
+Benchmarks for HEMANX Emotion Analysis Platform
+"""
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Classroom load simulator: how many concurrent students does one box hold?
+
+Each simulated student registers/logs in through the real forms (CSRF
+token included), then, like the detection page, posts a webcam frame to
+/emotion/analyze/face every 3 s (or at the server's next_capture_ms with
+--follow-pacing). Now and then it sends questionnaire text and a voice
+clip, and it polls the dashboard APIs with If-None-Match like a browser.
+Load is applied in steps (--steps 10,20,40); each step reports
+per-endpoint p50/p95/p99, error, throttle and failure rates. Errors are
+load failures (timeouts, connection errors, 4xx/5xx other than 429/503);
+failures are answers the route gave with success: false, reported
+separately because they point at a bug rather than at load. The first
+step that breaks the face SLO, the error budget or keeps up with less
+than 90% of the offered frame rate is reported as the saturation point.
+
+By default the app is served by Werkzeug's threaded server in a child
+process (so the students' client threads do not share its GIL), with
+stand-in face/text/voice models (benchmarks/stand_ins.py) and a fake
+GenAI recommender that just sleeps --genai-latency-ms. Data goes to a
+local mongod, or to mongomock with --mongo memory. Use --url to drive an
+already running deployment (gunicorn, real models) instead; the client
+runs one thread per student, so drive large classes from a separate box.
+
+    python -m benchmarks.classroom_load --steps 10,25,50 --step-seconds 60
+    python -m benchmarks.classroom_load --mongo memory --steps 5 --step-seconds 20
+    python -m benchmarks.classroom_load --url http://10.0.0.5:8000 --steps 50,100,200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import requests
+
+PASSWORD = 'load-test-password'
+CSRF_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+POLL_PATHS = {
+    'chart_data': '/dashboard/api/emotion-chart-data',
+    'wellness_stats': '/dashboard/api/wellness-stats',
+    'recent': '/emotion/recent',
+    'user_progress': '/wellness/api/user-progress',
+}
+
+
+class FakeRecommender:
+    """Stands in for the GenAI-backed WellnessRecommender with a fixed latency"""
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000.0
+
+    def get_wellness_recommendations(self, emotion_data):
+        time.sleep(self.latency)
+        emotions = [result.get('dominant_emotion', 'neutral') for result in emotion_data.values()]
+        return {
+            'recommendations': [{'title': 'Box breathing', 'category': 'mindfulness', 'duration': '5 minutes'}],
+            'emotion_summary': {
+                'overall_emotion': max(set(emotions), key=emotions.count) if emotions else 'neutral',
+                'sources_analyzed': list(emotion_data)
+            }
+        }
+
+    def get_recommendations(self, emotion, context=None):
+        time.sleep(self.latency)
+        return [{'title': 'Short walk', 'category': 'physical', 'duration': '10 minutes'}]
+
+
+class Recorder:
+    def __init__(self):
+        self.step = None
+        self.samples = defaultdict(list)  # (step, endpoint) -> [(latency_ms, outcome)]
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency_ms, outcome):
+        with self._lock:
+            if self.step is not None:
+                self.samples[(self.step, endpoint)].append((latency_ms, outcome))
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Student(threading.Thread):
+    def __init__(self, index, options, fixtures, recorder, stop):
+        super().__init__(name=f'student-{index}', daemon=True)
+        self.index = index
+        self.options = options
+        self.fixtures = fixtures
+        self.recorder = recorder
+        self.stop = stop
+        self.rng = random.Random(index)
+        self.session = requests.Session()
+        self.csrf = None
+        self.etags = {}
+
+    def call(self, endpoint, method, path, json_result=False, accept=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.options['url'] + path,
+                                            timeout=self.options['timeout'], **kwargs)
+            latency = (time.perf_counter() - started) * 1000
+        except requests.RequestException:
+            self.recorder.record(endpoint, (time.perf_counter() - started) * 1000, 'error')
+            return None
+
+        if response.status_code in (429, 503):
+            outcome = 'throttled'
+        elif response.status_code == 304:
+            outcome = 'ok'
+        elif response.status_code >= 400:
+            outcome = 'error'
+        elif json_result:
+            try:
+                outcome = 'ok' if response.json().get('success', True) else 'failed'
+            except ValueError:
+                outcome = 'error'
+        else:
+            outcome = 'ok' if accept is None or accept(response) else 'error'
+        self.recorder.record(endpoint, latency, outcome)
+        return response
+
+    def form(self, endpoint, path, data, accept=None):
+        page = self.session.get(self.options['url'] + path, timeout=self.options['timeout'])
+        match = CSRF_RE.search(page.text)
+        if match:
+            self.csrf = match.group(1)
+            data = dict(data, csrf_token=self.csrf)
+        return self.call(endpoint, 'POST', path, data=data, accept=accept)
+
+    def sign_in(self):
+        email = f'loadtest-student-{self.index:05d}@example.test'
+        self.form('register', '/register', {'email': email, 'password': PASSWORD,
+                                            'name': f'Load Test {self.index}', 'role': 'student'})
+        signed_in = lambda response: '/login' not in response.url
+        response = self.form('login', '/login', {'email': email, 'password': PASSWORD}, accept=signed_in)
+        return response is not None and signed_in(response)
+
+    def headers(self):
+        return {'X-CSRFToken': self.csrf} if self.csrf else {}
+
+    def send_frame(self):
+        response = self.call('analyze_face', 'POST', '/emotion/analyze/face', json_result=True,
+                             json={'image': self.rng.choice(self.fixtures['frames'])}, headers=self.headers())
+        if self.options['follow_pacing'] and response is not None and response.status_code == 200:
+            try:
+                return response.json().get('next_capture_ms', 3000) / 1000.0
+            except ValueError:
+                pass
+        if response is not None and 'Retry-After' in response.headers:
+            return max(self.options['frame_interval'], float(response.headers['Retry-After']))
+        return self.options['frame_interval']
+
+    def send_text(self):
+        self.call('analyze_text', 'POST', '/emotion/analyze/text', json_result=True,
+                  json={'text': self.rng.choice(self.fixtures['texts'])}, headers=self.headers())
+
+    def send_voice(self):
+        path = self.rng.choice(self.fixtures['clips'])
+        with open(path, 'rb') as clip:
+            self.call('analyze_voice', 'POST', '/emotion/analyze/voice', json_result=True,
+                      files={'audio': ('clip.wav', clip, 'audio/wav')}, headers=self.headers())
+
+    def poll(self):
+        for endpoint, path in POLL_PATHS.items():
+            headers = {'If-None-Match': self.etags[path]} if path in self.etags else {}
+            response = self.call(endpoint, 'GET', path, headers=headers)
+            if response is not None and response.headers.get('ETag'):
+                self.etags[path] = response.headers['ETag']
+
+    def jittered(self, seconds):
+        return seconds * self.rng.uniform(0.5, 1.5)
+
+    def run(self):
+        if not self.sign_in():
+            return
+        now = time.monotonic()
+        due = {
+            'frame': now + self.rng.uniform(0, self.options['frame_interval']),
+            'text': now + self.jittered(self.options['text_every']),
+            'voice': now + self.jittered(self.options['voice_every']),
+            'poll': now + self.rng.uniform(0, self.options['poll_every'])
+        }
+        while not self.stop.is_set():
+            action = min(due, key=due.get)
+            if self.stop.wait(max(0.0, due[action] - time.monotonic())):
+                break
+            if action == 'frame':
+                due['frame'] = time.monotonic() + self.send_frame()
+            elif action == 'text':
+                self.send_text()
+                due['text'] = time.monotonic() + self.jittered(self.options['text_every'])
+            elif action == 'voice':
+                self.send_voice()
+                due['voice'] = time.monotonic() + self.jittered(self.options['voice_every'])
+            else:
+                self.poll()
+                due['poll'] = time.monotonic() + self.options['poll_every']
+
+
+def serve_app(args, ready):
+    """Child process: serve the app on a local port with fake models and GenAI, its URL goes to ``ready``"""
+    from types import SimpleNamespace
+    from werkzeug.serving import make_server
+
+    from benchmarks import stand_ins
+
+    if args.mongo != 'memory':
+        os.environ['MONGO_URI'] = args.mongo
+    os.environ.setdefault('ML_WARMUP', 'lazy')
+    if args.no_admission:
+        os.environ['ADMISSION_ENABLED'] = 'false'
+
+    import app as application
+    import routes.emotion
+    import routes.wellness
+    from services.db_utils import mongo
+
+    if args.mongo == 'memory':
+        import mongomock
+        mongo.cx = mongomock.MongoClient()
+        mongo.db = mongo.cx['hemanx_loadtest']
+
+    if not args.real_models:
+        face, text, voice = stand_ins.StandInFace(), stand_ins.StandInText(), stand_ins.StandInVoice()
+        routes.emotion.face_analysis = SimpleNamespace(analyze_face_from_b64=face.analyze_face_from_b64,
+                                                       analyze_face_image=face.analyze_face_image)
+        routes.emotion.text_analysis = SimpleNamespace(analyze_text=text.analyze_text,
+                                                       get_emotion_labels=text.get_emotion_labels)
+        routes.emotion.voice_analysis = SimpleNamespace(analyze_audio_file=voice.analyze_audio_file)
+    recommender = FakeRecommender(args.genai_latency_ms)
+    routes.emotion.wellness_recommender = recommender
+    routes.wellness.recommender = recommender
+
+    server = make_server('127.0.0.1', args.port, application.app, threaded=True)
+    ready.put(f'http://127.0.0.1:{server.server_port}')
+    server.serve_forever()
+
+
+def serve_in_child(args):
+    """(server process, base URL); spawned so the app's imports and GIL stay out of the client"""
+    context = multiprocessing.get_context('spawn')
+    ready = context.Queue()
+    process = context.Process(target=serve_app, args=(args, ready), name='load-test-server', daemon=True)
+    process.start()
+    while True:
+        try:
+            return process, ready.get(timeout=1)
+        except Exception:
+            if not process.is_alive():
+                raise RuntimeError(f'load test server exited with code {process.exitcode}')
+
+
+def summarize_step(recorder, step, students, seconds, options):
+    rows = {}
+    for (sample_step, endpoint), samples in recorder.samples.items():
+        if sample_step != step:
+            continue
+        latencies = sorted(latency for latency, _ in samples)
+        outcomes = [outcome for _, outcome in samples]
+        rows[endpoint] = {
+            'requests': len(samples),
+            'rps': round(len(samples) / seconds, 2),
+            'p50_ms': round(percentile(latencies, 0.50), 1),
+            'p95_ms': round(percentile(latencies, 0.95), 1),
+            'p99_ms': round(percentile(latencies, 0.99), 1),
+            'mean_ms': round(statistics.fmean(latencies), 1),
+            'error_rate': round(outcomes.count('error') / len(samples), 4),
+            'throttle_rate': round(outcomes.count('throttled') / len(samples), 4),
+            'failure_rate': round(outcomes.count('failed') / len(samples), 4)
+        }
+
+    offered = students / options['frame_interval']
+    face = rows.get('analyze_face')
+    completed = (face['rps'] * (1 - face['error_rate'] - face['throttle_rate'] - face['failure_rate'])
+                 if face else 0.0)
+    total = sum(row['requests'] for row in rows.values())
+    errors = sum(row['requests'] * (row['error_rate'] + row['throttle_rate']) for row in rows.values())
+    failures = sum(row['requests'] * row['failure_rate'] for row in rows.values())
+    reasons = []
+    if face and face['p95_ms'] > options['slo_ms']:
+        reasons.append(f"face p95 {face['p95_ms']:.0f} ms > {options['slo_ms']} ms")
+    if total and errors / total > options['max_error_rate']:
+        reasons.append(f'error+throttle rate {errors / total:.1%}')
+    if not options['follow_pacing'] and offered and completed < 0.9 * offered:
+        reasons.append(f'face throughput {completed:.1f}/s < 90% of offered {offered:.1f}/s')
+    return {
+        'students': students,
+        'seconds': round(seconds, 1),
+        'offered_frames_per_second': round(offered, 2),
+        'completed_frames_per_second': round(completed, 2),
+        'route_failures': round(failures),
+        'saturated': bool(reasons),
+        'saturation_reasons': reasons,
+        'endpoints': rows
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='drive a running server instead of serving the app locally')
+    parser.add_argument('--mongo', default='mongodb://localhost:27017/hemanx_loadtest',
+                        help="MONGO_URI for the local server, or 'memory' for mongomock")
+    parser.add_argument('--port', type=int, default=0, help='local server port (0 picks a free one)')
+    parser.add_argument('--real-models', action='store_true', help='local server: keep the real ML services')
+    parser.add_argument('--genai-latency-ms', type=float, default=400, help='fake recommender latency')
+    parser.add_argument('--no-admission', action='store_true', help='local server: disable admission control')
+    parser.add_argument('--steps', default='10,20,40', help='concurrent students per load step')
+    parser.add_argument('--step-seconds', type=float, default=60)
+    parser.add_argument('--ramp-seconds', type=float, default=10, help='spread new students over this long')
+    parser.add_argument('--frame-interval', type=float, default=3.0, help="the detection page's capture cadence")
+    parser.add_argument('--follow-pacing', action='store_true', help="wait next_capture_ms between frames")
+    parser.add_argument('--text-every', type=float, default=90, help='mean seconds between questionnaires')
+    parser.add_argument('--voice-every', type=float, default=180, help='mean seconds between voice clips')
+    parser.add_argument('--poll-every', type=float, default=15, help='seconds between dashboard polls')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--slo-ms', type=float, default=1000, help='face p95 that counts as saturated')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--fixtures', help='directory of real *.jpg/*.wav/*.txt inputs')
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    from benchmarks.fixtures import load_fixtures
+
+    steps = [int(s) for s in args.steps.split(',')]
+    with tempfile.TemporaryDirectory(prefix='hemanx-load-') as workdir:
+        fixtures = load_fixtures(workdir, args.fixtures)
+        server = None
+        if args.url:
+            url = args.url.rstrip('/')
+        else:
+            server, url = serve_in_child(args)
+        options = {
+            'url': url,
+            'timeout': args.timeout,
+            'frame_interval': args.frame_interval,
+            'follow_pacing': args.follow_pacing,
+            'text_every': args.text_every,
+            'voice_every': args.voice_every,
+            'poll_every': args.poll_every,
+            'slo_ms': args.slo_ms,
+            'max_error_rate': args.max_error_rate
+        }
+
+        recorder = Recorder()
+        stop = threading.Event()
+        students = []
+        report = []
+        for step, count in enumerate(steps):
+            # The ramp belongs to the step, so sign-ins are measured under that step's load
+            recorder.step = step
+            started = time.monotonic()
+            new = count - len(students)
+            for _ in range(max(0, new)):
+                student = Student(len(students), options, fixtures, recorder, stop)
+                students.append(student)
+                student.start()
+                time.sleep(args.ramp_seconds / new)
+            time.sleep(args.step_seconds)
+            recorder.step = None
+
+            summary = summarize_step(recorder, step, len(students), time.monotonic() - started, options)
+            report.append(summary)
+            print(f"\n{summary['students']} students: face {summary['completed_frames_per_second']:.1f}/s of "
+                  f"{summary['offered_frames_per_second']:.1f}/s offered"
+                  + (f" - SATURATED ({'; '.join(summary['saturation_reasons'])})" if summary['saturated'] else ''))
+            print(f"{'endpoint':<16}{'reqs':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>8}{'429/503':>9}"
+                  f"{'failed':>8}")
+            for endpoint, row in sorted(summary['endpoints'].items()):
+                print(f"{endpoint:<16}{row['requests']:>7}{row['rps']:>8.2f}{row['p50_ms']:>9.1f}"
+                      f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['error_rate']:>8.1%}{row['throttle_rate']:>9.1%}"
+                      f"{row['failure_rate']:>8.1%}")
+            if summary['route_failures']:
+                print(f"{summary['route_failures']} requests answered success: false (route failures, not load)")
+            sys.stdout.flush()
+        stop.set()
+        if server is not None:
+            server.terminate()
+            server.join(5)
+
+    saturation = next((s['students'] for s in report if s['saturated']), None)
+    print()
+    print(f"saturation point: {saturation} students" if saturation
+          else f"no saturation up to {steps[-1]} students")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {'timestamp': datetime.utcnow().isoformat(), 'url': args.url or 'local',
+                         'models': 'real' if args.url or args.real_models else 'stand-in',
+                         'mongo': 'remote' if args.url else args.mongo, 'cpu_count': os.cpu_count()},
+                'options': {k: v for k, v in options.items() if k != 'url'},
+                'saturation_students': saturation,
+                'steps': report
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the analysis pipeline components.
+
+Times face analysis on decoded frames (with the route's frame decode as
+its own stage, see _analyze_face_frame in routes/emotion.py),
+analyze_text, analyze_audio_file and services/wellness_score.py's
+calculate_comprehensive_wellness_score on offline fixtures (see
+benchmarks/fixtures.py) at several batch sizes. Each component runs in a
+fresh process so its load time and peak RSS are its own. The real service
+is used when it imports and answers offline (HF_HUB_OFFLINE is set, so
+nothing is downloaded); otherwise a stand-in from benchmarks/stand_ins.py
+is timed and the result is tagged 'stand-in'.
+
+    python -m benchmarks.components --batch-sizes 1,8,32 --output before.json
+    python -m benchmarks.components --output after.json --compare before.json
+    python -m benchmarks.components --components text,score --stand-in always
+    FACE_BACKEND=opencv-dnn python -m benchmarks.components --components face
+"""
+import argparse
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+COMPONENTS = ['face', 'text', 'voice', 'score']
+FIXTURE_KINDS = {'face': ('frames',), 'text': ('texts',), 'voice': ('clips',), 'score': ('frames', 'clips', 'texts')}
+FACE_MODULES = {'deepface': 'services.face_analysis', 'opencv-dnn': 'services.face_dnn'}
+REAL_TARGETS = {
+    'face': (FACE_MODULES.get(os.environ.get('FACE_BACKEND', 'deepface'), 'services.face_analysis'),
+             'analyze_face_image'),
+    'text': ('services.text_analysis', 'analyze_text'),
+    'voice': ('services.voice_analysis', 'analyze_audio_file'),
+}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        'min': round(ordered[0], 3),
+        'p50': round(percentile(ordered, 0.50), 3),
+        'p90': round(percentile(ordered, 0.90), 3),
+        'p99': round(percentile(ordered, 0.99), 3),
+        'max': round(ordered[-1], 3),
+        'mean': round(statistics.fmean(ordered), 3),
+        'stdev': round(statistics.pstdev(ordered), 3)
+    }
+
+
+def resolve(component, stand_in_mode, probe_input):
+    """(callable, backend, load_seconds, note) for a component's analysis function"""
+    started = time.perf_counter()
+    note = None
+    if stand_in_mode != 'always':
+        try:
+            module_name, attr = REAL_TARGETS[component]
+            module = importlib.import_module(module_name)
+            if component == 'face' and not hasattr(module, attr):
+                # Backends that only take base64 get the decoded frame re-encoded, as the route does
+                from services.frame_decode import encode_jpeg_b64
+                fn = lambda image: module.analyze_face_from_b64(encode_jpeg_b64(image))
+            else:
+                fn = getattr(module, attr)
+            probe = fn(probe_input)
+            if isinstance(probe, dict) and 'error' in probe:
+                raise RuntimeError(probe['error'])
+            return fn, 'real', time.perf_counter() - started, None
+        except Exception as e:
+            if stand_in_mode == 'never':
+                raise
+            note = f'{type(e).__name__}: {e}'[:300]
+
+    from benchmarks import stand_ins
+    if component == 'face':
+        fn = stand_ins.StandInFace().analyze_face_image
+    elif component == 'text':
+        fn = stand_ins.StandInText().analyze_text
+    else:
+        fn = stand_ins.StandInVoice().analyze_audio_file
+    fn(probe_input)
+    return fn, 'stand-in', time.perf_counter() - started, note
+
+
+def time_stage(fn, inputs, batch_size, iterations, warmup):
+    source = itertools.cycle(inputs)
+    for _ in range(warmup):
+        for _ in range(batch_size):
+            fn(next(source))
+
+    samples_ms = []
+    for _ in range(iterations):
+        batch = [next(source) for _ in range(batch_size)]
+        started = time.perf_counter()
+        for item in batch:
+            fn(item)
+        samples_ms.append((time.perf_counter() - started) * 1000)
+
+    total_seconds = sum(samples_ms) / 1000
+    return {
+        'batch_latency_ms': summarize(samples_ms),
+        'item_latency_ms_p50': round(statistics.median(samples_ms) / batch_size, 3),
+        'items_per_second': round(batch_size * iterations / total_seconds, 2) if total_seconds else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def score_inputs(fixtures):
+    """emotion_data dicts shaped like the comprehensive route's, from stand-in results"""
+    from benchmarks import stand_ins
+    face = stand_ins.StandInFace().analyze_face_from_b64(fixtures['frames'][0])
+    text = stand_ins.StandInText().analyze_text(fixtures['texts'][0])
+    voice = stand_ins.StandInVoice().analyze_audio_file(fixtures['clips'][0])
+    return [
+        {'face_emotion': face},
+        {'face_emotion': face, 'text_emotion': text},
+        {'face_emotion': face, 'text_emotion': text, 'voice_emotion': voice},
+        {'text_emotion': text, 'voice_emotion': voice},
+    ]
+
+
+def run_component(component, options, queue):
+    """Entry point of the per-component child process"""
+    try:
+        os.environ.setdefault('HF_HUB_OFFLINE', '1')
+        os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+        from benchmarks.fixtures import load_fixtures
+
+        fixtures = load_fixtures(options['workdir'], options['fixtures'], kinds=FIXTURE_KINDS[component])
+        baseline_rss = peak_rss_mb()
+        stages = []
+        backend, load_seconds, note = 'real', 0.0, None
+
+        if component == 'face':
+            from services.frame_decode import decode_frame
+            max_side = options['face_max_side']
+            decoded = [decode_frame(frame, max_side) for frame in fixtures['frames']]
+            fn, backend, load_seconds, note = resolve('face', options['stand_in'], decoded[0])
+            stages = [('decode', lambda frame: decode_frame(frame, max_side), fixtures['frames']),
+                      ('analyze', fn, decoded)]
+        elif component == 'text':
+            fn, backend, load_seconds, note = resolve('text', options['stand_in'], fixtures['texts'][0])
+            stages = [('analyze', fn, fixtures['texts'])]
+        elif component == 'voice':
+            fn, backend, load_seconds, note = resolve('voice', options['stand_in'], fixtures['clips'][0])
+            stages = [('analyze', fn, fixtures['clips'])]
+        elif component == 'score':
+            started = time.perf_counter()
+            from services.wellness_score import calculate_comprehensive_wellness_score
+            load_seconds = time.perf_counter() - started
+            stages = [('score', calculate_comprehensive_wellness_score, score_inputs(fixtures))]
+
+        results = []
+        for stage_name, fn, inputs in stages:
+            for batch_size in options['batch_sizes']:
+                result = time_stage(fn, inputs, batch_size, options['iterations'], options['warmup'])
+                result.update({'component': component, 'stage': stage_name, 'batch_size': batch_size,
+                               'backend': backend, 'inputs': len(inputs)})
+                results.append(result)
+        queue.put({'component': component, 'backend': backend, 'load_seconds': round(load_seconds, 3),
+                   'baseline_rss_mb': baseline_rss, 'note': note, 'results': results})
+    except Exception as e:
+        queue.put({'component': component, 'error': f'{type(e).__name__}: {e}', 'results': []})
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['component'], r['stage'], r['batch_size']): r for r in baseline['results']}
+    print()
+    print(f"{'component':<10}{'stage':<10}{'batch':>6}{'p50 before':>12}{'p50 after':>12}{'change':>9}")
+    for row in current:
+        before = previous.get((row['component'], row['stage'], row['batch_size']))
+        if not before:
+            continue
+        old, new = before['batch_latency_ms']['p50'], row['batch_latency_ms']['p50']
+        change = f'{(new - old) / old * 100:+.1f}%' if old else 'n/a'
+        flag = '' if before['backend'] == row['backend'] else '  (backend differs)'
+        print(f"{row['component']:<10}{row['stage']:<10}{row['batch_size']:>6}{old:>12.2f}{new:>12.2f}{change:>9}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--components', default=','.join(COMPONENTS), help='comma separated subset of ' + ','.join(COMPONENTS))
+    parser.add_argument('--batch-sizes', default='1,8,32', help='inputs per timed iteration')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3, help='untimed iterations before measuring')
+    parser.add_argument('--fixtures', help='directory of real *.jpg/*.wav/*.txt inputs')
+    parser.add_argument('--stand-in', choices=['auto', 'always', 'never'], default='auto',
+                        help='auto: real model when it loads offline, stand-in otherwise')
+    parser.add_argument('--face-max-side', type=int, default=320, help='FACE_ANALYSIS_MAX_SIDE for the decode stage')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='earlier --output file to diff p50 latencies against')
+    args = parser.parse_args()
+
+    components = [c.strip() for c in args.components.split(',') if c.strip()]
+    unknown = set(components) - set(COMPONENTS)
+    if unknown:
+        parser.error(f"unknown components: {', '.join(sorted(unknown))}")
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(prefix='hemanx-bench-') as workdir:
+        options = {
+            'batch_sizes': [int(b) for b in args.batch_sizes.split(',')],
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'fixtures': args.fixtures,
+            'stand_in': args.stand_in,
+            'face_max_side': args.face_max_side,
+            'workdir': workdir
+        }
+        runs = []
+        for component in components:
+            queue = context.Queue()
+            process = context.Process(target=run_component, args=(component, options, queue))
+            process.start()
+            runs.append(queue.get())
+            process.join()
+
+    results = []
+    print(f"{'component':<10}{'stage':<10}{'backend':<10}{'batch':>6}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'items/s':>10}{'peak MB':>9}")
+    for run in runs:
+        if 'error' in run:
+            print(f"{run['component']:<10}failed: {run['error']}")
+            continue
+        for row in run['results']:
+            latency = row['batch_latency_ms']
+            print(f"{row['component']:<10}{row['stage']:<10}{row['backend']:<10}{row['batch_size']:>6}"
+                  f"{latency['p50']:>10.2f}{latency['p99']:>10.2f}{row['items_per_second'] or 0:>10.1f}"
+                  f"{row['peak_rss_mb']:>9.1f}")
+        results.extend(run['results'])
+        detail = f"load {run['load_seconds']:.2f}s, baseline RSS {run['baseline_rss_mb']:.1f} MB"
+        print(f"{'':<10}{detail}" + (f"; stand-in because {run['note']}" if run.get('note') else ''))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'timestamp': datetime.utcnow().isoformat(),
+                    'git_revision': git_revision(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpu_count': os.cpu_count(),
+                    'options': {k: v for k, v in options.items() if k != 'workdir'}
+                },
+                'components': [{k: v for k, v in run.items() if k != 'results'} for run in runs],
+                'results': results
+            }, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Offline inputs for the benchmarks: webcam-like face frames, voice clips and
+questionnaire texts.
+
+Everything is synthesised from a fixed seed so two runs see identical
+inputs. Point ``load_fixtures`` at a directory to use real material
+instead (``*.jpg``/``*.png`` frames, ``*.wav`` clips, ``*.txt`` texts).
+"""
+import base64
+import io
+import math
+import os
+import random
+import struct
+import wave
+
+FRAME_SIZES = [(320, 240), (640, 480), (1280, 720)]
+CLIP_SECONDS = [1.0, 3.0, 10.0]
+SAMPLE_RATE = 16000
+
+FEELINGS = ['calm', 'tired', 'excited', 'anxious', 'happy', 'frustrated', 'okay', 'overwhelmed']
+THOUGHTS = [
+    'I keep thinking about the exam next week',
+    'the group project is finally coming together',
+    'I did not sleep well and it is hard to focus',
+    'lunch with friends was really nice today',
+    'I am worried I am falling behind in maths',
+    'nothing special, just a normal day'
+]
+ENERGY = ['low', 'medium', 'high']
+STRONG_EMOTIONS = ['joy', 'sadness', 'anger', 'fear', 'surprise']
+
+
+def synthetic_frame(width, height, rng):
+    """A JPEG data URL with a face-like oval on a noisy background"""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    image = Image.effect_noise((width, height), 40).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    cx, cy = width // 2 + rng.randint(-width // 10, width // 10), height // 2
+    fw, fh = width // 4, int(height / 2.6)
+    draw.ellipse([cx - fw // 2, cy - fh // 2, cx + fw // 2, cy + fh // 2], fill=(224, 182, 150))
+    for dx in (-fw // 5, fw // 5):
+        draw.ellipse([cx + dx - fw // 14, cy - fh // 8 - fh // 20, cx + dx + fw // 14, cy - fh // 8 + fh // 20],
+                     fill=(40, 30, 30))
+    draw.arc([cx - fw // 4, cy + fh // 12, cx + fw // 4, cy + fh // 4], 10, 170, fill=(120, 40, 40), width=3)
+    image = image.filter(ImageFilter.GaussianBlur(1))
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=85)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def synthetic_clip(path, seconds, rng):
+    """A mono 16 kHz WAV of a pitch-wobbling voiced tone with noise"""
+    base = rng.uniform(110, 220)
+    frames = bytearray()
+    for n in range(int(seconds * SAMPLE_RATE)):
+        t = n / SAMPLE_RATE
+        pitch = base * (1 + 0.05 * math.sin(2 * math.pi * 3 * t))
+        envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 0.7 * t) ** 2
+        sample = envelope * (0.6 * math.sin(2 * math.pi * pitch * t) + 0.2 * math.sin(4 * math.pi * pitch * t))
+        sample += rng.uniform(-0.05, 0.05)
+        frames += struct.pack('<h', int(max(-1.0, min(1.0, sample)) * 32000))
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(bytes(frames))
+    return path
+
+
+def synthetic_text(rng, sentences):
+    parts = [f"I am feeling: {rng.choice(FEELINGS)}"]
+    for _ in range(sentences):
+        parts.append(f"My thoughts: {rng.choice(THOUGHTS)}")
+    parts.append(f"Energy level: {rng.choice(ENERGY)}")
+    parts.append(f"Strong emotions: {', '.join(rng.sample(STRONG_EMOTIONS, 2))}")
+    return '. '.join(parts)
+
+
+def load_fixtures(workdir, source=None, seed=7, kinds=('frames', 'clips', 'texts')):
+    """{'frames': [data_url], 'clips': [wav path], 'texts': [str]}, only the kinds asked for"""
+    fixtures = {'frames': [], 'clips': [], 'texts': []}
+
+    if source:
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            ext = os.path.splitext(name)[1].lower()
+            if ext in ('.jpg', '.jpeg', '.png'):
+                mime = 'image/png' if ext == '.png' else 'image/jpeg'
+                with open(path, 'rb') as f:
+                    fixtures['frames'].append(f'data:{mime};base64,' + base64.b64encode(f.read()).decode('ascii'))
+            elif ext == '.wav':
+                fixtures['clips'].append(path)
+            elif ext == '.txt':
+                with open(path, encoding='utf-8') as f:
+                    fixtures['texts'].append(f.read().strip())
+
+    if 'frames' in kinds and not fixtures['frames']:
+        fixtures['frames'] = [synthetic_frame(w, h, random.Random(f'{seed}-{w}x{h}')) for w, h in FRAME_SIZES]
+    if 'clips' in kinds and not fixtures['clips']:
+        os.makedirs(workdir, exist_ok=True)
+        fixtures['clips'] = [synthetic_clip(os.path.join(workdir, f'clip_{seconds:g}s.wav'), seconds,
+                                            random.Random(f'{seed}-{seconds:g}s')) for seconds in CLIP_SECONDS]
+    if 'texts' in kinds and not fixtures['texts']:
+        fixtures['texts'] = [synthetic_text(random.Random(f'{seed}-{n}'), n) for n in (0, 2, 8, 40)]
+    return fixtures
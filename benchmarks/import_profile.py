@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cold-start profile of the application factory.
+
+Runs ``import app`` in a fresh interpreter under ``-X importtime``, lists the
+most expensive imports and times the first GET /login through the test
+client, which is what a freshly booted worker has to do.
+
+    python -m benchmarks.import_profile --top 25
+    python -m benchmarks.import_profile --warm   # also time warm_up() of the ML modules
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app as application
+imported = time.perf_counter()
+client = application.app.test_client()
+response = client.get('/login')
+first_request = time.perf_counter()
+result = {
+    'import_app_seconds': imported - started,
+    'first_login_seconds': first_request - imported,
+    'login_status': response.status_code,
+    'ready_seconds': first_request - started,
+}
+print('PROBE_READY', file=sys.stderr, flush=True)
+if WARM:
+    from services.lazy_loader import warm_up, load_report
+    warm_started = time.perf_counter()
+    warm_up()
+    result['warm_up_seconds'] = time.perf_counter() - warm_started
+    result['ml_modules'] = load_report()
+print('PROBE_RESULT ' + json.dumps(result))
+"""
+
+
+def parse_importtime(stderr):
+    """Parse '-X importtime' lines into (module, self_us, cumulative_us, before_ready)"""
+    rows = []
+    before_ready = True
+    for line in stderr.splitlines():
+        if line == 'PROBE_READY':
+            before_ready = False
+            continue
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+            rows.append((module.strip(), int(self_us), int(cumulative_us), before_ready))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=20, help='number of imports to list')
+    parser.add_argument('--warm', action='store_true', help='also load the lazy ML modules')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'WARM = {args.warm}\n' + PROBE],
+        cwd=root, capture_output=True, text=True
+    )
+
+    probe = None
+    for line in completed.stdout.splitlines():
+        if line.startswith('PROBE_RESULT '):
+            probe = json.loads(line[len('PROBE_RESULT '):])
+    if probe is None:
+        print(completed.stderr[-4000:], file=sys.stderr)
+        sys.exit('App failed to start')
+
+    imports = parse_importtime(completed.stderr)
+    top_level = sorted(imports, key=lambda row: row[2], reverse=True)[:args.top]
+    heavy = ('torch', 'tensorflow', 'transformers', 'deepface', 'librosa', 'google.generativeai', 'keras')
+    heavy_loaded = sorted({module.split('.')[0] for module, _, _, before_ready in imports
+                           if before_ready and module.startswith(heavy)})
+
+    print(f"import app:          {probe['import_app_seconds']:.3f}s")
+    print(f"first GET /login:    {probe['first_login_seconds']:.3f}s (status {probe['login_status']})")
+    print(f"ready to serve:      {probe['ready_seconds']:.3f}s")
+    if 'warm_up_seconds' in probe:
+        print(f"ML warm-up:          {probe['warm_up_seconds']:.3f}s")
+    print(f"heavy ML imported before first request: {', '.join(heavy_loaded) or 'none'}")
+    print()
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for module, self_us, cumulative_us, _ in top_level:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {module}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'probe': probe,
+                'heavy_imported': heavy_loaded,
+                'imports': [{'module': m, 'self_us': s, 'cumulative_us': c} for m, s, c, _ in top_level]
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Time every GET read path in routes/ against a (synthetic) production-sized
+database.
+
+Requests go through the Flask test client, so each timing includes the
+route's Python-side work (list() of cursors, per-document sums, template
+rendering) as well as MongoDB. services/db_metrics.py supplies the DB
+time, query count and documents returned per endpoint. Per-user endpoints
+are exercised as light, median and heavy students, picked by their
+emotion counts in data_versions. The response cache is disabled unless
+--with-cache is given, so repeated runs time the queries and not the
+cache. The model-level aggregations (get_wellness_progress,
+get_emotion_stats) are also timed directly, because the routes currently
+reach the SimpleEmotionData versions of them.
+
+    python -m benchmarks.synthetic_data --users 20000 --days 180
+    python -m benchmarks.query_paths --repeat 20 --output queries.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+# Endpoints that are not read paths
+SKIP_ENDPOINTS = {'static', 'assets', 'metrics', 'auth.login', 'auth.register', 'auth.logout'}
+QUERY_VARIANTS = {
+    'wellness.wellness_progress': ['?period=week', '?period=month'],
+    'emotion.get_recent_emotions': ['?limit=5', '?limit=50'],
+    'emotion.export_emotions': ['?format=ndjson', '?format=csv'],
+    # Without user_id the class export streams every student; time it per student instead
+    'admin.export_class_emotions': ['?user_id={user_id}'],
+}
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def configure_environment(args):
+    os.environ['MONGO_URI'] = args.mongo_uri
+    os.environ.setdefault('ML_WARMUP', 'lazy')
+    if not args.with_cache:
+        os.environ['CONDITIONAL_GET_ENABLED'] = 'false'
+
+
+def fake_models():
+    """Keep the recommendation endpoints off GenAI"""
+    import routes.emotion
+    import routes.wellness
+    from benchmarks.classroom_load import FakeRecommender
+
+    routes.emotion.wellness_recommender = FakeRecommender(0)
+    routes.wellness.recommender = FakeRecommender(0)
+
+
+def pick_students(db, per_tier):
+    """{'light': [ids], 'median': [...], 'heavy': [...]} by emotion record count"""
+    versions = list(db.data_versions.find({'emotion': {'$gt': 0}}, {'emotion': 1}).sort('emotion', 1))
+    students = {str(user['_id']) for user in db.users.find({'role': 'student', 'deleted': {'$ne': True}}, {'_id': 1})}
+    ranked = [row['_id'] for row in versions if row['_id'] in students]
+    if not ranked:
+        ranked = sorted(students)
+    if not ranked:
+        raise SystemExit('No students found - run benchmarks.synthetic_data first')
+
+    middle = max(0, len(ranked) // 2 - per_tier // 2)
+    return {
+        'light': ranked[:per_tier],
+        'median': ranked[middle:middle + per_tier],
+        'heavy': ranked[-per_tier:]
+    }
+
+
+def read_endpoints(app, skip):
+    """(endpoint, rule) for every GET route registered by a blueprint"""
+    endpoints = []
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in rule.methods or rule.endpoint in skip or '.' not in rule.endpoint:
+            continue
+        if set(rule.arguments) - {'user_id'}:
+            continue
+        endpoints.append((rule.endpoint, rule))
+    return sorted(endpoints, key=lambda item: item[0])
+
+
+def client_for(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+def time_request(client, url):
+    started = time.perf_counter()
+    response = client.get(url)
+    size = len(response.get_data())  # drains streamed bodies (exports) too
+    return (time.perf_counter() - started) * 1000, response.status_code, size
+
+
+def time_routes(app, endpoints, tiers, admin_id, repeat, rng):
+    rows = []
+    admin_client = client_for(app, admin_id)
+    for endpoint, rule in endpoints:
+        admin_only = endpoint.startswith('admin.')
+        for query in QUERY_VARIANTS.get(endpoint, ['']):
+            per_user = not admin_only or 'user_id' in rule.arguments or '{user_id}' in query
+            groups = tiers if per_user else {'admin': [admin_id]}
+            for tier, user_ids in groups.items():
+                samples, statuses, sizes = [], {}, []
+                for _ in range(repeat):
+                    user_id = rng.choice(user_ids)
+                    path = rule.build({'user_id': user_id} if 'user_id' in rule.arguments else {},
+                                      append_unknown=False)[1]
+                    client = admin_client if admin_only else client_for(app, user_id)
+                    latency, status, size = time_request(client, path + query.format(user_id=user_id))
+                    samples.append(latency)
+                    sizes.append(size)
+                    statuses[status] = statuses.get(status, 0) + 1
+                ordered = sorted(samples)
+                rows.append({
+                    'endpoint': endpoint,
+                    'path': rule.rule + query,
+                    'as': tier,
+                    'requests': repeat,
+                    'p50_ms': round(percentile(ordered, 0.50), 2),
+                    'p95_ms': round(percentile(ordered, 0.95), 2),
+                    'max_ms': round(ordered[-1], 2),
+                    'mean_ms': round(statistics.fmean(ordered), 2),
+                    'response_kb': round(statistics.fmean(sizes) / 1024, 1),
+                    'statuses': statuses
+                })
+    return rows
+
+
+def time_model_queries(db, tiers, repeat, rng):
+    """The aggregations in models/emotion.py, run directly for each tier"""
+    from benchmarks.timeseries_storage import read_paths
+
+    rows = []
+    for tier, user_ids in tiers.items():
+        timings = {}
+        for _ in range(repeat):
+            for name, query in read_paths(db, ObjectId(rng.choice(user_ids))).items():
+                if not name.startswith('model.'):
+                    continue
+                started = time.perf_counter()
+                query()
+                timings.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+        for name, samples in sorted(timings.items()):
+            ordered = sorted(samples)
+            rows.append({'query': name, 'as': tier, 'p50_ms': round(percentile(ordered, 0.50), 2),
+                         'p95_ms': round(percentile(ordered, 0.95), 2)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mongo-uri', default=os.environ.get('MONGO_URI', 'mongodb://localhost:27017/emotion_wellness'))
+    parser.add_argument('--repeat', type=int, default=10, help='requests per endpoint, variant and tier')
+    parser.add_argument('--users-per-tier', type=int, default=5)
+    parser.add_argument('--with-cache', action='store_true', help='leave the conditional GET cache on')
+    parser.add_argument('--skip', default='', help='extra comma separated endpoints to leave out')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    configure_environment(args)
+    import app as application
+    from services.db_metrics import db_metrics
+    from services.db_utils import get_db
+
+    app = application.app
+    fake_models()
+    rng = random.Random(args.seed)
+    skip = SKIP_ENDPOINTS | {name.strip() for name in args.skip.split(',') if name.strip()}
+
+    with app.app_context():
+        db = get_db()
+        tiers = pick_students(db, args.users_per_tier)
+        admin = db.users.find_one({'role': 'admin', 'deleted': {'$ne': True}}, {'_id': 1})
+        if admin is None:
+            raise SystemExit('No admin user found - run benchmarks.synthetic_data with --admins 1 or more')
+        counts = {
+            'users': db.users.estimated_document_count(),
+            'emotion_data': db.emotion_data.estimated_document_count(),
+            'wellness_activities': db.wellness_activities.estimated_document_count()
+        }
+        model_rows = time_model_queries(db, tiers, args.repeat, rng)
+
+    db_metrics.reset()
+    route_rows = time_routes(app, read_endpoints(app, skip), tiers, admin['_id'], args.repeat, rng)
+    db_by_endpoint = {row['endpoint']: row for row in db_metrics.report()}
+    for row in route_rows:
+        db_row = db_by_endpoint.get(row['endpoint'], {})
+        row['db_ms_per_request'] = db_row.get('db_ms_per_request')
+        row['queries_per_request'] = db_row.get('queries_per_request')
+        row['documents_per_request'] = db_row.get('documents_per_request')
+
+    print(f"data: {counts['users']} users, {counts['emotion_data']} emotion_data, "
+          f"{counts['wellness_activities']} wellness_activities")
+    print()
+    print(f"{'endpoint':<38}{'as':<8}{'p50 ms':>9}{'p95 ms':>9}{'db ms':>8}{'queries':>8}{'docs':>9}{'KB':>8}  status")
+    for row in sorted(route_rows, key=lambda r: r['p95_ms'], reverse=True):
+        label = row['endpoint'] + (row['path'][row['path'].find('?'):] if '?' in row['path'] else '')
+        print(f"{label[:37]:<38}{row['as']:<8}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['db_ms_per_request'] or 0:>8.1f}{row['queries_per_request'] or 0:>8.1f}"
+              f"{row['documents_per_request'] or 0:>9.0f}{row['response_kb']:>8.1f}  {row['statuses']}")
+    print()
+    print(f"{'model query':<38}{'as':<8}{'p50 ms':>9}{'p95 ms':>9}")
+    for row in model_rows:
+        print(f"{row['query']:<38}{row['as']:<8}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {'timestamp': datetime.utcnow().isoformat(), 'repeat': args.repeat,
+                         'response_cache': args.with_cache, 'collections': counts},
+                'routes': route_rows,
+                'model_queries': model_rows
+            }, f, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Fill users, emotion_data and wellness_activities with production-sized data.
+
+Students get a school-day usage pattern: active on most weekdays, some
+weekends, sessions clustered in class hours. How often a student checks in
+and how their emotions lean differ per student around the configured
+averages, so per-user queries see both light and heavy users. Documents
+have the same shape the routes write (users as in User.create_user,
+emotion_data as in EmotionData.create_emotion_record, activities as in
+/wellness/api/complete-activity). They are written with unordered
+insert_many batches from a few writer threads. Every generated document
+carries ``synthetic: True`` so --purge can remove exactly what was added.
+
+    python -m benchmarks.synthetic_data --users 20000 --days 180 --sessions-per-day 25
+    python -m benchmarks.synthetic_data --users 500 --emotions happy=20,sad=30,neutral=50 --drop
+    python -m benchmarks.synthetic_data --purge
+
+Then time the read paths with ``python -m benchmarks.query_paths``.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import bcrypt
+from bson import ObjectId
+from pymongo import MongoClient
+
+from services.emotion_storage import EMOTION_COLLECTION, create_timeseries_collection, is_timeseries, with_meta
+from services.response_cache import bump_versions_bulk
+from services.wellness_catalog import ACTIVITIES
+
+EMOTIONS = {'happy': 30, 'neutral': 35, 'sad': 12, 'angry': 8, 'surprise': 7, 'fear': 5, 'disgust': 3}
+ANALYSIS_TYPES = {'face': 90, 'text': 7, 'voice': 3}
+WELLNESS_BY_EMOTION = {'happy': (7, 10), 'surprise': (6, 9), 'neutral': (4, 7),
+                       'sad': (2, 5), 'fear': (2, 5), 'angry': (1, 4), 'disgust': (2, 5)}
+FIRST_NAMES = ['Aarav', 'Diya', 'Kabir', 'Meera', 'Rohan', 'Anaya', 'Vihaan', 'Isha', 'Arjun', 'Sara',
+               'Liam', 'Emma', 'Noah', 'Olivia', 'Mateo', 'Sofia', 'Yuki', 'Chen', 'Amara', 'Omar']
+LAST_NAMES = ['Sharma', 'Patel', 'Singh', 'Iyer', 'Khan', 'Das', 'Smith', 'Garcia', 'Kim', 'Okafor']
+SYNTHETIC_PASSWORD = 'synthetic-password'
+
+
+def parse_weights(text, defaults):
+    """'happy=30,sad=10' -> {'happy': 30.0, 'sad': 10.0}"""
+    if not text:
+        return dict(defaults)
+    weights = {}
+    for part in text.split(','):
+        name, _, value = part.partition('=')
+        if name.strip() not in defaults:
+            raise argparse.ArgumentTypeError(f"unknown value '{name.strip()}', expected one of {', '.join(defaults)}")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def personal_weights(rng, weights, spread):
+    """A per-user emotion mix: Dirichlet draw centred on the global weights"""
+    total = sum(weights.values())
+    draws = {name: rng.gammavariate(max(0.05, spread * weight / total), 1.0) for name, weight in weights.items()}
+    norm = sum(draws.values()) or 1.0
+    return list(draws), [draws[name] / norm for name in draws]
+
+
+def session_time(rng, day):
+    """A timestamp on ``day`` clustered around class hours (UTC)"""
+    hour = min(23.99, max(0.0, rng.gauss(11.5, 2.5)))
+    return day + timedelta(hours=hour, seconds=rng.randint(0, 59))
+
+
+def build_users(count, admins, days, password_hash, seed):
+    rng = random.Random(f'{seed}-users')
+    now = datetime.utcnow()
+    users = []
+    for i in range(count + admins):
+        role = 'admin' if i < admins else 'student'
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        users.append({
+            '_id': ObjectId(),
+            'email': f'synthetic-{role}-{i:07d}@example.test',
+            'password': password_hash,
+            'name': name,
+            'role': role,
+            'created_at': now - timedelta(days=rng.uniform(0, days), seconds=rng.randint(0, 86399)),
+            'badges': rng.sample(['first_steps', 'meditation_master', 'consistent', 'mood_tracker'], rng.randint(0, 2)),
+            'level': rng.randint(1, 10),
+            'wellness_score': round(rng.uniform(0, 10), 1),
+            'synthetic': True
+        })
+    return users
+
+
+def emotion_records(user, options):
+    """Yield one student's emotion_data documents over the time span"""
+    rng = random.Random(f"{options['seed']}-{user['email']}")
+    labels, mix = personal_weights(rng, options['emotions'], options['spread'])
+    types, type_weights = list(options['types']), list(options['types'].values())
+    # Log-normal frequency: most students near the mean, a long tail of heavy users
+    rate = options['sessions_per_day'] * math.exp(rng.gauss(0, 0.6) - 0.18)
+    start = max(user['created_at'], options['now'] - timedelta(days=options['days']))
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    while day < options['now']:
+        active = options['weekday_active'] if day.weekday() < 5 else options['weekend_active']
+        if rng.random() < active:
+            for _ in range(max(0, int(rng.gauss(rate, rate / 3)))):
+                emotion = rng.choices(labels, mix)[0]
+                analysis_type = rng.choices(types, type_weights)[0]
+                timestamp = session_time(rng, day)
+                if timestamp > options['now']:
+                    continue
+                low, high = WELLNESS_BY_EMOTION[emotion]
+                wellness_score = rng.randint(low, high)
+                scores = {label: round(rng.uniform(0, 10), 2) for label in EMOTIONS}
+                scores[emotion] = round(rng.uniform(45, 99), 2)
+                yield {
+                    'user_id': user['_id'],
+                    'emotion_type': analysis_type,
+                    'data': {
+                        'dominant_emotion': emotion,
+                        'emotion_scores': scores,
+                        'confidence': scores[emotion],
+                        'wellness_score': wellness_score,
+                        'wellness_recommendations': [],
+                        'analysis_type': analysis_type,
+                        'timestamp': timestamp
+                    },
+                    'mood_score': wellness_score,
+                    'timestamp': timestamp,
+                    'synthetic': True
+                }
+        day += timedelta(days=1)
+
+
+def activity_records(user, options):
+    rng = random.Random(f"{options['seed']}-activities-{user['email']}")
+    categories = list(ACTIVITIES)
+    weeks = options['days'] / 7.0
+    count = max(0, int(rng.gauss(options['activities_per_week'] * weeks, options['activities_per_week'] * weeks / 3)))
+    for _ in range(count):
+        completed_at = options['now'] - timedelta(days=rng.uniform(0, options['days']))
+        if completed_at < user['created_at']:
+            continue
+        yield {
+            'user_id': str(user['_id']),
+            'type': rng.choice(categories),
+            'duration': rng.choice([5, 10, 15, 20, 30]),
+            'completed': True,
+            'completed_at': completed_at,
+            'synthetic': True
+        }
+
+
+class BulkWriter:
+    """insert_many in unordered batches from a few threads, with bounded in-flight batches"""
+
+    def __init__(self, collection, batch_size, workers, transform=None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.transform = transform
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.max_in_flight = workers * 2
+        self.pending = set()
+        self.batch = []
+        self.written = 0
+
+    def add(self, document):
+        self.batch.append(self.transform(document) if self.transform else document)
+        if len(self.batch) >= self.batch_size:
+            self._submit()
+
+    def _submit(self):
+        if len(self.pending) >= self.max_in_flight:
+            done, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self.written += future.result()
+        batch, self.batch = self.batch, []
+        self.pending.add(self.executor.submit(self._insert, batch))
+
+    def _insert(self, batch):
+        self.collection.insert_many(batch, ordered=False)
+        return len(batch)
+
+    def close(self):
+        if self.batch:
+            self._submit()
+        for future in self.pending:
+            self.written += future.result()
+        self.pending = set()
+        self.executor.shutdown()
+        return self.written
+
+
+def purge(db):
+    for name in ('users', EMOTION_COLLECTION, 'wellness_activities'):
+        result = db[name].delete_many({'synthetic': True})
+        print(f'{name}: removed {result.deleted_count}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mongo-uri', default=os.environ.get('MONGO_URI', 'mongodb://localhost:27017/emotion_wellness'))
+    parser.add_argument('--users', type=int, default=1000, help='students to create')
+    parser.add_argument('--admins', type=int, default=3)
+    parser.add_argument('--days', type=int, default=90, help='time span to fill, ending now')
+    parser.add_argument('--sessions-per-day', type=float, default=20, help='mean analyses per student per active day')
+    parser.add_argument('--weekday-active', type=float, default=0.85, help='chance a student uses the app on a weekday')
+    parser.add_argument('--weekend-active', type=float, default=0.15)
+    parser.add_argument('--activities-per-week', type=float, default=2, help='mean wellness activities per student')
+    parser.add_argument('--emotions', help='emotion mix, e.g. happy=30,neutral=35,sad=12 (default: realistic mix)')
+    parser.add_argument('--types', help='analysis type mix, e.g. face=90,text=7,voice=3')
+    parser.add_argument('--spread', type=float, default=20,
+                        help='Dirichlet concentration; lower makes students differ more from the global mix')
+    parser.add_argument('--timeseries', action='store_true', help='create emotion_data as a time-series collection')
+    parser.add_argument('--drop', action='store_true', help='drop the three collections first')
+    parser.add_argument('--purge', action='store_true', help='remove previously generated documents and exit')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=4, help='concurrent insert_many batches')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        emotions = parse_weights(args.emotions, EMOTIONS)
+        types = parse_weights(args.types, ANALYSIS_TYPES)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    db = MongoClient(args.mongo_uri).get_default_database()
+    if args.purge:
+        purge(db)
+        return
+
+    if args.drop:
+        for name in ('users', EMOTION_COLLECTION, 'wellness_activities', 'data_versions'):
+            db.drop_collection(name)
+    if args.timeseries and not is_timeseries(db):
+        if db[EMOTION_COLLECTION].estimated_document_count():
+            sys.exit('emotion_data already holds regular documents; migrate it first (flask emotion-data migrate-timeseries)')
+        db.drop_collection(EMOTION_COLLECTION)
+        create_timeseries_collection(db)
+    timeseries = is_timeseries(db)
+
+    password_hash = bcrypt.hashpw(SYNTHETIC_PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=12))
+    options = {
+        'now': datetime.utcnow(),
+        'days': args.days,
+        'sessions_per_day': args.sessions_per_day,
+        'weekday_active': args.weekday_active,
+        'weekend_active': args.weekend_active,
+        'activities_per_week': args.activities_per_week,
+        'emotions': emotions,
+        'types': types,
+        'spread': args.spread,
+        'seed': args.seed
+    }
+
+    started = time.perf_counter()
+    users = build_users(args.users, args.admins, args.days, password_hash, args.seed)
+    user_writer = BulkWriter(db.users, args.batch_size, args.workers)
+    emotion_writer = BulkWriter(db[EMOTION_COLLECTION], args.batch_size, args.workers,
+                                with_meta if timeseries else None)
+    activity_writer = BulkWriter(db.wellness_activities, args.batch_size, args.workers)
+    per_user = {}
+
+    for i, user in enumerate(users, 1):
+        user_writer.add(user)
+        if user['role'] == 'student':
+            count = 0
+            for record in emotion_records(user, options):
+                emotion_writer.add(record)
+                count += 1
+            per_user[user['_id']] = count
+            for record in activity_records(user, options):
+                activity_writer.add(record)
+        if i % 500 == 0:
+            elapsed = time.perf_counter() - started
+            print(f'{i}/{len(users)} users, ~{sum(per_user.values())} emotion records ({elapsed:.0f}s)', flush=True)
+
+    written = {
+        'users': user_writer.close(),
+        'emotion_data': emotion_writer.close(),
+        'wellness_activities': activity_writer.close()
+    }
+    bump_versions_bulk(db, {user_id: count for user_id, count in per_user.items() if count}, 'emotion')
+    bump_versions_bulk(db, {user['_id']: 1 for user in users if user['role'] == 'student'}, 'activity')
+
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(f"wrote {written['users']} users, {written['emotion_data']} emotion_data "
+          f"({'time-series' if timeseries else 'regular'}), {written['wellness_activities']} wellness_activities "
+          f"in {elapsed:.1f}s ({total / elapsed:.0f} docs/s)")
+    print(f"every generated account signs in with password '{SYNTHETIC_PASSWORD}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Regular vs time-series emotion_data: storage size and query latency.
+
+Loads the same synthetic face/text/voice records into a regular and a
+time-series emotion_data collection on a local mongod, then times the
+dashboard and admin read paths against both.
+
+    python -m benchmarks.timeseries_storage --users 200 --days 30 --per-day 100
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+from services.emotion_storage import create_timeseries_collection, storage_stats, with_meta
+
+EMOTIONS = ['happy', 'neutral', 'sad', 'angry', 'surprise', 'fear', 'disgust']
+EMOTION_WEIGHTS = [30, 35, 12, 8, 7, 5, 3]
+EMOTION_TYPES = ['face', 'text', 'voice']
+EMOTION_TYPE_WEIGHTS = [90, 7, 3]
+
+
+def generate_records(users, days, per_day, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for user_id in users:
+        for day in range(days):
+            day_start = now - timedelta(days=day + 1)
+            for _ in range(per_day):
+                emotion = rng.choices(EMOTIONS, EMOTION_WEIGHTS)[0]
+                wellness_score = rng.randint(1, 10)
+                yield {
+                    'user_id': user_id,
+                    'emotion_type': rng.choices(EMOTION_TYPES, EMOTION_TYPE_WEIGHTS)[0],
+                    'data': {
+                        'dominant_emotion': emotion,
+                        'confidence': round(rng.uniform(40, 99), 2),
+                        'wellness_score': wellness_score
+                    },
+                    'mood_score': wellness_score,
+                    'timestamp': day_start + timedelta(seconds=rng.randint(0, 86399))
+                }
+
+
+def load(db, users, days, per_day, seed, batch_size=5000):
+    db.drop_collection('emotion_data')
+    if db.name.endswith('timeseries'):
+        collection = create_timeseries_collection(db)
+    else:
+        collection = db.emotion_data
+        collection.create_index([('user_id', 1), ('timestamp', -1)])
+
+    timeseries = db.name.endswith('timeseries')
+    batch = []
+    started = time.perf_counter()
+    for record in generate_records(users, days, per_day, seed):
+        batch.append(with_meta(record) if timeseries else record)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+    return time.perf_counter() - started
+
+
+def read_paths(db, user_id):
+    """Queries issued by routes/dashboard.py, models/emotion.py and routes/admin.py"""
+    now = datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return {
+        'dashboard.user_emotions': lambda: list(
+            db.emotion_data.find({'user_id': user_id}).sort('timestamp', -1).limit(10)),
+        'dashboard.wellness_stats': lambda: (
+            db.emotion_data.count_documents({'user_id': user_id}),
+            db.emotion_data.count_documents({'user_id': user_id, 'timestamp': {'$gte': today}}),
+            list(db.emotion_data.find({'user_id': user_id, 'timestamp': {'$gte': week_ago}}))),
+        'model.wellness_progress': lambda: list(db.emotion_data.aggregate([
+            {'$match': {'user_id': user_id, 'timestamp': {'$gte': week_ago}}},
+            {'$group': {
+                '_id': {'year': {'$year': '$timestamp'}, 'month': {'$month': '$timestamp'},
+                        'day': {'$dayOfMonth': '$timestamp'}},
+                'average_mood': {'$avg': '$mood_score'},
+                'count': {'$sum': 1}
+            }},
+            {'$sort': {'_id': 1}}
+        ])),
+        'model.emotion_stats': lambda: list(db.emotion_data.aggregate([
+            {'$match': {'user_id': user_id, 'timestamp': {'$gte': week_ago}}},
+            {'$group': {'_id': '$data.dominant_emotion', 'count': {'$sum': 1},
+                        'avg_confidence': {'$avg': '$data.confidence'}}},
+            {'$sort': {'count': -1}}
+        ])),
+        'admin.dashboard': lambda: (
+            db.emotion_data.count_documents({}),
+            list(db.emotion_data.find().sort('timestamp', -1).limit(10)),
+            db.emotion_data.count_documents({'timestamp': {'$gte': today}})),
+        'admin.analytics': lambda: list(db.emotion_data.aggregate([
+            {'$group': {'_id': '$data.dominant_emotion', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1}}
+        ])),
+        'admin.platform_stats': lambda: (
+            list(db.emotion_data.aggregate([
+                {'$match': {'timestamp': {'$gte': week_ago}}},
+                {'$group': {
+                    '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$timestamp'}},
+                    'sessions': {'$sum': 1},
+                    'avg_wellness': {'$avg': '$data.wellness_score'}
+                }},
+                {'$sort': {'_id': 1}}
+            ])),
+            db.emotion_data.distinct('user_id', {'timestamp': {'$gte': week_ago}}))
+    }
+
+
+def time_queries(db, users, repeat, seed):
+    rng = random.Random(seed)
+    timings = {}
+    for _ in range(repeat):
+        for name, query in read_paths(db, rng.choice(users)).items():
+            started = time.perf_counter()
+            query()
+            timings.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+    return {
+        name: {
+            'p50_ms': round(statistics.median(samples), 2),
+            'p95_ms': round(sorted(samples)[max(0, int(len(samples) * 0.95) - 1)], 2),
+            'mean_ms': round(statistics.fmean(samples), 2)
+        }
+        for name, samples in timings.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='mongodb://localhost:27017')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--per-day', type=int, default=100, help='records per user per day')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs of each read path')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--keep', action='store_true', help='keep the benchmark databases')
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    users = [ObjectId() for _ in range(args.users)]
+    results = {'params': vars(args), 'layouts': {}}
+
+    for layout in ('regular', 'timeseries'):
+        db = client[f'hemanx_bench_{layout}']
+        load_seconds = load(db, users, args.days, args.per_day, args.seed)
+        results['layouts'][layout] = {
+            'load_seconds': round(load_seconds, 2),
+            'storage': storage_stats(db),
+            'queries': time_queries(db, users, args.repeat, args.seed)
+        }
+        if not args.keep:
+            client.drop_database(db.name)
+
+    regular = results['layouts']['regular']
+    timeseries = results['layouts']['timeseries']
+    print(f"{'':28}{'regular':>14}{'timeseries':>14}")
+    for key in ('storage_size', 'index_size'):
+        print(f"{key:28}{regular['storage'][key]:>14,}{timeseries['storage'][key]:>14,}")
+    print(f"{'load_seconds':28}{regular['load_seconds']:>14}{timeseries['load_seconds']:>14}")
+    for name in regular['queries']:
+        print(f"{name + ' p50 ms':28}{regular['queries'][name]['p50_ms']:>14}"
+              f"{timeseries['queries'][name]['p50_ms']:>14}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
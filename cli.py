@@ -0,0 +1,123 @@
+"""
+Flask CLI commands for HEMANX Emotion Analysis Platform
+
+Usage: flask --app app <group> <command> [options]
+"""
+import click
+from flask.cli import AppGroup
+
+from services.db_utils import get_db
+
+emotion_data_cli = AppGroup('emotion-data', help='Manage the emotion_data collection.')
+
+
+@emotion_data_cli.command('migrate-timeseries')
+@click.option('--batch-size', default=5000, show_default=True, help='Documents per insert_many batch.')
+@click.option('--granularity', default='seconds', show_default=True,
+              type=click.Choice(['seconds', 'minutes', 'hours']))
+@click.option('--drop-legacy', is_flag=True, help='Drop emotion_data_legacy once every document is copied.')
+def migrate_timeseries(batch_size, granularity, drop_legacy):
+    """Move emotion_data into a time-series collection."""
+    from services.emotion_storage import migrate_to_timeseries
+
+    result = migrate_to_timeseries(get_db(), batch_size=batch_size,
+                                   granularity=granularity, drop_legacy=drop_legacy)
+    click.echo(f"Status: {result['status']}")
+    click.echo(f"Migrated: {result['migrated']}  Skipped (no timestamp): {result['skipped']}")
+    click.echo("Set EMOTION_STORAGE=timeseries so new records carry the metaField.")
+
+
+@emotion_data_cli.command('storage-stats')
+def storage_stats():
+    """Show emotion_data layout and storage size."""
+    from services.emotion_storage import is_timeseries, storage_stats as collection_stats
+
+    db = get_db()
+    layout = 'timeseries' if is_timeseries(db) else 'regular'
+    stats = collection_stats(db)
+    click.echo(f"Layout: {layout}")
+    for key, value in stats.items():
+        click.echo(f"{key}: {value}")
+
+
+@emotion_data_cli.command('export')
+@click.option('--user-id', 'user_ids', multiple=True, help='Student id, repeat for a class. Omit for everyone.')
+@click.option('--format', 'export_format', default='ndjson', show_default=True, type=click.Choice(['ndjson', 'csv']))
+@click.option('--start', help='Only records at or after this ISO date.')
+@click.option('--end', help='Only records before this ISO date.')
+@click.option('--type', 'emotion_types', multiple=True, help='emotion_type filter (face, text, voice, comprehensive).')
+@click.option('--emotion', 'emotions', multiple=True, help='Dominant emotion filter.')
+@click.option('--batch-size', default=1000, show_default=True)
+@click.option('--output', type=click.File('wb'), default='-', help='Output file, stdout by default.')
+def export(user_ids, export_format, start, end, emotion_types, emotions, batch_size, output):
+    """Stream emotion history to NDJSON or CSV."""
+    from services.emotion_export import build_export_query, generate_export, iter_emotion_records, parse_date
+
+    try:
+        query = build_export_query(user_ids=user_ids, start=parse_date(start), end=parse_date(end),
+                                   emotion_types=emotion_types, emotions=emotions)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    records = iter_emotion_records(get_db(), query, batch_size=batch_size)
+    # NDJSON chunks are already bytes, CSV rows are text
+    for chunk in generate_export(records, export_format):
+        output.write(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+
+
+@emotion_data_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['ndjson', 'csv']), help='Defaults to the file extension.')
+@click.option('--batch-size', default=5000, show_default=True, help='Documents per insert_many batch.')
+@click.option('--workers', default=4, show_default=True, help='Parallel insert_many batches.')
+@click.option('--verify-users', is_flag=True, help='Reject records whose user_id is not in users.')
+@click.option('--checkpoint', 'checkpoint_path', help='Checkpoint file, defaults to PATH.checkpoint.')
+@click.option('--rejects', type=click.File('w'), help='Write invalid lines and reasons to this file.')
+def import_records(path, file_format, batch_size, workers, verify_users, checkpoint_path, rejects):
+    """Bulk import emotion records from NDJSON or CSV (resumable)."""
+    from services.emotion_import import import_emotion_records
+
+    def progress(state):
+        click.echo(f"\rline {state['line']:,}  inserted {state['inserted']:,}  "
+                   f"duplicates {state['duplicates']:,}  invalid {state['invalid']:,}", nl=False, err=True)
+
+    summary = import_emotion_records(get_db(), path, file_format=file_format, batch_size=batch_size,
+                                     workers=workers, verify_users=verify_users,
+                                     checkpoint_path=checkpoint_path, rejects=rejects, progress=progress)
+    click.echo('', err=True)
+    click.echo(f"Inserted: {summary['inserted']}  Duplicates: {summary['duplicates']}  "
+               f"Invalid: {summary['invalid']}  Users: {summary['users']}")
+
+
+@emotion_data_cli.command('purge-deleted')
+def purge_deleted():
+    """Purge history of deleted accounts (resumes stalled jobs)."""
+    from services.purge import purge_worker
+
+    completed = purge_worker.run_pending(get_db())
+    click.echo(f"Purge jobs completed: {completed}")
+
+
+assets_cli = AppGroup('assets', help='Build fingerprinted static assets.')
+
+
+@assets_cli.command('build')
+def build():
+    """Resize images, write WebP variants, fingerprint and precompress into static/dist."""
+    from flask import current_app
+    from services.assets import assets, build_assets
+
+    manifest = build_assets(
+        current_app.static_folder,
+        image_widths=current_app.config['ASSET_IMAGE_WIDTHS'],
+        default_width=current_app.config['ASSET_DEFAULT_IMAGE_WIDTH'],
+        quality=current_app.config['ASSET_IMAGE_QUALITY'],
+        log=click.echo
+    )
+    assets.load_manifest()
+    click.echo(f"Built {len(manifest)} assets into static/dist")
+
+
+def register_commands(app):
+    app.cli.add_command(emotion_data_cli)
+    app.cli.add_command(assets_cli)
@@ -10,11 +10,135 @@ class Config:
     
     # Model configurations
     FACE_MODEL = "opencv"  # Using OpenCV for face detection
+    # 'deepface' (TensorFlow) or 'opencv-dnn' (ONNX weights via cv2.dnn, see services/face_dnn.py)
+    FACE_BACKEND = os.environ.get('FACE_BACKEND', 'deepface')
+    FACE_DNN_DETECTOR = os.environ.get('FACE_DNN_DETECTOR', 'weights/face_detection_yunet_2023mar.onnx')
+    FACE_DNN_CLASSIFIER = os.environ.get('FACE_DNN_CLASSIFIER', 'weights/emotion-ferplus-8.onnx')
+    FACE_DNN_SCORE_THRESHOLD = float(os.environ.get('FACE_DNN_SCORE_THRESHOLD', 0.7))
+    # Face detector tiers, most accurate first (services/face_detectors.py); under
+    # load detection steps down to cheaper tiers and climbs back when it is calm
+    FACE_DETECTOR_TIERS = [name.strip() for name in os.environ.get(
+        'FACE_DETECTOR_TIERS', 'yunet,ssd,haar').split(',') if name.strip()]
+    FACE_DETECTOR_LATENCY_BUDGET_MS = float(os.environ.get('FACE_DETECTOR_LATENCY_BUDGET_MS', 150))
+    FACE_DETECTOR_QUEUE_HIGH = int(os.environ.get('FACE_DETECTOR_QUEUE_HIGH', 4))  # in-flight detections across all workers
+    FACE_DETECTOR_RECOVER_AFTER = int(os.environ.get('FACE_DETECTOR_RECOVER_AFTER', 20))
+    FACE_DETECTOR_COOLDOWN_SECONDS = float(os.environ.get('FACE_DETECTOR_COOLDOWN_SECONDS', 10))
+    FACE_SSD_PROTOTXT = os.environ.get('FACE_SSD_PROTOTXT', 'weights/deploy.prototxt')
+    FACE_SSD_MODEL = os.environ.get('FACE_SSD_MODEL', 'weights/res10_300x300_ssd_iter_140000.caffemodel')
+    FACE_SSD_MIN_SCORE = float(os.environ.get('FACE_SSD_MIN_SCORE', 0.5))
     TEXT_MODEL = "j-hartmann/emotion-english-distilroberta-base"
     VOICE_MODEL = "superb/wav2vec2-base-superb-er"
+    # 'lazy': load ML modules on first analysis request, 'background': start loading at boot
+    ML_WARMUP = os.environ.get('ML_WARMUP', 'lazy')
     
     # Google Generative AI configuration
     GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY') or 'your-google-ai-key'
     
     # Session configuration
-    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
\ No newline at end of file
+    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+
+    # emotion_data layout: 'regular' or 'timeseries' (see services/emotion_storage.py)
+    EMOTION_STORAGE = os.environ.get('EMOTION_STORAGE', 'regular')
+
+    # User loader cache (per process)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # seconds, 0 disables
+    USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 10000))
+
+    # Background purge of deleted accounts
+    PURGE_CHUNK_SIZE = int(os.environ.get('PURGE_CHUNK_SIZE', 1000))  # documents per delete
+    PURGE_THROTTLE_SECONDS = float(os.environ.get('PURGE_THROTTLE_SECONDS', 0.2))  # pause between chunks
+    PURGE_LEASE_SECONDS = int(os.environ.get('PURGE_LEASE_SECONDS', 300))
+    PURGE_POLL_SECONDS = float(os.environ.get('PURGE_POLL_SECONDS', 60))  # retry failed or abandoned jobs
+
+    # Password hashing (bcrypt on a bounded per-process pool, capped machine-wide)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))  # older hashes upgrade on login
+    BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', 2))
+    BCRYPT_MAX_QUEUE = int(os.environ.get('BCRYPT_MAX_QUEUE', 8))  # waiting calls per process before 503
+    BCRYPT_MAX_IN_FLIGHT = int(os.environ.get('BCRYPT_MAX_IN_FLIGHT', 0))  # all workers; 0 = 2 x CPU cores
+    BCRYPT_RETRY_AFTER = int(os.environ.get('BCRYPT_RETRY_AFTER', 2))  # seconds
+
+    # Per-endpoint Mongo accounting (services/db_metrics.py)
+    DB_QUERY_LOG_THRESHOLD = int(os.environ.get('DB_QUERY_LOG_THRESHOLD', 10))  # log requests with this many queries, 0 disables
+    DB_QUERY_LOG_ALL = os.environ.get('DB_QUERY_LOG_ALL', 'False').lower() == 'true'
+
+    # ETag/304 and response caching for per-user dashboard APIs
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'True').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+
+    # Static asset build ('flask assets build'): display widths of images in the templates
+    ASSET_IMAGE_QUALITY = int(os.environ.get('ASSET_IMAGE_QUALITY', 80))
+    ASSET_DEFAULT_IMAGE_WIDTH = 1920  # full-bleed backgrounds
+    ASSET_IMAGE_WIDTHS = {
+        'images/wellness-bg.jpg': 1280,  # half-width <img> on the landing page
+        'images/login-illustration.jpg': 1024,
+        'images/404-error.jpg': 800
+    }
+
+    # Admission control for /emotion/analyze/* (token buckets, tokens per second)
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'True').lower() == 'true'
+    ADMISSION_USER_RATE = float(os.environ.get('ADMISSION_USER_RATE', 1.0))
+    ADMISSION_USER_BURST = float(os.environ.get('ADMISSION_USER_BURST', 5))
+    ADMISSION_GLOBAL_RATE = float(os.environ.get('ADMISSION_GLOBAL_RATE', 50))
+    ADMISSION_GLOBAL_BURST = float(os.environ.get('ADMISSION_GLOBAL_BURST', 100))
+    ADMISSION_COSTS = {'face': 1, 'text': 1, 'voice': 3, 'comprehensive': 4, 'liveclass': 6}
+    # Kinds with their own per-user bucket instead of the shared one: (rate, burst). The classroom
+    # camera sends one frame every 3 s, 6 tokens each, so 2 tokens/s with room for two frames
+    ADMISSION_KIND_LIMITS = {
+        'liveclass': (float(os.environ.get('ADMISSION_LIVECLASS_RATE', 2.0)),
+                      float(os.environ.get('ADMISSION_LIVECLASS_BURST', 12)))
+    }
+    ADMISSION_STORE = os.environ.get('ADMISSION_STORE', 'memory')  # 'sqlite' shares buckets across workers
+    ADMISSION_SQLITE_PATH = os.environ.get('ADMISSION_SQLITE_PATH', '/tmp/hemanx_admission.sqlite3')
+
+    # Live face capture pacing (next_capture_ms in /emotion/analyze/face responses)
+    CAPTURE_INTERVAL_BASE_MS = int(os.environ.get('CAPTURE_INTERVAL_BASE_MS', 3000))
+    CAPTURE_INTERVAL_MIN_MS = int(os.environ.get('CAPTURE_INTERVAL_MIN_MS', 2000))
+    CAPTURE_INTERVAL_MAX_MS = int(os.environ.get('CAPTURE_INTERVAL_MAX_MS', 15000))
+    CAPTURE_STABILITY_WINDOW = int(os.environ.get('CAPTURE_STABILITY_WINDOW', 6))  # recent results compared
+    CAPTURE_QUEUE_TARGET = int(os.environ.get('CAPTURE_QUEUE_TARGET', 4))  # in-flight face analyses, all workers, before backing off
+
+    # Webcam frame sizes: longest edge the page should capture, and the edge
+    # frames are reduced to (reduced JPEG decode + area resize) before face detection
+    FACE_CAPTURE_MAX_SIDE = int(os.environ.get('FACE_CAPTURE_MAX_SIDE', 640))
+    FACE_ANALYSIS_MAX_SIDE = int(os.environ.get('FACE_ANALYSIS_MAX_SIDE', 320))
+
+    # Per-stage latency: Server-Timing response header and the /metrics scrape
+    # endpoint (bearer METRICS_TOKEN; without a token only admins may read it)
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # On-demand profiling: admins add `X-Profile: 1` (or ?_profile=1) to a request
+    # to save its cProfile stats and collapsed flamegraph stacks under PROFILE_DIR
+    PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED', 'true').lower() == 'true'
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5))
+
+    # CPU thread budget: each worker gets cores // workers threads for torch,
+    # TensorFlow, OpenCV and BLAS/OpenMP (WEB_CONCURRENCY is gunicorn's worker count)
+    THREAD_BUDGET_ENABLED = os.environ.get('THREAD_BUDGET_ENABLED', 'true').lower() == 'true'
+    THREAD_BUDGET_WORKERS = int(os.environ.get('THREAD_BUDGET_WORKERS') or os.environ.get('WEB_CONCURRENCY') or 1)
+    THREAD_BUDGET_CORES = int(os.environ.get('THREAD_BUDGET_CORES', 0))  # 0 = CPUs this process may run on
+    THREAD_BUDGET_PER_WORKER = int(os.environ.get('THREAD_BUDGET_PER_WORKER', 0))  # 0 = cores // workers
+    THREAD_BUDGET_INTEROP = int(os.environ.get('THREAD_BUDGET_INTEROP', 1))
+    THREAD_BUDGET_OPENCV = int(os.environ.get('THREAD_BUDGET_OPENCV', 0))  # 0 = same as per worker
+
+    # Classroom camera mode (routes/liveclass.py): frames are decoded with the long
+    # edge at LIVECLASS_MAX_SIDE so back-row faces stay detectable
+    LIVECLASS_MAX_SIDE = int(os.environ.get('LIVECLASS_MAX_SIDE', 1280))
+    LIVECLASS_MAX_FACES = int(os.environ.get('LIVECLASS_MAX_FACES', 60))
+
+    # Face tracking for live-class sessions (services/face_tracking.py): full detection
+    # every N frames and after any gap longer than FLOW_MAX_GAP, optical flow in between,
+    # re-classify only changed or stale faces
+    LIVECLASS_TRACK_DETECT_EVERY = int(os.environ.get('LIVECLASS_TRACK_DETECT_EVERY', 5))
+    LIVECLASS_TRACK_IOU_THRESHOLD = float(os.environ.get('LIVECLASS_TRACK_IOU_THRESHOLD', 0.3))
+    LIVECLASS_TRACK_MAX_MISSES = int(os.environ.get('LIVECLASS_TRACK_MAX_MISSES', 2))
+    LIVECLASS_TRACK_CHANGE_THRESHOLD = float(os.environ.get('LIVECLASS_TRACK_CHANGE_THRESHOLD', 12))  # mean grey levels
+    LIVECLASS_TRACK_STALE_FRAMES = int(os.environ.get('LIVECLASS_TRACK_STALE_FRAMES', 10))  # frames between forced re-classifications
+    LIVECLASS_TRACK_FLOW_MAX_GAP_SECONDS = float(os.environ.get('LIVECLASS_TRACK_FLOW_MAX_GAP_SECONDS', 1.0))
+    LIVECLASS_TRACK_SMOOTHING = float(os.environ.get('LIVECLASS_TRACK_SMOOTHING', 0.4))
+    LIVECLASS_TRACK_SESSIONS = int(os.environ.get('LIVECLASS_TRACK_SESSIONS', 32))  # per worker; needs sticky sessions
+    LIVECLASS_TRACK_SESSION_TTL_SECONDS = int(os.environ.get('LIVECLASS_TRACK_SESSION_TTL_SECONDS', 300))
+
+    # Machine-wide in-flight counters shared by all worker processes (services/worker_gauge.py)
+    WORKER_GAUGE_PATH = os.environ.get('WORKER_GAUGE_PATH', '/tmp/hemanx_gauges.sqlite3')
\ No newline at end of file
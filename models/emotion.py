@@ -1,6 +1,8 @@
 from bson import ObjectId
 from datetime import datetime, timedelta
 from collections import Counter
+from services.emotion_storage import prepare_emotion_entry
+from services.response_cache import bump_version
 
 class EmotionData:
     def __init__(self, data):
@@ -23,11 +25,18 @@ class EmotionData:
                 'timestamp': datetime.utcnow()
             }
             
-            result = db.emotion_data.insert_one(emotion_entry)
-            return str(result.inserted_id)
+            result = db.emotion_data.insert_one(prepare_emotion_entry(emotion_entry))
         except Exception as e:
             print(f"Error creating emotion data: {e}")
             return None
+
+        # Invalidates the user's cached dashboard/emotion ETags; a failed bump must
+        # not report the record as unsaved
+        try:
+            bump_version(db, user_id, 'emotion')
+        except Exception as e:
+            print(f"Error bumping emotion data version: {e}")
+        return str(result.inserted_id)
     
     @staticmethod
     def get_recent_emotions(db, user_id, limit=10):
@@ -35,14 +44,7 @@ class EmotionData:
         try:
             query = {'user_id': ObjectId(user_id)}
             cursor = db.emotion_data.find(query).sort('timestamp', -1).limit(limit)
-            emotions = list(cursor)
-            
-            # Convert ObjectId to string for JSON serialization
-            for emotion in emotions:
-                emotion['_id'] = str(emotion['_id'])
-                emotion['user_id'] = str(emotion['user_id'])
-                
-            return emotions
+            return list(cursor)
         except Exception as e:
             print(f"Error getting recent emotions: {e}")
             return []
@@ -56,14 +58,7 @@ class EmotionData:
                 query['emotion_type'] = emotion_type
                 
             cursor = db.emotion_data.find(query).sort('timestamp', -1).limit(limit)
-            emotions = list(cursor)
-            
-            # Convert ObjectId to string for JSON serialization
-            for emotion in emotions:
-                emotion['_id'] = str(emotion['_id'])
-                emotion['user_id'] = str(emotion['user_id'])
-                
-            return emotions
+            return list(cursor)
         except Exception as e:
             print(f"Error getting user emotions: {e}")
             return []
@@ -134,19 +129,19 @@ class EmotionData:
 
 # Alternative simple implementation for immediate use
 class SimpleEmotionData:
+    # Writes and recent-history reads use the full implementation, so stored
+    # records get the time-series meta field (services/emotion_storage.py) and
+    # bump data_versions for the conditional GET cache
+    create_emotion_record = staticmethod(EmotionData.create_emotion_record)
+    get_recent_emotions = staticmethod(EmotionData.get_recent_emotions)
+
     @staticmethod
     def get_user_emotions(db, user_id, limit=5):
         """Simple method to get user emotions"""
         try:
-            emotions = list(db.emotion_data.find(
+            return list(db.emotion_data.find(
                 {'user_id': ObjectId(user_id)}
             ).sort('timestamp', -1).limit(limit))
-            
-            for emotion in emotions:
-                emotion['_id'] = str(emotion['_id'])
-                emotion['user_id'] = str(emotion['user_id'])
-                
-            return emotions
         except Exception as e:
             print(f"Error getting user emotions: {e}")
             return []
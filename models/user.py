@@ -1,8 +1,9 @@
 from flask_login import UserMixin
 from datetime import datetime
-import bcrypt
 import re
 from bson.objectid import ObjectId
+from services.user_cache import user_cache
+from services.password_hasher import password_hasher, PasswordHasherBusy
 
 class User(UserMixin):
     def __init__(self, user_data):
@@ -42,7 +43,7 @@ class User(UserMixin):
         if users.find_one({'email': email.lower().strip()}):
             return None, "Email already exists"
         
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = password_hasher.hash(password)
         user_data = {
             'email': email.lower().strip(),
             'password': hashed_password,
@@ -57,6 +58,7 @@ class User(UserMixin):
         try:
             result = users.insert_one(user_data)
             user_data['_id'] = result.inserted_id
+            user_cache.invalidate(result.inserted_id)
             return User(user_data), "User created successfully"
         except Exception as e:
             return None, f"Database error: {str(e)}"
@@ -66,15 +68,21 @@ class User(UserMixin):
         users = db.users
         
         try:
-            user_data = users.find_one({'email': email.lower().strip()})
+            user_data = users.find_one({'email': email.lower().strip(), 'deleted': {'$ne': True}})
             
             if not user_data:
                 return None
             
-            if bcrypt.checkpw(password.encode('utf-8'), user_data['password']):
+            if password_hasher.verify(password, user_data['password']):
+                # Bring hashes made at an older cost up to BCRYPT_ROUNDS
+                if password_hasher.needs_rehash(user_data['password']):
+                    password_hasher.upgrade_in_background(users, user_data['_id'], password,
+                                                          user_data['password'])
                 return User(user_data)
             return None
                 
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             print(f"Authentication error: {e}")
             return None
@@ -7,6 +7,7 @@ from routes.dashboard import dashboard_bp
 from routes.admin import admin_bp
 from routes.wellness import wellness_bp
 from routes.settings import settings_bp
+from routes.liveclass import liveclass_bp
 
 __all__ = [
     'auth_bp',
@@ -14,5 +15,6 @@ __all__ = [
     'dashboard_bp',
     'admin_bp',
     'wellness_bp',
-    'settings_bp'
+    'settings_bp',
+    'liveclass_bp'
 ]
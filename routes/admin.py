@@ -1,6 +1,17 @@
 from flask import Blueprint, render_template, jsonify, request, redirect, url_for
 from flask_login import login_required, current_user
 from services.db_utils import get_db
+from services.user_cache import user_cache
+from services.emotion_export import export_response
+from services.password_hasher import password_hasher
+from services.db_metrics import db_metrics
+from services.lazy_loader import load_report
+from services.response_cache import response_cache
+from services.admission import admission
+from services.profiling import request_profiler
+from services.thread_budget import thread_budget
+from services.face_detectors import face_detector
+from services.face_tracking import face_trackers
 from datetime import datetime, timedelta
 
 admin_bp = Blueprint('admin', __name__)
@@ -117,6 +128,99 @@ def platform_stats():
         'popular_emotion': 'happy'    # This would be calculated
     })
 
+@admin_bp.route('/admin/api/user-cache-stats')
+@login_required
+def user_cache_stats():
+    """API for user loader cache hit-rate metrics"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(user_cache.stats())
+
+@admin_bp.route('/admin/api/password-hasher-stats')
+@login_required
+def password_hasher_stats():
+    """API for bcrypt latency, queue and load-shedding metrics"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(password_hasher.stats())
+
+@admin_bp.route('/admin/api/db-report')
+@login_required
+def db_report():
+    """API for per-endpoint Mongo query counts, DB time, documents and pool waits"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    if request.args.get('reset') == '1':
+        db_metrics.reset()
+    
+    return jsonify({'endpoints': db_metrics.report()})
+
+@admin_bp.route('/admin/api/ml-modules')
+@login_required
+def ml_modules():
+    """API showing which heavy ML modules this worker has loaded"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(load_report())
+
+@admin_bp.route('/admin/api/response-cache-stats')
+@login_required
+def response_cache_stats():
+    """API for conditional GET and response cache metrics"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(response_cache.stats())
+
+@admin_bp.route('/admin/api/admission-stats')
+@login_required
+def admission_stats():
+    """API for analysis admission control: admitted, rejected and in-flight requests"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(admission.stats())
+
+@admin_bp.route('/admin/api/profiles')
+@login_required
+def request_profiles():
+    """API for on-demand request profiling: settings and the latest saved profiles"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(request_profiler.stats())
+
+@admin_bp.route('/admin/api/thread-budget')
+@login_required
+def thread_budget_stats():
+    """API for the per-worker CPU thread budget and the settings the ML libraries report"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(thread_budget.stats())
+
+@admin_bp.route('/admin/api/face-detector')
+@login_required
+def face_detector_stats():
+    """API for the face detector tiers: the tier in use, latencies and recent shifts"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(face_detector.stats())
+
+@admin_bp.route('/admin/api/liveclass-tracking')
+@login_required
+def liveclass_tracking_stats():
+    """API for live-class face tracking: sessions held by this worker and their track counts"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(face_trackers.stats())
+
 @admin_bp.route('/admin/api/user/<user_id>')
 @login_required
 def get_user_data(user_id):
@@ -140,7 +244,7 @@ def get_user_data(user_id):
             'name': user['name'],
             'email': user['email'],
             'role': user['role'],
-            'created_at': user['created_at'].isoformat(),
+            'created_at': user['created_at'],
             'wellness_score': user.get('wellness_score', 0),
             'level': user.get('level', 1)
         },
@@ -149,8 +253,37 @@ def get_user_data(user_id):
                 'type': e['emotion_type'],
                 'emotion': e['data'].get('dominant_emotion', e['data'].get('sentiment', 'unknown')),
                 'wellness_score': e['data'].get('wellness_score', 0),
-                'timestamp': e['timestamp'].isoformat()
+                'timestamp': e['timestamp']
             }
             for e in user_emotions
         ]
-    })
\ No newline at end of file
+    })
+
+@admin_bp.route('/admin/export/user/<user_id>')
+@login_required
+def export_user_emotions(user_id):
+    """Stream one student's full emotion history as NDJSON or CSV"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    try:
+        return export_response(get_db(), [user_id], request.args, f'emotion-history-{user_id}')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@admin_bp.route('/admin/export/class')
+@login_required
+def export_class_emotions():
+    """Stream emotion history for a class (repeated user_id args) or all students"""
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    db = get_db()
+    user_ids = request.args.getlist('user_id')
+    if not user_ids:
+        user_ids = [user['_id'] for user in db.users.find({'role': 'student'}, {'_id': 1})]
+    
+    try:
+        return export_response(db, user_ids, request.args, 'class-emotion-history')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
@@ -206,6 +206,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from flask_login import login_user, logout_user, login_required, current_user
 from models.user import User
+from services.db_utils import get_db
+from services.stage_metrics import stage
 import time
 
 auth_bp = Blueprint('auth', __name__)
@@ -225,7 +227,6 @@ def login():
         return redirect(url_for('dashboard.student'))
     
     if request.method == 'POST':
-        from app import get_db
         db = get_db()
         
         email = request.form.get('email', '').strip()
@@ -235,7 +236,8 @@ def login():
             flash('Please enter both email and password', 'error')
             return render_template('login.html')
         
-        user = User.authenticate(db, email, password)
+        with stage('auth'):
+            user = User.authenticate(db, email, password)
         if user:
             login_user(user)
             next_page = request.args.get('next')
@@ -255,7 +257,6 @@ def register():
         return redirect(url_for('dashboard.student'))
     
     if request.method == 'POST':
-        from app import get_db
         db = get_db()
         
         email = request.form.get('email', '').strip()
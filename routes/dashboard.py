@@ -1,19 +1,16 @@
 from flask import Blueprint, render_template, jsonify
 from flask_login import login_required, current_user
 from models.emotion import EmotionData
+from services.db_utils import get_db
+from services.response_cache import conditional
 from datetime import datetime, timedelta
 
 dashboard_bp = Blueprint('dashboard', __name__)
-# In each route file, include this function:
-def get_db():
-    from app import mongo
-    return mongo.db
 
 @dashboard_bp.route('/dashboard')
 @login_required
 def student():
     """Student dashboard with analytics"""
-    from app import get_db
     db = get_db()
     
     # Get recent emotions
@@ -36,9 +33,9 @@ def student():
 
 @dashboard_bp.route('/api/emotion-chart-data')
 @login_required
+@conditional(kinds=('emotion',))
 def emotion_chart_data():
     """API for emotion chart data"""
-    from app import get_db
     db = get_db()
     
     emotions = EmotionData.get_user_emotions(db, current_user.id, 7)
@@ -61,9 +58,9 @@ def emotion_chart_data():
 
 @dashboard_bp.route('/api/wellness-stats')
 @login_required
+@conditional(kinds=('emotion',), daily=True)
 def wellness_stats():
     """API for wellness statistics"""
-    from app import get_db
     db = get_db()
     
     # Calculate various stats
@@ -196,30 +196,45 @@
 #     return _emotion_to_score(emotion)
 
 
-from flask import Blueprint, render_template, request, jsonify, session
+from flask import Blueprint, render_template, request, jsonify, session, current_app
 from flask_login import login_required, current_user
 from models.emotion import EmotionData
-from services.face_analysis import analyze_face_from_b64
-from services.text_analysis import analyze_text, get_emotion_labels
-from services.voice_analysis import analyze_audio_file
-from services.wellness_recommender import WellnessRecommender
+from services.lazy_loader import LazyModule, lazy_instance
 from services.file_utils import save_upload, allowed_file
+from services.db_utils import get_db
+from services.response_cache import conditional
+from services.admission import admit, admission
+from services.capture_pacing import capture_pacer
+from services.frame_decode import decode_frame, encode_jpeg_b64
+from services.stage_metrics import stage
+from services.wellness_score import calculate_comprehensive_wellness_score, emotion_to_score
+from config import Config
 import base64
 import os
 from datetime import datetime
 
 emotion_bp = Blueprint('emotion', __name__)
-wellness_recommender = WellnessRecommender()
+
+# Heavy ML services are imported on first use, not at worker boot
+FACE_BACKENDS = {'deepface': 'services.face_analysis', 'opencv-dnn': 'services.face_dnn'}
+face_analysis = LazyModule(FACE_BACKENDS.get(Config.FACE_BACKEND, 'services.face_analysis'))
+text_analysis = LazyModule('services.text_analysis')
+voice_analysis = LazyModule('services.voice_analysis')
+wellness_recommender = lazy_instance('services.wellness_recommender', 'WellnessRecommender')
+
+# Output labels of Config.TEXT_MODEL; listed here so rendering the page does not import transformers
+TEXT_EMOTION_LABELS = ['anger', 'disgust', 'fear', 'joy', 'neutral', 'sadness', 'surprise']
 
 @emotion_bp.route('/detection')
 @login_required
 def detection():
     """Enhanced emotion detection page with three options"""
-    emotion_labels = get_emotion_labels()
-    return render_template('emotion_detection.html', emotion_labels=emotion_labels)
+    return render_template('emotion_detection.html', emotion_labels=TEXT_EMOTION_LABELS,
+                           capture_max_side=current_app.config['FACE_CAPTURE_MAX_SIDE'])
 
 @emotion_bp.route('/analyze/face', methods=['POST'])
 @login_required
+@admit('face')
 def analyze_face():
     """Face analysis with live camera detection"""
     try:
@@ -227,18 +242,29 @@ def analyze_face():
         if not data or 'image' not in data:
             return jsonify({'success': False, 'error': 'No image data provided'})
         
-        result = analyze_face_from_b64(data['image'])
+        result = _analyze_face_frame(data['image'], 'infer')
         
         if 'error' in result:
-            return jsonify({'success': False, 'error': result['error']})
+            return jsonify({
+                'success': False,
+                'error': result['error'],
+                'detector_tier': result.get('detector_tier'),
+                'next_capture_ms': capture_pacer.next_delay_ms(0.0, admission.queue_depth('face'),
+                                                               capture_pacer.record_failure(current_user.id)),
+                'capture_max_side': current_app.config['FACE_CAPTURE_MAX_SIDE']
+            })
+        
+        # Pace the client's next frame from load and how settled this student is
+        stability = capture_pacer.record(current_user.id, result['dominant_emotion'])
+        next_capture_ms = capture_pacer.next_delay_ms(stability, admission.queue_depth('face'))
         
         # Get wellness recommendations for face emotion
-        wellness_result = wellness_recommender.get_wellness_recommendations({
-            'face_emotion': result
-        })
+        with stage('recommend'):
+            wellness_result = wellness_recommender.get_wellness_recommendations({
+                'face_emotion': result
+            })
         
         # Save to database
-        from app import get_db
         db = get_db()
         
         wellness_score = _calculate_wellness_score(result['dominant_emotion'])
@@ -247,21 +273,26 @@ def analyze_face():
             'dominant_emotion': result['dominant_emotion'],
             'emotion_scores': result['emotions'],
             'confidence': result.get('confidence', 0),
+            'detector_tier': result.get('detector_tier'),
             'wellness_score': wellness_score,
             'wellness_recommendations': wellness_result.get('recommendations', []),
             'analysis_type': 'face',
             'timestamp': datetime.utcnow()
         }
         
-        EmotionData.create_emotion_record(db, current_user.id, 'face', emotion_record)
+        with stage('persist'):
+            EmotionData.create_emotion_record(db, current_user.id, 'face', emotion_record)
         
         return jsonify({
             'success': True,
             'dominant_emotion': result['dominant_emotion'],
             'emotions': result['emotions'],
             'confidence': result.get('confidence', 0),
+            'detector_tier': result.get('detector_tier'),
             'wellness_score': wellness_score,
             'wellness_recommendations': wellness_result,
+            'next_capture_ms': next_capture_ms,
+            'capture_max_side': current_app.config['FACE_CAPTURE_MAX_SIDE'],
             'timestamp': datetime.utcnow().isoformat()
         })
         
@@ -272,6 +303,7 @@ def analyze_face():
 
 @emotion_bp.route('/analyze/text', methods=['POST'])
 @login_required
+@admit('text')
 def analyze_text_route():
     """Enhanced text analysis with j-hartmann emotion model for questionnaire"""
     try:
@@ -309,18 +341,19 @@ def analyze_text_route():
             return jsonify({'success': False, 'error': 'No text content to analyze'})
         
         # Use the j-hartmann emotion model for analysis
-        result = analyze_text(text)
+        with stage('infer'):
+            result = text_analysis.analyze_text(text)
         
         if 'error' in result:
             return jsonify({'success': False, 'error': result['error']})
         
         # Get wellness recommendations for text emotion
-        wellness_result = wellness_recommender.get_wellness_recommendations({
-            'text_emotion': result
-        })
+        with stage('recommend'):
+            wellness_result = wellness_recommender.get_wellness_recommendations({
+                'text_emotion': result
+            })
         
         # Save to database
-        from app import get_db
         db = get_db()
         
         wellness_score = _calculate_wellness_score(result.get('dominant_emotion', 'neutral'))
@@ -339,7 +372,8 @@ def analyze_text_route():
             'timestamp': datetime.utcnow()
         }
         
-        EmotionData.create_emotion_record(db, current_user.id, 'text', emotion_record)
+        with stage('persist'):
+            EmotionData.create_emotion_record(db, current_user.id, 'text', emotion_record)
         
         response_data = {
             'success': True,
@@ -362,6 +396,7 @@ def analyze_text_route():
         return jsonify({'success': False, 'error': str(e)})
 @emotion_bp.route('/analyze/voice', methods=['POST'])
 @login_required
+@admit('voice')
 def analyze_voice():
     """Voice analysis with recording functionality"""
     try:
@@ -370,21 +405,24 @@ def analyze_voice():
         
         audio_file = request.files['audio']
         if allowed_file(audio_file.filename):
-            filepath = save_upload(audio_file)
+            with stage('save'):
+                filepath = save_upload(audio_file)
             if filepath:
                 try:
-                    voice_result = analyze_audio_file(filepath)
+                    # The audio is decoded inside analyze_audio_file, so 'infer' includes it
+                    with stage('infer'):
+                        voice_result = voice_analysis.analyze_audio_file(filepath)
                     
                     if 'error' in voice_result:
                         return jsonify({'success': False, 'error': voice_result['error']})
                     
                     # Get wellness recommendations for voice emotion
-                    wellness_result = wellness_recommender.get_wellness_recommendations({
-                        'voice_emotion': voice_result
-                    })
+                    with stage('recommend'):
+                        wellness_result = wellness_recommender.get_wellness_recommendations({
+                            'voice_emotion': voice_result
+                        })
                     
                     # Save to database
-                    from app import get_db
                     db = get_db()
                     
                     wellness_score = _calculate_wellness_score(voice_result['dominant_emotion'])
@@ -399,7 +437,8 @@ def analyze_voice():
                         'timestamp': datetime.utcnow()
                     }
                     
-                    EmotionData.create_emotion_record(db, current_user.id, 'voice', emotion_record)
+                    with stage('persist'):
+                        EmotionData.create_emotion_record(db, current_user.id, 'voice', emotion_record)
                     
                     return jsonify({
                         'success': True,
@@ -425,6 +464,7 @@ def analyze_voice():
 
 @emotion_bp.route('/analyze/comprehensive', methods=['POST'])
 @login_required
+@admit('comprehensive')
 def analyze_comprehensive():
     """Comprehensive emotion analysis from all sources"""
     try:
@@ -432,13 +472,14 @@ def analyze_comprehensive():
         
         # Analyze face if provided
         if request.json and 'image' in request.json:
-            face_result = analyze_face_from_b64(request.json['image'])
+            face_result = _analyze_face_frame(request.json['image'], 'infer_face')
             if 'error' not in face_result:
                 emotion_data['face_emotion'] = face_result
         
         # Analyze text if provided (using j-hartmann model)
         if request.json and 'text' in request.json:
-            text_result = analyze_text(request.json['text'])
+            with stage('infer_text'):
+                text_result = text_analysis.analyze_text(request.json['text'])
             if 'error' not in text_result:
                 emotion_data['text_emotion'] = text_result
         
@@ -446,9 +487,11 @@ def analyze_comprehensive():
         if 'audio' in request.files and request.files['audio'].filename:
             audio_file = request.files['audio']
             if allowed_file(audio_file.filename):
-                filepath = save_upload(audio_file)
+                with stage('decode_audio'):
+                    filepath = save_upload(audio_file)
                 if filepath:
-                    voice_result = analyze_audio_file(filepath)
+                    with stage('infer_voice'):
+                        voice_result = voice_analysis.analyze_audio_file(filepath)
                     if 'error' not in voice_result:
                         emotion_data['voice_emotion'] = voice_result
                     # Clean up
@@ -464,13 +507,13 @@ def analyze_comprehensive():
             })
         
         # Get wellness recommendations
-        wellness_result = wellness_recommender.get_wellness_recommendations(emotion_data)
+        with stage('recommend'):
+            wellness_result = wellness_recommender.get_wellness_recommendations(emotion_data)
         
         # Save to database
-        from app import get_db
         db = get_db()
         
-        wellness_score = _calculate_comprehensive_wellness_score(emotion_data)
+        wellness_score = calculate_comprehensive_wellness_score(emotion_data)
         
         emotion_record = {
             'emotion_data': emotion_data,
@@ -482,7 +525,8 @@ def analyze_comprehensive():
             'timestamp': datetime.utcnow()
         }
         
-        EmotionData.create_emotion_record(db, current_user.id, 'comprehensive', emotion_record)
+        with stage('persist'):
+            EmotionData.create_emotion_record(db, current_user.id, 'comprehensive', emotion_record)
         
         return jsonify({
             'success': True,
@@ -497,10 +541,10 @@ def analyze_comprehensive():
 
 @emotion_bp.route('/recent')
 @login_required
+@conditional(kinds=('emotion',))
 def get_recent_emotions():
     """Get recent emotion analysis results for the current user"""
     try:
-        from app import get_db
         db = get_db()
         
         limit = request.args.get('limit', 5, type=int)
@@ -514,56 +558,36 @@ def get_recent_emotions():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@emotion_bp.route('/export')
+@login_required
+def export_emotions():
+    """Stream the current user's full emotion history as NDJSON or CSV"""
+    try:
+        from services.emotion_export import export_response
+        db = get_db()
+        
+        return export_response(db, [current_user.id], request.args, 'emotion-history')
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 # Helper functions
-def _calculate_comprehensive_wellness_score(emotion_data: dict) -> int:
-    """Calculate comprehensive wellness score from multiple emotion sources"""
-    scores = []
-    weights = []
-    
-    if 'face_emotion' in emotion_data:
-        emotion = emotion_data['face_emotion'].get('dominant_emotion', 'neutral')
-        confidence = emotion_data['face_emotion'].get('confidence', 50) / 100
-        scores.append(_emotion_to_score(emotion))
-        weights.append(confidence)
-    
-    if 'text_emotion' in emotion_data:
-        emotion = emotion_data['text_emotion'].get('dominant_emotion', 'neutral')
-        confidence = emotion_data['text_emotion'].get('confidence', 0.5)
-        scores.append(_emotion_to_score(emotion))
-        weights.append(confidence)
-    
-    if 'voice_emotion' in emotion_data:
-        emotion = emotion_data['voice_emotion'].get('dominant_emotion', 'neutral')
-        confidence = emotion_data['voice_emotion'].get('confidence', 0.5)
-        scores.append(_emotion_to_score(emotion))
-        weights.append(confidence)
-    
-    if not scores:
-        return 5
-    
-    # Weighted average
-    weighted_sum = sum(score * weight for score, weight in zip(scores, weights))
-    total_weight = sum(weights)
-    
-    return int(weighted_sum / total_weight)
+def _analyze_face_frame(image_b64, infer_stage):
+    """Decode once at reduced resolution and hand the backend the decoded frame"""
+    with stage('decode'):
+        image = decode_frame(image_b64, current_app.config['FACE_ANALYSIS_MAX_SIDE'])
+    if image is None:
+        return {'error': 'Invalid image data'}
+    with stage(infer_stage):
+        if hasattr(face_analysis, 'analyze_face_image'):
+            return face_analysis.analyze_face_image(image)
+        # Backends that only take base64 get the small frame re-encoded
+        return face_analysis.analyze_face_from_b64(encode_jpeg_b64(image))
 
-def _emotion_to_score(emotion: str) -> int:
-    """Convert emotion to wellness score (1-10)"""
-    emotion = emotion.lower()
-    
-    positive_emotions = ['joy', 'surprise', 'happy']
-    negative_emotions = ['anger', 'disgust', 'fear', 'sadness', 'sad', 'angry']
-    
-    if emotion in positive_emotions:
-        return 8
-    elif emotion in negative_emotions:
-        return 3
-    else:  # neutral
-        return 5
 
 def _calculate_wellness_score(emotion):
     """Legacy function for individual analysis"""
-    return _emotion_to_score(emotion)
+    return emotion_to_score(emotion)
 
 
 
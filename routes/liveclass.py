@@ -0,0 +1,109 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_login import login_required, current_user
+from services.lazy_loader import LazyModule
+from services.admission import admit
+from services.frame_decode import decode_frame
+from services.face_tracking import face_trackers
+from services.stage_metrics import stage
+from datetime import datetime
+from functools import wraps
+
+liveclass_bp = Blueprint('liveclass', __name__)
+
+# Batched classification needs the cv2.dnn backend whichever FACE_BACKEND serves /emotion
+face_dnn = LazyModule('services.face_dnn')
+
+# How much each emotion counts towards class engagement (0-1)
+ENGAGEMENT_WEIGHTS = {
+    'happy': 1.0,
+    'surprise': 0.9,
+    'neutral': 0.6,
+    'fear': 0.35,
+    'sad': 0.25,
+    'angry': 0.2,
+    'disgust': 0.2
+}
+
+def admin_only(view):
+    """403 for non-admins before the request touches the admission buckets"""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if current_user.role != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 403
+        return view(*args, **kwargs)
+    return wrapped
+
+@liveclass_bp.route('/analyze', methods=['POST'])
+@login_required
+@admin_only
+@admit('liveclass')
+def analyze_frame():
+    """Classroom camera frame: detect every face and classify them in one batch"""
+    try:
+        data = request.get_json(silent=True)
+        if not data or 'image' not in data:
+            return jsonify({'success': False, 'error': 'No image data provided'})
+
+        with stage('decode'):
+            image = decode_frame(data['image'], current_app.config['LIVECLASS_MAX_SIDE'])
+        if image is None:
+            return jsonify({'success': False, 'error': 'Invalid image data'})
+
+        # With a session id, faces are tracked across frames and only changed ones re-classified
+        session_id = data.get('session')
+        tracking = None
+        with stage('infer'):
+            if session_id:
+                tracker = face_trackers.get(f'{current_user.id}:{session_id}')
+                faces, tier, tracking = tracker.update(image, face_dnn.get_analyzer(),
+                                                       current_app.config['LIVECLASS_MAX_FACES'])
+            else:
+                faces, tier = face_dnn.get_analyzer().analyze_faces(image, current_app.config['LIVECLASS_MAX_FACES'])
+
+        with stage('summarize'):
+            summary = _class_summary(faces)
+
+        return jsonify({
+            'success': True,
+            'faces': faces,
+            'face_count': len(faces),
+            'distribution': summary['distribution'],
+            'mean_emotions': summary['mean_emotions'],
+            'engagement_score': summary['engagement_score'],
+            'detector_tier': tier,
+            'session': session_id,
+            'tracking': tracking,
+            'frame_size': {'width': image.shape[1], 'height': image.shape[0]},
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+def _class_summary(faces):
+    """Share of faces per dominant emotion, mean emotion scores and engagement (0-100)"""
+    if not faces:
+        return {'distribution': {}, 'mean_emotions': {}, 'engagement_score': None}
+
+    distribution = {}
+    totals = {}
+    for face in faces:
+        distribution[face['dominant_emotion']] = distribution.get(face['dominant_emotion'], 0) + 1
+        for emotion, score in face['emotions'].items():
+            totals[emotion] = totals.get(emotion, 0.0) + score
+
+    # Each face's engagement comes from its whole emotion mix, weighted by how sure the classifier is
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for face in faces:
+        engagement = sum(ENGAGEMENT_WEIGHTS.get(emotion, 0.5) * score for emotion, score in face['emotions'].items())
+        weight = max(face['confidence'], 1.0)
+        weighted_sum += engagement * weight
+        total_weight += weight
+
+    return {
+        'distribution': {emotion: round(count * 100 / len(faces), 1) for emotion, count in distribution.items()},
+        'mean_emotions': {emotion: round(total / len(faces), 2) for emotion, total in totals.items()},
+        'engagement_score': round(weighted_sum / total_weight, 1)
+    }
@@ -1,7 +1,10 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
-from flask_login import login_required, current_user
+from flask_login import login_required, current_user, logout_user
 from services.db_utils import get_db
 from models.user import User
+from services.user_cache import user_cache
+from services.purge import purge_worker
+from services.password_hasher import password_hasher
 
 settings_bp = Blueprint('settings', __name__)
 
@@ -40,6 +43,7 @@ def profile_settings():
             {'_id': current_user.id},
             {'$set': {'name': name.strip(), 'email': email.lower().strip()}}
         )
+        user_cache.invalidate(current_user.id)
         
         flash("Profile updated successfully!", "success")
         return redirect(url_for('settings.profile_settings'))
@@ -74,12 +78,12 @@ def security_settings():
             return render_template('settings/security.html')
         
         # Update password
-        import bcrypt
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = password_hasher.hash(new_password)
         db.users.update_one(
             {'_id': current_user.id},
             {'$set': {'password': hashed_password}}
         )
+        user_cache.invalidate(current_user.id)
         
         flash("Password updated successfully!", "success")
         return redirect(url_for('settings.security_settings'))
@@ -108,6 +112,7 @@ def notification_settings():
                 }
             }}
         )
+        user_cache.invalidate(current_user.id)
         
         flash("Notification preferences updated!", "success")
         return redirect(url_for('settings.notification_settings'))
@@ -130,10 +135,13 @@ def delete_account():
     """Delete user account"""
     try:
         db = get_db()
+        user_id = current_user.id
         
-        # Delete user data
-        db.users.delete_one({'_id': current_user.id})
-        db.emotion_data.delete_many({'user_id': current_user.id})
+        # Mark the account deleted now; history is purged in the background
+        purge_worker.mark_deleted(db, user_id)
+        user_cache.invalidate(user_id)
+        logout_user()
+        purge_worker.start(db)
         
         flash("Your account has been deleted successfully", "success")
         return redirect(url_for('auth.index'))
@@ -1,127 +1,23 @@
 from flask import Blueprint, render_template, request, jsonify
 from flask_login import login_required, current_user
-from services.wellness_recommender import WellnessRecommender
+from services.lazy_loader import lazy_instance
+from services.user_cache import user_cache
+from services.db_utils import get_db
+from services.response_cache import conditional, bump_version
+from services.wellness_catalog import BADGES, activities_for_emotion, render_fragment
 from datetime import datetime, timedelta
 
 wellness_bp = Blueprint('wellness', __name__)
-recommender = WellnessRecommender()
+recommender = lazy_instance('services.wellness_recommender', 'WellnessRecommender')
 
-# Use a function to get the database connection to avoid circular imports
-def get_db():
-    from app import mongo
-    return mongo.db
 @wellness_bp.route('/')
 @login_required
 def wellness():
     """Main wellness dashboard with comprehensive recommendations"""
-    
-    # Wellness activities data
-    activities = {
-        'meditation': [
-            {
-                'title': '5-Minute Morning Meditation',
-                'description': 'Start your day with calm and focus',
-                'duration': '5 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'inpok4MKVLM'
-            },
-            {
-                'title': 'Stress Relief Meditation',
-                'description': 'Release tension and find peace',
-                'duration': '10 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'z6X5oEIg6Ak'
-            },
-            {
-                'title': 'Body Scan Meditation',
-                'description': 'Deep relaxation for mind and body',
-                'duration': '15 min',
-                'difficulty': 'Intermediate',
-                'youtube_id': 'ihO02wUzgkc'
-            },
-            {
-                'title': 'Mindfulness Meditation',
-                'description': 'Cultivate present moment awareness',
-                'duration': '20 min',
-                'difficulty': 'Intermediate',
-                'youtube_id': 'ZToicYcHIOU'
-            }
-        ],
-        'yoga': [
-            {
-                'title': 'Morning Yoga Flow',
-                'description': 'Energize your body and mind',
-                'duration': '15 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'VaoV1PrYft4'
-            },
-            {
-                'title': 'Yoga for Stress Relief',
-                'description': 'Gentle poses to calm your nervous system',
-                'duration': '20 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'COp7BR_Dvps'
-            },
-            {
-                'title': 'Evening Yoga Stretch',
-                'description': 'Unwind and prepare for restful sleep',
-                'duration': '15 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'BiWDsfZ3zbo'
-            },
-            {
-                'title': 'Power Yoga Workout',
-                'description': 'Build strength and flexibility',
-                'duration': '30 min',
-                'difficulty': 'Advanced',
-                'youtube_id': 'v7AYKMP6rOE'
-            }
-        ],
-        'breathing': [
-            {
-                'title': '4-7-8 Breathing',
-                'description': 'Calm anxiety and promote sleep',
-                'duration': '3 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'gz4G31LGyog'
-            },
-            {
-                'title': 'Box Breathing',
-                'description': 'Reduce stress and improve focus',
-                'duration': '5 min',
-                'difficulty': 'Beginner',
-                'youtube_id': 'tEmt1Znux58'
-            },
-            {
-                'title': 'Alternate Nostril Breathing',
-                'description': 'Balance energy and calm the mind',
-                'duration': '7 min',
-                'difficulty': 'Intermediate',
-                'youtube_id': '8VwufJrUhic'
-            },
-            {
-                'title': 'Wim Hof Breathing',
-                'description': 'Boost energy and immune system',
-                'duration': '10 min',
-                'difficulty': 'Advanced',
-                'youtube_id': 'tybOi4hjZFQ'
-            }
-        ]
-    }
-    
-    # Badges system
-    badges = [
-        {'name': '7 Days', 'icon': '🔥', 'description': 'Complete activities for 7 consecutive days'},
-        {'name': 'Zen Master', 'icon': '🧘', 'description': 'Complete 20 meditation sessions'},
-        {'name': 'Yoga Pro', 'icon': '🤸', 'description': 'Complete 15 yoga sessions'},
-        {'name': 'Breath Work', 'icon': '💨', 'description': 'Complete 10 breathing exercises'},
-        {'name': 'Early Bird', 'icon': '🌅', 'description': 'Complete morning activities 5 times'},
-        {'name': 'Night Owl', 'icon': '🌙', 'description': 'Complete evening activities 5 times'},
-    ]
-    
-    return render_template('wellness.html', 
-                         activities=activities,
-                         badges=badges)
+    return render_template('wellness.html',
+                         activities_html=render_fragment('activities'),
+                         badges_html=render_fragment('badges'),
+                         badges=BADGES)
 
 
 @wellness_bp.route('/recommendations')
@@ -244,6 +140,7 @@ def personalized_recommendations():
 
 @wellness_bp.route('/api/user-progress')
 @login_required
+@conditional(kinds=('activity',), daily=True)
 def user_progress():
     """Get user wellness progress and stats"""
     try:
@@ -305,6 +202,8 @@ def complete_activity():
             {'_id': current_user.id},
             {'$inc': {'wellness_score': 0.1}}
         )
+        user_cache.invalidate(current_user.id)
+        bump_version(db, current_user.id, 'activity')
         
         return jsonify({
             'success': True,
@@ -315,81 +214,4 @@ def complete_activity():
 
 def get_emotion_based_activities(emotion):
     """Get personalized activities based on emotion"""
-    emotion = emotion.lower()
-    
-    activities_map = {
-        'sad': [
-            {
-                'title': 'Uplifting Meditation',
-                'description': 'Boost your mood with positive affirmations',
-                'duration': '10 min',
-                'difficulty': 'Beginner',
-                'type': 'meditation',
-                'youtube_id': 'z6X5oEIg6Ak'
-            },
-            {
-                'title': 'Energizing Yoga Flow',
-                'description': 'Move your body to lift your spirits',
-                'duration': '15 min',
-                'difficulty': 'Beginner',
-                'type': 'yoga',
-                'youtube_id': 'VaoV1PrYft4'
-            }
-        ],
-        'angry': [
-            {
-                'title': 'Anger Release Meditation',
-                'description': 'Let go of frustration and find calm',
-                'duration': '10 min',
-                'difficulty': 'Beginner',
-                'type': 'meditation',
-                'youtube_id': 'z6X5oEIg6Ak'
-            },
-            {
-                'title': 'Calming Breathwork',
-                'description': 'Cool down with controlled breathing',
-                'duration': '5 min',
-                'difficulty': 'Beginner',
-                'type': 'breathing',
-                'youtube_id': 'tEmt1Znux58'
-            }
-        ],
-        'anxious': [
-            {
-                'title': 'Anxiety Relief Meditation',
-                'description': 'Ground yourself and find peace',
-                'duration': '15 min',
-                'difficulty': 'Beginner',
-                'type': 'meditation',
-                'youtube_id': 'ihO02wUzgkc'
-            },
-            {
-                'title': '4-7-8 Breathing',
-                'description': 'Calm your nervous system instantly',
-                'duration': '3 min',
-                'difficulty': 'Beginner',
-                'type': 'breathing',
-                'youtube_id': 'gz4G31LGyog'
-            }
-        ],
-        'happy': [
-            {
-                'title': 'Gratitude Meditation',
-                'description': 'Amplify your positive emotions',
-                'duration': '10 min',
-                'difficulty': 'Beginner',
-                'type': 'meditation',
-                'youtube_id': 'inpok4MKVLM'
-            },
-            {
-                'title': 'Joyful Yoga Flow',
-                'description': 'Celebrate your happiness with movement',
-                'duration': '20 min',
-                'difficulty': 'Intermediate',
-                'type': 'yoga',
-                'youtube_id': 'v7AYKMP6rOE'
-            }
-        ]
-    }
-    
-    return activities_map.get(emotion, activities_map['happy'])
\ No newline at end of file
+    return activities_for_emotion(emotion)
@@ -0,0 +1,3 @@
+"""
+Services package for HEMANX Emotion Analysis Platform
+"""
@@ -0,0 +1,267 @@
+"""
+Admission control for the /emotion/analyze/* routes.
+
+Each request spends tokens from the caller's bucket and from a global
+bucket (voice and comprehensive analyses cost more than a face frame).
+Kinds listed in ADMISSION_KIND_LIMITS (the classroom camera) get a
+per-user bucket of their own, sized for their cost and frame rate, so
+they neither drain nor are drained by the caller's other analyses.
+When either bucket is short the request is rejected with 429 and a
+Retry-After telling the client when enough tokens will be back.
+
+Buckets live in process memory by default, and buckets that have
+refilled are dropped every minute so idle users do not accumulate. With
+ADMISSION_STORE='sqlite' they are kept in a SQLite file on local disk, so
+every gunicorn worker on the box draws from the same buckets; if that file
+stays locked past its timeout the request is shed with a 1 s Retry-After.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import jsonify
+from flask_login import current_user
+
+from services.worker_gauge import worker_gauge
+
+
+def _shortfall(levels, limits, cost):
+    """Longest wait until every bucket holds ``cost`` tokens, and which bucket it is"""
+    wait, short_key = 0, None
+    for tokens, (key, rate, burst) in zip(levels, limits):
+        need = min(cost, burst)
+        if tokens < need:
+            bucket_wait = (need - tokens) / rate if rate > 0 else float('inf')
+            if bucket_wait > wait:
+                wait, short_key = bucket_wait, key
+    return wait, short_key
+
+
+class MemoryBucketStore:
+    def __init__(self, sweep_interval=60):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+    def try_acquire(self, limits, cost):
+        """limits: [(key, rate, burst)]; all buckets are charged or none.
+
+        Returns (acquired, seconds_until_enough_tokens, short_bucket_key).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+            levels = []
+            for key, rate, burst in limits:
+                tokens, updated, _, _ = self._buckets.get(key, (burst, now, rate, burst))
+                levels.append(min(burst, tokens + (now - updated) * rate))
+
+            wait, short_key = _shortfall(levels, limits, cost)
+            if wait > 0:
+                return False, wait, short_key
+
+            for tokens, (key, rate, burst) in zip(levels, limits):
+                self._buckets[key] = (tokens - min(cost, burst), now, rate, burst)
+            return True, 0, None
+
+    def _sweep(self, now):
+        # A bucket that has refilled to its burst is the same as a missing one
+        for key in [key for key, (tokens, updated, rate, burst) in self._buckets.items()
+                    if tokens + (now - updated) * rate >= burst]:
+            del self._buckets[key]
+        self._last_sweep = now
+
+
+class SqliteBucketStore:
+    """Token buckets shared by all processes on this machine"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)'
+            )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def try_acquire(self, limits, cost):
+        connection = self._connect()
+        now = time.time()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError as e:
+            # Another worker held the file past the timeout: shed this request rather than 500
+            print(f"Admission store busy: {e}")
+            return False, 1.0, 'store'
+        try:
+            levels = []
+            for key, rate, burst in limits:
+                row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+                tokens, updated = row if row else (burst, now)
+                levels.append(min(burst, tokens + max(0.0, now - updated) * rate))
+
+            wait, short_key = _shortfall(levels, limits, cost)
+            if wait > 0:
+                connection.execute('ROLLBACK')
+                return False, wait, short_key
+
+            connection.executemany(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                [(key, tokens - min(cost, burst), now) for tokens, (key, _, burst) in zip(levels, limits)]
+            )
+            connection.execute('COMMIT')
+            return True, 0, None
+        except sqlite3.OperationalError as e:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            print(f"Admission store busy: {e}")
+            return False, 1.0, 'store'
+        except Exception:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+
+
+class AdmissionController:
+    def __init__(self, app=None):
+        self.enabled = True
+        self.user_rate = 1.0
+        self.user_burst = 5.0
+        self.global_rate = 50.0
+        self.global_burst = 100.0
+        self.costs = {}
+        self.kind_limits = {}
+        self.store = MemoryBucketStore()
+        self._lock = threading.Lock()
+        self.in_flight = {}
+        self.peak_in_flight = 0
+        self.admitted = {}
+        self.rejected = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config.get('ADMISSION_ENABLED', self.enabled)
+        self.user_rate = config.get('ADMISSION_USER_RATE', self.user_rate)
+        self.user_burst = config.get('ADMISSION_USER_BURST', self.user_burst)
+        self.global_rate = config.get('ADMISSION_GLOBAL_RATE', self.global_rate)
+        self.global_burst = config.get('ADMISSION_GLOBAL_BURST', self.global_burst)
+        self.costs = dict(config.get('ADMISSION_COSTS', self.costs))
+        self.kind_limits = dict(config.get('ADMISSION_KIND_LIMITS', self.kind_limits))
+        if config.get('ADMISSION_STORE') == 'sqlite':
+            self.store = SqliteBucketStore(config['ADMISSION_SQLITE_PATH'])
+        app.extensions['admission'] = self
+
+    def try_admit(self, user_id, kind):
+        """(admitted, retry_after_seconds, limiting bucket: 'user', 'global' or 'store').
+
+        'store' means the SQLite bucket file stayed locked past its timeout.
+        """
+        if kind in self.kind_limits:
+            rate, burst = self.kind_limits[kind]
+            user_limit = (f'{kind}:{user_id}', rate, burst)
+        else:
+            user_limit = (f'user:{user_id}', self.user_rate, self.user_burst)
+        limits = [user_limit, ('global', self.global_rate, self.global_burst)]
+        admitted, wait, short_key = self.store.try_acquire(limits, self.costs.get(kind, 1))
+        if admitted:
+            return True, 0, None
+        return False, wait, short_key if short_key in ('global', 'store') else 'user'
+
+    def queue_depth(self, kind=None):
+        """Analysis requests in progress across every worker on this machine.
+
+        Falls back to this process's count when the shared gauge cannot be read.
+        """
+        with self._lock:
+            kinds = [kind] if kind is not None else sorted(set(self.costs) | set(self.in_flight))
+            local = sum(self.in_flight.get(name, 0) for name in kinds)
+        shared = [worker_gauge.value(f'analysis:{name}') for name in kinds]
+        if any(value is None for value in shared):
+            return local
+        return sum(shared)
+
+    def _enter(self, kind):
+        with self._lock:
+            self.admitted[kind] = self.admitted.get(kind, 0) + 1
+            self.in_flight[kind] = self.in_flight.get(kind, 0) + 1
+            self.peak_in_flight = max(self.peak_in_flight, sum(self.in_flight.values()))
+        worker_gauge.add(f'analysis:{kind}', 1)
+
+    def _exit(self, kind):
+        with self._lock:
+            self.in_flight[kind] -= 1
+        worker_gauge.add(f'analysis:{kind}', -1)
+
+    def _reject(self, kind, reason):
+        with self._lock:
+            key = f'{kind}:{reason}'
+            self.rejected[key] = self.rejected.get(key, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'store': 'sqlite' if isinstance(self.store, SqliteBucketStore) else 'memory',
+                'user_rate': self.user_rate,
+                'user_burst': self.user_burst,
+                'global_rate': self.global_rate,
+                'global_burst': self.global_burst,
+                'costs': self.costs,
+                'kind_limits': self.kind_limits,
+                'in_flight': dict(self.in_flight),
+                'peak_in_flight': self.peak_in_flight,
+                'admitted': dict(self.admitted),
+                'rejected': dict(self.rejected)
+            }
+
+
+admission = AdmissionController()
+
+
+def admit(kind):
+    """Token-bucket admission for an analysis route; 429 + Retry-After when over budget"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if not admission.enabled:
+                return view(*args, **kwargs)
+
+            admitted, wait, reason = admission.try_admit(current_user.id, kind)
+            if not admitted:
+                admission._reject(kind, reason)
+                retry_after = max(1, math.ceil(wait)) if wait != float('inf') else 60
+                response = jsonify({
+                    'success': False,
+                    'error': 'Too many analysis requests, please slow down',
+                    'retry_after': retry_after
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+
+            admission._enter(kind)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                admission._exit(kind)
+        return wrapped
+    return decorator
@@ -0,0 +1,203 @@
+"""
+Fingerprinted, precompressed static assets.
+
+``flask assets build`` resizes the images under static/images to the
+widths the templates display them at, writes WebP variants, puts a content
+hash in every output filename and precompresses text assets (.gz, plus .br
+when the optional brotli package is installed). Everything lands in
+static/dist with a manifest.json mapping source paths to built files.
+
+Templates call ``asset_url('static', filename=...)`` exactly like
+url_for; built files are served from /assets/ with a one-year immutable
+Cache-Control, and sources missing from the manifest fall back to the
+regular static URL. Pages always reference the JPEG/PNG build; when the
+image request itself lists image/webp in its Accept header (browsers do,
+a bare */* does not) /assets/ answers it with the WebP variant and
+Vary: Accept, so CSS backgrounds and <img> tags both get WebP without
+per-template markup.
+"""
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import request, send_from_directory, url_for
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+TEXT_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def _fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _hashed_name(relative_path, data, extension=None):
+    stem, original_extension = os.path.splitext(relative_path)
+    return f'{stem}.{_fingerprint(data)}{extension or original_extension}'
+
+
+def _write(output_dir, relative_path, data):
+    path = os.path.join(output_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return relative_path
+
+
+def _precompress(output_dir, relative_path, data):
+    """Write .gz (and .br when brotli is available) next to a text asset"""
+    _write(output_dir, relative_path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    _write(output_dir, relative_path + '.br', brotli.compress(data, quality=11))
+
+
+def _build_image(source_path, relative_path, output_dir, max_width, quality):
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        image.load()
+        if image.width > max_width:
+            height = round(image.height * max_width / image.width)
+            image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        entry = {'width': image.width, 'height': image.height}
+
+        # Photographs saved as PNG ship as JPEG unless they need transparency
+        buffer = io.BytesIO()
+        if has_alpha:
+            image.save(buffer, format='PNG', optimize=True)
+            extension = '.png'
+        else:
+            image.convert('RGB').save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+            extension = '.jpg'
+        data = buffer.getvalue()
+        entry['path'] = _write(output_dir, _hashed_name(relative_path, data, extension), data)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='WEBP', quality=quality, method=6)
+        data = buffer.getvalue()
+        entry['webp'] = _write(output_dir, _hashed_name(relative_path, data, '.webp'), data)
+
+    return entry
+
+
+def build_assets(static_folder, output_dir=None, image_widths=None, default_width=1920, quality=80, log=print):
+    """Build static/dist and its manifest; returns the manifest"""
+    output_dir = output_dir or os.path.join(static_folder, 'dist')
+    image_widths = image_widths or {}
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != output_dir]
+        for name in sorted(files):
+            source_path = os.path.join(root, name)
+            relative_path = os.path.relpath(source_path, static_folder).replace(os.sep, '/')
+            extension = os.path.splitext(name)[1].lower()
+
+            if os.path.getsize(source_path) == 0:
+                log(f'skip {relative_path} (empty file)')
+                continue
+
+            if extension in IMAGE_EXTENSIONS:
+                width = image_widths.get(relative_path, default_width)
+                entry = _build_image(source_path, relative_path, output_dir, width, quality)
+                before = os.path.getsize(source_path)
+                after = os.path.getsize(os.path.join(output_dir, entry['webp']))
+                log(f'{relative_path}: {before:,} -> {after:,} bytes (webp, {entry["width"]}px)')
+            else:
+                with open(source_path, 'rb') as f:
+                    data = f.read()
+                entry = {'path': _write(output_dir, _hashed_name(relative_path, data), data)}
+                if extension in TEXT_EXTENSIONS:
+                    _precompress(output_dir, entry['path'], data)
+                    entry['precompressed'] = True
+                log(f'{relative_path} -> {entry["path"]}')
+
+            manifest[relative_path] = entry
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class AssetPipeline:
+    def __init__(self, app=None):
+        self.output_dir = None
+        self.manifest = {}
+        self.webp_variants = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.output_dir = os.path.join(app.static_folder, 'dist')
+        self.load_manifest()
+        app.add_url_rule('/assets/<path:filename>', 'assets', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url_for
+        app.extensions['assets'] = self
+
+    def load_manifest(self):
+        path = os.path.join(self.output_dir, 'manifest.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+        self.webp_variants = {entry['path']: entry['webp'] for entry in self.manifest.values() if entry.get('webp')}
+
+    def url_for(self, endpoint, **values):
+        """url_for replacement returning fingerprinted URLs for built assets"""
+        if endpoint != 'static':
+            return url_for(endpoint, **values)
+
+        entry = self.manifest.get(values.get('filename', ''))
+        if entry is None:
+            return url_for(endpoint, **values)
+
+        values.pop('filename')
+        return url_for('assets', filename=entry['path'], **values)
+
+    @staticmethod
+    def _accepts_webp():
+        # Only an explicit entry counts; accept_mimetypes['image/webp'] is also truthy for */*
+        return any(mimetype == 'image/webp' and quality > 0 for mimetype, quality in request.accept_mimetypes)
+
+    def serve(self, filename):
+        webp = self.webp_variants.get(filename)
+        if webp and self._accepts_webp():
+            response = send_from_directory(self.output_dir, webp, max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+            response.vary.add('Accept')
+            return response
+
+        mimetype = mimetypes.guess_type(filename)[0]
+        response = None
+        for extension, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+            if encoding in request.accept_encodings and \
+                    os.path.exists(os.path.join(self.output_dir, filename + extension)):
+                response = send_from_directory(self.output_dir, filename + extension,
+                                               mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+                response.headers['Content-Encoding'] = encoding
+                break
+
+        if response is None:
+            response = send_from_directory(self.output_dir, filename, max_age=IMMUTABLE_MAX_AGE)
+
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        response.vary.add('Accept-Encoding')
+        if webp:
+            response.vary.add('Accept')
+        return response
+
+
+assets = AssetPipeline()
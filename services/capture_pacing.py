@@ -0,0 +1,96 @@
+"""
+Server-recommended delay before a client captures its next webcam frame.
+
+The delay grows with the number of face analyses running across all
+workers on the machine (admission.queue_depth, shared through
+services/worker_gauge.py, so clients back off instead of queuing under
+load) and with how stable the student's recent results are (a student who
+has looked "neutral" for the last several frames does not need a frame
+every 3 s). Unstable or fresh sessions stay at the base cadence, and
+frames that fail (no face, bad image) back off exponentially from it
+instead of being retried faster; no result ever shortens the interval.
+
+Result and failure history is kept in each worker's memory. With several
+workers a user's frames are spread between them, so a window fills more
+slowly and stretching kicks in later, which only errs towards the base
+cadence.
+"""
+import threading
+from collections import OrderedDict, deque
+
+
+class CapturePacer:
+    def __init__(self, app=None, base_ms=3000, min_ms=2000, max_ms=15000,
+                 window=6, queue_target=4, max_users=10000):
+        self.base_ms = base_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.window = window
+        self.queue_target = queue_target
+        self.max_users = max_users
+        self._history = OrderedDict()
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.base_ms = app.config.get('CAPTURE_INTERVAL_BASE_MS', self.base_ms)
+        self.min_ms = app.config.get('CAPTURE_INTERVAL_MIN_MS', self.min_ms)
+        self.max_ms = app.config.get('CAPTURE_INTERVAL_MAX_MS', self.max_ms)
+        self.window = app.config.get('CAPTURE_STABILITY_WINDOW', self.window)
+        self.queue_target = app.config.get('CAPTURE_QUEUE_TARGET', self.queue_target)
+        app.extensions['capture_pacer'] = self
+
+    def record(self, user_id, emotion):
+        """Remember a user's latest face result; returns the stability (0-1)"""
+        key = str(user_id)
+        with self._lock:
+            history = self._history.get(key)
+            if history is None:
+                history = deque(maxlen=self.window)
+                self._history[key] = history
+            self._history.move_to_end(key)
+            while len(self._history) > self.max_users:
+                self._history.popitem(last=False)
+
+            self._failures.pop(key, None)
+            history.append(emotion)
+            if len(history) < history.maxlen:
+                return 0.0
+            return history.count(emotion) / len(history)
+
+    def record_failure(self, user_id):
+        """Count a failed frame; returns the user's consecutive failures"""
+        key = str(user_id)
+        with self._lock:
+            failures = self._failures.pop(key, 0) + 1
+            self._failures[key] = failures
+            while len(self._failures) > self.max_users:
+                self._failures.popitem(last=False)
+            return failures
+
+    def forget(self, user_id):
+        with self._lock:
+            self._history.pop(str(user_id), None)
+            self._failures.pop(str(user_id), None)
+
+    def next_delay_ms(self, stability, queue_depth, failures=0):
+        """Stable results stretch the interval up to 3x; load beyond the target stretches it further.
+
+        Short or unstable history keeps the base interval. After consecutive
+        failures the interval doubles from the base each time.
+        """
+        delay = self.base_ms
+        if failures:
+            delay = self.base_ms * 2 ** min(failures - 1, 8)
+        elif stability >= 0.8:
+            delay *= 1 + 2 * (stability - 0.8) / 0.2
+
+        if self.queue_target > 0 and queue_depth > self.queue_target:
+            delay *= queue_depth / self.queue_target
+
+        return int(max(self.min_ms, min(self.max_ms, delay)))
+
+
+capture_pacer = CapturePacer()
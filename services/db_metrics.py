@@ -0,0 +1,193 @@
+"""
+Per-endpoint MongoDB accounting from pymongo monitoring events.
+
+A CommandListener and a ConnectionPoolListener attribute every command,
+its server time, the documents it returned and the time spent waiting for
+a pooled connection to the Flask endpoint running on the current thread.
+Totals are kept per endpoint for the admin report, and requests issuing
+many round trips are logged so N+1 patterns show up in production logs.
+"""
+import logging
+import threading
+import time
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def _returned_documents(reply):
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        batch = cursor.get('firstBatch', cursor.get('nextBatch'))
+        return len(batch) if batch is not None else 0
+    values = reply.get('values')
+    if isinstance(values, list):
+        return len(values)
+    return 0
+
+
+class RequestDbStats:
+    __slots__ = ('endpoint', 'queries', 'db_time', 'documents', 'pool_wait', 'commands', 'started')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.queries = 0
+        self.db_time = 0.0
+        self.documents = 0
+        self.pool_wait = 0.0
+        self.commands = {}
+        self.started = time.perf_counter()
+
+
+class QueryListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        stats = getattr(_local, 'stats', None)
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += event.duration_micros / 1e6
+        stats.documents += _returned_documents(event.reply)
+        stats.commands[event.command_name] = stats.commands.get(event.command_name, 0) + 1
+
+    def failed(self, event):
+        stats = getattr(_local, 'stats', None)
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += event.duration_micros / 1e6
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    def connection_check_out_started(self, event):
+        _local.checkout_started = time.perf_counter()
+
+    def _checkout_finished(self):
+        started = getattr(_local, 'checkout_started', None)
+        stats = getattr(_local, 'stats', None)
+        _local.checkout_started = None
+        if started is not None and stats is not None:
+            stats.pool_wait += time.perf_counter() - started
+
+    def connection_checked_out(self, event):
+        self._checkout_finished()
+
+    def connection_check_out_failed(self, event):
+        self._checkout_finished()
+
+    # Remaining pool events are not needed for accounting
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+
+class DbMetrics:
+    def __init__(self, app=None, log_threshold=10, log_all=False):
+        self.log_threshold = log_threshold
+        self.log_all = log_all
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.log_threshold = app.config.get('DB_QUERY_LOG_THRESHOLD', self.log_threshold)
+        self.log_all = app.config.get('DB_QUERY_LOG_ALL', self.log_all)
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['db_metrics'] = self
+
+    @staticmethod
+    def event_listeners():
+        """Listeners to pass to MongoClient(event_listeners=...)"""
+        return [QueryListener(), PoolWaitListener()]
+
+    @staticmethod
+    def current():
+        """Stats for the request on this thread, None outside a request"""
+        return getattr(_local, 'stats', None)
+
+    def _before_request(self):
+        from flask import request
+        _local.stats = RequestDbStats(request.endpoint or 'unknown')
+
+    def _teardown_request(self, exc=None):
+        stats = getattr(_local, 'stats', None)
+        _local.stats = None
+        if stats is None:
+            return
+
+        with self._lock:
+            totals = self._endpoints.setdefault(stats.endpoint, {
+                'requests': 0, 'queries': 0, 'db_time': 0.0, 'documents': 0,
+                'pool_wait': 0.0, 'max_queries': 0, 'commands': {}
+            })
+            totals['requests'] += 1
+            totals['queries'] += stats.queries
+            totals['db_time'] += stats.db_time
+            totals['documents'] += stats.documents
+            totals['pool_wait'] += stats.pool_wait
+            totals['max_queries'] = max(totals['max_queries'], stats.queries)
+            for name, count in stats.commands.items():
+                totals['commands'][name] = totals['commands'].get(name, 0) + count
+
+        heavy = self.log_threshold and stats.queries >= self.log_threshold
+        if heavy or self.log_all:
+            logger.log(
+                logging.WARNING if heavy else logging.INFO,
+                'db endpoint=%s queries=%d db_ms=%.1f docs=%d pool_wait_ms=%.1f commands=%s',
+                stats.endpoint, stats.queries, stats.db_time * 1000, stats.documents,
+                stats.pool_wait * 1000, stats.commands
+            )
+
+    def report(self):
+        """Per-endpoint totals and averages, heaviest endpoints first"""
+        with self._lock:
+            rows = []
+            for endpoint, totals in self._endpoints.items():
+                requests = totals['requests'] or 1
+                rows.append({
+                    'endpoint': endpoint,
+                    'requests': totals['requests'],
+                    'queries': totals['queries'],
+                    'queries_per_request': round(totals['queries'] / requests, 2),
+                    'max_queries': totals['max_queries'],
+                    'db_ms_per_request': round(totals['db_time'] * 1000 / requests, 2),
+                    'documents_per_request': round(totals['documents'] / requests, 1),
+                    'pool_wait_ms_per_request': round(totals['pool_wait'] * 1000 / requests, 2),
+                    'commands': dict(totals['commands'])
+                })
+        return sorted(rows, key=lambda row: row['db_ms_per_request'] * row['requests'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+db_metrics = DbMetrics()
@@ -0,0 +1,22 @@
+"""
+Database access layer for HEMANX Emotion Analysis Platform
+
+All code reaches MongoDB through ``mongo``/``get_db`` from this module, so
+the pymongo monitoring listeners in services/db_metrics.py see every
+command.
+"""
+from flask_pymongo import PyMongo
+
+from services.db_metrics import db_metrics
+
+mongo = PyMongo()
+
+
+def init_db(app):
+    """Create the Mongo client with query and pool listeners attached"""
+    mongo.init_app(app, event_listeners=db_metrics.event_listeners())
+    db_metrics.init_app(app)
+
+
+def get_db():
+    return mongo.db
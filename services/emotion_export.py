@@ -0,0 +1,147 @@
+"""
+Streaming export of emotion_data as NDJSON or CSV.
+
+Records are read with a batched cursor and serialized one at a time, so
+memory stays flat however long a student's history is.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Response, stream_with_context
+
+from services.json_provider import dumps_bytes
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+CSV_COLUMNS = [
+    'id', 'user_id', 'emotion_type', 'timestamp', 'dominant_emotion',
+    'confidence', 'wellness_score', 'mood_score', 'data'
+]
+
+
+def parse_date(value):
+    """Parse an ISO date/datetime filter value, None when empty"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected ISO format (YYYY-MM-DD)")
+
+
+def to_object_id(value):
+    return ObjectId(value) if ObjectId.is_valid(value) else value
+
+
+def build_export_query(user_ids=None, start=None, end=None, emotion_types=None, emotions=None):
+    """Server-side filters for an export"""
+    query = {}
+    if user_ids:
+        ids = [to_object_id(user_id) for user_id in user_ids]
+        query['user_id'] = ids[0] if len(ids) == 1 else {'$in': ids}
+    if start or end:
+        query['timestamp'] = {}
+        if start:
+            query['timestamp']['$gte'] = start
+        if end:
+            query['timestamp']['$lt'] = end
+    if emotion_types:
+        query['emotion_type'] = {'$in': list(emotion_types)}
+    if emotions:
+        query['data.dominant_emotion'] = {'$in': list(emotions)}
+    return query
+
+
+def iter_emotion_records(db, query, batch_size=1000):
+    """Batched cursor over matching records, oldest first"""
+    return db.emotion_data.find(
+        query,
+        {'meta': 0},
+        batch_size=batch_size,
+        allow_disk_use=True
+    ).sort('timestamp', 1)
+
+
+def _json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def generate_ndjson(records):
+    for record in records:
+        yield dumps_bytes(record) + b'\n'
+
+
+def generate_csv(records):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate(0)
+        data = record.get('data') or {}
+        timestamp = record.get('timestamp')
+        writer.writerow([
+            str(record.get('_id', '')),
+            str(record.get('user_id', '')),
+            record.get('emotion_type', ''),
+            timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+            data.get('dominant_emotion', data.get('overall_emotion', '')),
+            data.get('confidence', ''),
+            data.get('wellness_score', ''),
+            record.get('mood_score', ''),
+            json.dumps(data, default=_json_default)
+        ])
+        yield buffer.getvalue()
+
+
+def generate_export(records, export_format):
+    if export_format == 'csv':
+        return generate_csv(records)
+    return generate_ndjson(records)
+
+
+def export_filename(prefix, export_format):
+    return f"{prefix}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+
+
+def export_response(db, user_ids, args, filename_prefix):
+    """Streaming Response for an export request.
+
+    Query args: format (ndjson|csv), start, end, type (repeatable
+    emotion_type) and emotion (repeatable dominant emotion). Raises
+    ValueError on invalid arguments.
+    """
+    export_format = args.get('format', 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{export_format}', use ndjson or csv")
+
+    query = build_export_query(
+        user_ids=user_ids,
+        start=parse_date(args.get('start')),
+        end=parse_date(args.get('end')),
+        emotion_types=args.getlist('type'),
+        emotions=args.getlist('emotion')
+    )
+    records = iter_emotion_records(db, query, batch_size=args.get('batch_size', 1000, type=int))
+
+    return Response(
+        stream_with_context(generate_export(records, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            'Content-Disposition': f'attachment; filename={export_filename(filename_prefix, export_format)}',
+            'X-Accel-Buffering': 'no'
+        }
+    )
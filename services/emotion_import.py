@@ -0,0 +1,267 @@
+"""
+Bulk import / backfill of emotion_data from NDJSON or CSV.
+
+Reads the formats written by services/emotion_export.py (and hand-built
+files with the same fields), validates each record and writes them with
+parallel unordered insert_many batches. Progress is checkpointed after
+every contiguous run of finished batches so an interrupted import resumes
+where it stopped. Records get a deterministic _id derived from their
+timestamp, source file path and line, so batches replayed after a crash
+are reported as duplicates instead of being inserted twice (regular
+collections only; time-series collections do not enforce a unique _id).
+Timestamps with a UTC offset are converted to naive UTC.
+"""
+import csv
+import hashlib
+import json
+import os
+import struct
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from services.emotion_storage import prepare_emotion_entry
+from services.response_cache import bump_versions_bulk
+
+EMOTION_TYPES = {'face', 'text', 'voice', 'comprehensive'}
+DUPLICATE_KEY_ERROR = 11000
+
+
+class RecordError(ValueError):
+    pass
+
+
+def _parse_timestamp(value):
+    if isinstance(value, dict) and '$date' in value:
+        value = value['$date']
+    if not value:
+        raise RecordError('missing timestamp')
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            raise RecordError(f"invalid timestamp '{value}'")
+    # Stored timestamps are naive UTC; convert offsets instead of dropping them
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_object_id(value, field):
+    if isinstance(value, dict) and '$oid' in value:
+        value = value['$oid']
+    if not value or not ObjectId.is_valid(str(value)):
+        raise RecordError(f"invalid {field} '{value}'")
+    return ObjectId(str(value))
+
+
+def _number(value):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"invalid number '{value}'")
+
+
+def deterministic_id(timestamp, source_key, line_number):
+    """ObjectId with the record's time and a hash of its source position"""
+    digest = hashlib.md5(f'{source_key}:{line_number}'.encode('utf-8')).digest()
+    seconds = max(0, int((timestamp - datetime(1970, 1, 1)).total_seconds()))
+    return ObjectId(struct.pack('>I', seconds & 0xFFFFFFFF) + digest[:8])
+
+
+def validate_record(raw, source_key, line_number, known_users=None):
+    """Turn a raw NDJSON/CSV row into an emotion_data document"""
+    user_id = _parse_object_id(raw.get('user_id'), 'user_id')
+    if known_users is not None and user_id not in known_users:
+        raise RecordError(f'unknown user {user_id}')
+
+    emotion_type = (raw.get('emotion_type') or '').strip()
+    if emotion_type not in EMOTION_TYPES:
+        raise RecordError(f"invalid emotion_type '{emotion_type}'")
+
+    timestamp = _parse_timestamp(raw.get('timestamp'))
+
+    data = raw.get('data') or {}
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            raise RecordError('data is not valid JSON')
+    if not isinstance(data, dict):
+        raise RecordError('data must be an object')
+
+    # Flat CSV columns fill in anything missing from the data blob
+    for field in ('dominant_emotion', 'confidence', 'wellness_score'):
+        value = raw.get(field)
+        if value not in (None, '') and field not in data:
+            data[field] = value if field == 'dominant_emotion' else _number(value)
+
+    mood_score = _number(raw.get('mood_score'))
+    if mood_score is None:
+        mood_score = _number(data.get('wellness_score')) or 0
+
+    record_id = raw.get('_id') or raw.get('id')
+    if record_id:
+        record_id = _parse_object_id(record_id, '_id')
+    else:
+        record_id = deterministic_id(timestamp, source_key, line_number)
+
+    return {
+        '_id': record_id,
+        'user_id': user_id,
+        'emotion_type': emotion_type,
+        'data': data,
+        'mood_score': mood_score,
+        'timestamp': timestamp
+    }
+
+
+def read_rows(path, file_format, start_line=0):
+    """Yield (line_number, raw_row_or_error) from an NDJSON or CSV file"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format == 'csv':
+            for line_number, row in enumerate(csv.DictReader(f), start=1):
+                if line_number > start_line:
+                    yield line_number, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line_number <= start_line or not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, RecordError('invalid JSON')
+
+
+class Checkpoint:
+    """Resume position (last fully written line) stored next to the input"""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {'line': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+
+    @property
+    def line(self):
+        return self.state['line']
+
+    def save(self):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _insert_batch(collection, documents):
+    """insert_many(ordered=False); returns (inserted, duplicates)"""
+    if not documents:
+        return 0, 0
+    try:
+        result = collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        fatal = [error for error in errors if error.get('code') != DUPLICATE_KEY_ERROR]
+        if fatal:
+            raise
+        return e.details.get('nInserted', 0), len(errors)
+
+
+def import_emotion_records(db, path, file_format=None, batch_size=5000, workers=4,
+                           verify_users=False, checkpoint_path=None, rejects=None, progress=None):
+    """Validate and bulk insert emotion records from an NDJSON/CSV file"""
+    file_format = file_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    checkpoint = Checkpoint(checkpoint_path or f'{path}.checkpoint')
+    # Full path, so same-named files in different directories get different _ids
+    source_key = os.path.realpath(path)
+    collection = db.emotion_data
+
+    known_users = None
+    if verify_users:
+        known_users = {user['_id'] for user in db.users.find({}, {'_id': 1})}
+
+    per_user = {}
+    pending = {}
+    finished = {}
+    next_batch = 0
+    next_to_commit = 0
+
+    def commit_finished():
+        # Advance the checkpoint only over a contiguous prefix of finished batches
+        nonlocal next_to_commit
+        while next_to_commit in finished:
+            last_line, inserted, duplicates, invalid = finished.pop(next_to_commit)
+            checkpoint.state['line'] = last_line
+            checkpoint.state['inserted'] += inserted
+            checkpoint.state['duplicates'] += duplicates
+            checkpoint.state['invalid'] += invalid
+            next_to_commit += 1
+        checkpoint.save()
+        if progress:
+            progress(checkpoint.state)
+
+    def collect(done):
+        for future in done:
+            batch_number, last_line, invalid = pending.pop(future)
+            inserted, duplicates = future.result()
+            finished[batch_number] = (last_line, inserted, duplicates, invalid)
+        commit_finished()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        batch = []
+        invalid = 0
+        last_line = checkpoint.line
+
+        def submit():
+            nonlocal batch, invalid, next_batch
+            future = executor.submit(_insert_batch, collection, batch)
+            pending[future] = (next_batch, last_line, invalid)
+            next_batch += 1
+            batch = []
+            invalid = 0
+            # Keep at most two batches per worker in memory
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        for line_number, raw in read_rows(path, file_format, start_line=checkpoint.line):
+            last_line = line_number
+            try:
+                if isinstance(raw, RecordError):
+                    raise raw
+                document = validate_record(raw, source_key, line_number, known_users)
+            except RecordError as e:
+                invalid += 1
+                if rejects:
+                    rejects.write(json.dumps({'line': line_number, 'error': str(e)}) + '\n')
+                continue
+
+            batch.append(prepare_emotion_entry(document))
+            per_user[document['user_id']] = per_user.get(document['user_id'], 0) + 1
+            if len(batch) >= batch_size:
+                submit()
+
+        if batch or invalid:
+            submit()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    # One bulk_write bumps every touched user's version stamp for conditional GETs
+    bump_versions_bulk(db, per_user, 'emotion')
+
+    summary = dict(checkpoint.state)
+    summary['users'] = len(per_user)
+    checkpoint.remove()
+    return summary
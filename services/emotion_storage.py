@@ -0,0 +1,124 @@
+"""
+Storage layout helpers for the emotion_data collection.
+
+emotion_data can live either in a regular collection (the default) or in a
+MongoDB time-series collection bucketed by user and analysis type. In
+time-series mode every record also carries a ``meta`` sub-document
+({user_id, emotion_type}) used as the metaField; the top-level user_id and
+emotion_type fields are kept as well so existing finds, counts and
+aggregations keep working without changes. Requires MongoDB 7.0+ for the
+arbitrary deletes done on account removal.
+"""
+from flask import current_app, has_app_context
+
+EMOTION_COLLECTION = 'emotion_data'
+LEGACY_COLLECTION = 'emotion_data_legacy'
+
+STORAGE_REGULAR = 'regular'
+STORAGE_TIMESERIES = 'timeseries'
+
+
+def storage_mode():
+    """Configured emotion_data storage mode"""
+    if has_app_context():
+        return current_app.config.get('EMOTION_STORAGE', STORAGE_REGULAR)
+    return STORAGE_REGULAR
+
+
+def timeseries_options(granularity='seconds'):
+    return {
+        'timeField': 'timestamp',
+        'metaField': 'meta',
+        'granularity': granularity
+    }
+
+
+def with_meta(entry):
+    """Add the time-series metaField to an emotion_data document"""
+    entry['meta'] = {
+        'user_id': entry.get('user_id'),
+        'emotion_type': entry.get('emotion_type')
+    }
+    return entry
+
+
+def prepare_emotion_entry(entry):
+    """Shape a new emotion_data document for the configured storage mode"""
+    if storage_mode() == STORAGE_TIMESERIES:
+        return with_meta(entry)
+    return entry
+
+
+def collection_exists(db, name=EMOTION_COLLECTION):
+    return bool(list(db.list_collections(filter={'name': name})))
+
+
+def is_timeseries(db, name=EMOTION_COLLECTION):
+    info = list(db.list_collections(filter={'name': name}))
+    return bool(info) and info[0].get('type') == 'timeseries'
+
+
+def create_timeseries_collection(db, name=EMOTION_COLLECTION, granularity='seconds'):
+    """Create a time-series emotion_data collection and its query index"""
+    db.create_collection(name, timeseries=timeseries_options(granularity))
+    # Dashboard/admin reads filter on the top-level user_id and sort by time
+    db[name].create_index([('user_id', 1), ('timestamp', -1)])
+    return db[name]
+
+
+def migrate_to_timeseries(db, batch_size=5000, granularity='seconds', drop_legacy=False):
+    """Move emotion_data into a time-series collection.
+
+    The regular collection is renamed to emotion_data_legacy, a new
+    time-series emotion_data is created and documents are copied across in
+    unordered batches. Run it in a maintenance window: writes made between
+    the rename and the copy finishing land in the new collection directly.
+    """
+    if is_timeseries(db):
+        return {'migrated': 0, 'skipped': 0, 'status': 'already_timeseries'}
+
+    if not collection_exists(db):
+        create_timeseries_collection(db, granularity=granularity)
+        return {'migrated': 0, 'skipped': 0, 'status': 'created'}
+
+    if collection_exists(db, LEGACY_COLLECTION):
+        raise RuntimeError(f"{LEGACY_COLLECTION} already exists; drop or rename it first")
+
+    db[EMOTION_COLLECTION].rename(LEGACY_COLLECTION)
+    target = create_timeseries_collection(db, granularity=granularity)
+    legacy = db[LEGACY_COLLECTION]
+
+    migrated = 0
+    skipped = 0
+    batch = []
+    for doc in legacy.find({}, batch_size=batch_size):
+        # timeField is mandatory in a time-series collection
+        if doc.get('timestamp') is None:
+            skipped += 1
+            continue
+        batch.append(with_meta(doc))
+        if len(batch) >= batch_size:
+            target.insert_many(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+
+    if batch:
+        target.insert_many(batch, ordered=False)
+        migrated += len(batch)
+
+    if drop_legacy and migrated + skipped == legacy.estimated_document_count():
+        legacy.drop()
+
+    return {'migrated': migrated, 'skipped': skipped, 'status': 'migrated'}
+
+
+def storage_stats(db, name=EMOTION_COLLECTION):
+    """Storage size figures for an emotion_data collection"""
+    stats = list(db[name].aggregate([{'$collStats': {'storageStats': {}}}]))
+    storage = stats[0].get('storageStats', {}) if stats else {}
+    return {
+        'count': storage.get('count', 0),
+        'size': storage.get('size', 0),
+        'storage_size': storage.get('storageSize', 0),
+        'index_size': storage.get('totalIndexSize', 0)
+    }
@@ -0,0 +1,332 @@
+"""
+Ranked face detector tiers with load-driven degradation.
+
+Tiers, most accurate (and slowest) first:
+
+* ``retinaface`` - retina-face package (TensorFlow), a few hundred ms
+* ``mtcnn``      - mtcnn package (TensorFlow), ~50-150 ms
+* ``yunet``      - YuNet ONNX via cv2.FaceDetectorYN, ~5-15 ms
+* ``ssd``        - OpenCV res10 SSD (Caffe) via cv2.dnn, ~10-30 ms
+* ``haar``       - OpenCV Haar cascade, ~5 ms, ships with opencv-python
+
+The default FACE_DETECTOR_TIERS is ``yunet,ssd,haar``. The two TensorFlow
+tiers are opt-in: both packages are installed with DeepFace, and listing
+them pulls TensorFlow into the opencv-dnn backend.
+
+The SSD weights (deploy.prototxt, res10_300x300_ssd_iter_140000.caffemodel)
+come from github.com/opencv/opencv, samples/dnn/face_detector.
+
+FACE_DETECTOR_TIERS picks and orders the tiers; tiers whose package or
+weights are missing are skipped. The controller keeps a latency average
+per tier and counts detections in flight across every worker process on
+this machine (services/worker_gauge.py), since a sync worker only ever
+sees its own one. When either that count reaches
+FACE_DETECTOR_QUEUE_HIGH or the current tier's average exceeds
+FACE_DETECTOR_LATENCY_BUDGET_MS it steps down one tier; after
+FACE_DETECTOR_RECOVER_AFTER calm detections (nothing else in flight on
+the machine, latency under half the budget) it steps back up, unless the tier
+above is already known to blow the budget (it is retried after five times
+as many calm detections). Shifts are at least
+FACE_DETECTOR_COOLDOWN_SECONDS apart so one slow frame does not flap
+tiers. Every detect() returns the tier it used, and the face results
+carry it as ``detector_tier``.
+"""
+import importlib.util
+import os
+import threading
+import time
+from collections import deque
+
+from services.stage_metrics import stage
+from services.worker_gauge import worker_gauge
+
+DEFAULTS = {
+    'FACE_DNN_DETECTOR': 'weights/face_detection_yunet_2023mar.onnx',
+    'FACE_DNN_SCORE_THRESHOLD': 0.7,
+    'FACE_SSD_PROTOTXT': 'weights/deploy.prototxt',
+    'FACE_SSD_MODEL': 'weights/res10_300x300_ssd_iter_140000.caffemodel',
+    'FACE_SSD_MIN_SCORE': 0.5,
+}
+
+
+class Detector:
+    name = None
+
+    def __init__(self, config):
+        self.config = config
+        self._model = None
+        self._lock = threading.Lock()
+
+    def available(self):
+        return True
+
+    def load(self):
+        raise NotImplementedError
+
+    def _detect(self, model, image):
+        raise NotImplementedError
+
+    def ensure_loaded(self):
+        with self._lock:
+            if self._model is None:
+                self._model = self.load()
+
+    def detect(self, image):
+        """[(x, y, w, h, score)] in image pixels"""
+        self.ensure_loaded()
+        with self._lock:
+            return self._detect(self._model, image)
+
+
+class HaarDetector(Detector):
+    name = 'haar'
+
+    def load(self):
+        import cv2
+        return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+    def _detect(self, cascade, image):
+        import cv2
+        gray = cv2.equalizeHist(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(24, 24))
+        return [(int(x), int(y), int(w), int(h), 1.0) for x, y, w, h in faces]
+
+
+class SsdDetector(Detector):
+    name = 'ssd'
+
+    def available(self):
+        return os.path.exists(self.config['FACE_SSD_PROTOTXT']) and os.path.exists(self.config['FACE_SSD_MODEL'])
+
+    def load(self):
+        import cv2
+        return cv2.dnn.readNetFromCaffe(self.config['FACE_SSD_PROTOTXT'], self.config['FACE_SSD_MODEL'])
+
+    def _detect(self, net, image):
+        import cv2
+        height, width = image.shape[:2]
+        net.setInput(cv2.dnn.blobFromImage(cv2.resize(image, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0)))
+        detections = net.forward()[0, 0]
+        boxes = []
+        for detection in detections:
+            score = float(detection[2])
+            if score < self.config['FACE_SSD_MIN_SCORE']:
+                continue
+            x1, y1 = max(0, int(detection[3] * width)), max(0, int(detection[4] * height))
+            x2, y2 = min(width, int(detection[5] * width)), min(height, int(detection[6] * height))
+            if x2 > x1 and y2 > y1:
+                boxes.append((x1, y1, x2 - x1, y2 - y1, score))
+        return boxes
+
+
+class YuNetDetector(Detector):
+    name = 'yunet'
+
+    def available(self):
+        return os.path.exists(self.config['FACE_DNN_DETECTOR'])
+
+    def load(self):
+        import cv2
+        return cv2.FaceDetectorYN.create(self.config['FACE_DNN_DETECTOR'], '', (320, 320),
+                                         self.config['FACE_DNN_SCORE_THRESHOLD'], 0.3, 5000)
+
+    def _detect(self, detector, image):
+        height, width = image.shape[:2]
+        detector.setInputSize((width, height))
+        _, faces = detector.detect(image)
+        if faces is None:
+            return []
+        boxes = []
+        for face in faces:
+            x, y = max(0, int(face[0])), max(0, int(face[1]))
+            w, h = min(width - x, int(face[2])), min(height - y, int(face[3]))
+            if w > 0 and h > 0:
+                boxes.append((x, y, w, h, float(face[14])))
+        return boxes
+
+
+class MtcnnDetector(Detector):
+    name = 'mtcnn'
+
+    def available(self):
+        return importlib.util.find_spec('mtcnn') is not None
+
+    def load(self):
+        from mtcnn import MTCNN
+        return MTCNN()
+
+    def _detect(self, mtcnn, image):
+        import cv2
+        faces = mtcnn.detect_faces(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        return [(max(0, int(face['box'][0])), max(0, int(face['box'][1])), int(face['box'][2]), int(face['box'][3]),
+                 float(face['confidence'])) for face in faces]
+
+
+class RetinaFaceDetector(Detector):
+    name = 'retinaface'
+
+    def available(self):
+        return importlib.util.find_spec('retinaface') is not None
+
+    def load(self):
+        from retinaface import RetinaFace
+        return RetinaFace
+
+    def _detect(self, retinaface, image):
+        faces = retinaface.detect_faces(image)
+        if not isinstance(faces, dict):
+            return []
+        boxes = []
+        for face in faces.values():
+            x1, y1, x2, y2 = (int(v) for v in face['facial_area'])
+            boxes.append((x1, y1, x2 - x1, y2 - y1, float(face['score'])))
+        return boxes
+
+
+DETECTORS = {cls.name: cls for cls in (RetinaFaceDetector, MtcnnDetector, YuNetDetector, SsdDetector, HaarDetector)}
+
+
+class TieredFaceDetector:
+    def __init__(self, app=None, tiers=('yunet', 'ssd', 'haar'), latency_budget_ms=150,
+                 queue_high=4, recover_after=20, cooldown_seconds=10):
+        self.tier_names = list(tiers)
+        self.latency_budget = latency_budget_ms / 1000.0
+        self.queue_high = queue_high
+        self.recover_after = recover_after
+        self.cooldown = cooldown_seconds
+        self.config = dict(DEFAULTS)
+        self.tiers = []
+        self.index = 0
+        self.in_flight = 0
+        self.calm_streak = 0
+        self.last_shift = 0.0
+        self.latency = {}
+        self.detections = {}
+        self.shifts = deque(maxlen=20)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.tier_names = app.config.get('FACE_DETECTOR_TIERS', self.tier_names)
+        self.latency_budget = app.config.get('FACE_DETECTOR_LATENCY_BUDGET_MS', self.latency_budget * 1000) / 1000.0
+        self.queue_high = app.config.get('FACE_DETECTOR_QUEUE_HIGH', self.queue_high)
+        self.recover_after = app.config.get('FACE_DETECTOR_RECOVER_AFTER', self.recover_after)
+        self.cooldown = app.config.get('FACE_DETECTOR_COOLDOWN_SECONDS', self.cooldown)
+        self.config = {key: app.config.get(key, default) for key, default in DEFAULTS.items()}
+        with self._lock:
+            self.tiers = []
+            self.index = 0
+        app.extensions['face_detector'] = self
+
+    def _build_tiers(self):
+        tiers = []
+        for name in self.tier_names:
+            detector = DETECTORS[name](self.config) if name in DETECTORS else None
+            if detector is not None and detector.available():
+                tiers.append(detector)
+        if not tiers:
+            tiers.append(HaarDetector(self.config))
+        return tiers
+
+    def current(self):
+        with self._lock:
+            if not self.tiers:
+                self.tiers = self._build_tiers()
+            return self.tiers[self.index]
+
+    def detect(self, image):
+        """(boxes largest first, tier name) from the tier the controller currently allows"""
+        detector = self.current()
+        with self._lock:
+            self.in_flight += 1
+            local = self.in_flight
+        worker_gauge.add('face_detect', 1)
+        queued = worker_gauge.value('face_detect')
+        if queued is None:
+            queued = local
+        loaded = False
+        try:
+            # Model loading is a one-off and must not count against the tier's latency
+            detector.ensure_loaded()
+            loaded = True
+            started = time.perf_counter()
+            with stage('detect'):
+                boxes = detector.detect(image)
+        except Exception as e:
+            boxes = None
+            if loaded:
+                # One odd frame says nothing about the tier; keep it for the next request
+                print(f"Face detector tier {detector.name} failed on this frame: {e}")
+            else:
+                print(f"Face detector tier {detector.name} failed to load, dropping it: {e}")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            worker_gauge.add('face_detect', -1)
+
+        if boxes is None:
+            if not loaded and self._drop(detector):
+                return self.detect(image)
+            return [], detector.name
+        self._observe(detector.name, time.perf_counter() - started, queued)
+        return sorted(boxes, key=lambda box: box[2] * box[3], reverse=True), detector.name
+
+    def _drop(self, detector):
+        """Remove a tier that cannot run; False when it is the last one left"""
+        with self._lock:
+            if detector not in self.tiers:
+                return True
+            if len(self.tiers) == 1:
+                return False
+            position = self.tiers.index(detector)
+            self.tiers.remove(detector)
+            if position < self.index or self.index == len(self.tiers):
+                self.index -= 1
+            return True
+
+    def _observe(self, name, elapsed, queued):
+        with self._lock:
+            previous = self.latency.get(name)
+            self.latency[name] = elapsed if previous is None else previous * 0.8 + elapsed * 0.2
+            self.detections[name] = self.detections.get(name, 0) + 1
+            average = self.latency[name]
+            now = time.monotonic()
+
+            overloaded = queued >= self.queue_high or average > self.latency_budget
+            calm = queued <= 1 and average < self.latency_budget / 2
+            self.calm_streak = self.calm_streak + 1 if calm else 0
+            if now - self.last_shift < self.cooldown:
+                return
+
+            if overloaded and self.index < len(self.tiers) - 1:
+                self._shift(1, now, f'in flight {queued}, {name} avg {average * 1000:.0f} ms')
+            elif self.calm_streak >= self.recover_after and self.index > 0:
+                upper = self.latency.get(self.tiers[self.index - 1].name)
+                # The upper tier's average may have been measured under load; probe it again eventually
+                if upper is None or upper <= self.latency_budget or self.calm_streak >= self.recover_after * 5:
+                    self._shift(-1, now, f'{self.calm_streak} calm detections')
+
+    def _shift(self, step, now, reason):
+        previous = self.tiers[self.index].name
+        self.index += step
+        self.last_shift = now
+        self.calm_streak = 0
+        self.shifts.append({'at': time.time(), 'from': previous, 'to': self.tiers[self.index].name,
+                            'reason': reason})
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tiers': [detector.name for detector in self.tiers] or self.tier_names,
+                'current': self.tiers[self.index].name if self.tiers else None,
+                'in_flight': self.in_flight,
+                'machine_in_flight': worker_gauge.value('face_detect'),
+                'latency_budget_ms': self.latency_budget * 1000,
+                'avg_latency_ms': {name: round(value * 1000, 2) for name, value in self.latency.items()},
+                'detections': dict(self.detections),
+                'recent_shifts': list(self.shifts)
+            }
+
+
+face_detector = TieredFaceDetector()
@@ -0,0 +1,173 @@
+"""
+TensorFlow-free face emotion backend on OpenCV's DNN module.
+
+Drop-in for services.face_analysis (``FACE_BACKEND = 'opencv-dnn'``):
+faces are found by the tiered detectors in services/face_detectors.py
+(YuNet, cv2.FaceDetectorYN, when it is configured and not degraded) and
+classified by the FER+ ONNX network through cv2.dnn. With the default
+FACE_DETECTOR_TIERS (yunet,ssd,haar) neither TensorFlow, Keras nor
+DeepFace is imported; adding the mtcnn or retinaface tier brings
+TensorFlow back. Weights are read from FACE_DNN_DETECTOR / FACE_DNN_CLASSIFIER:
+
+* face_detection_yunet_2023mar.onnx - github.com/opencv/opencv_zoo,
+  models/face_detection_yunet
+* emotion-ferplus-8.onnx - github.com/onnx/models,
+  validated/vision/body_analysis/emotion_ferplus
+
+FER+ predicts eight classes; they are mapped onto the seven labels the
+DeepFace path returns (contempt folds into disgust), and scores are
+percentages like DeepFace's, so routes, the wellness score and stored
+records see the same shape from either backend. ``classify`` takes any
+number of crops and runs them as one batch; ``analyze_faces`` uses that
+for every face in a classroom frame (routes/liveclass.py).
+"""
+import threading
+
+from flask import current_app, has_app_context
+
+from services.face_detectors import face_detector
+from services.frame_decode import decode_frame
+
+EMOTION_LABELS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+# FER+ output order -> DeepFace label
+FERPLUS_LABELS = ['neutral', 'happy', 'surprise', 'sad', 'angry', 'disgust', 'fear', 'disgust']
+FERPLUS_INPUT_SIZE = 64
+
+DEFAULTS = {
+    'FACE_DNN_CLASSIFIER': 'weights/emotion-ferplus-8.onnx',
+}
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+class DnnFaceAnalyzer:
+    def __init__(self, classifier_path, detector=face_detector):
+        import cv2
+
+        self.detector = detector
+        self.classifier = cv2.dnn.readNetFromONNX(classifier_path)
+        # cv2.dnn nets keep per-call state; one forward at a time per net
+        self._classify_lock = threading.Lock()
+
+    def detect(self, image):
+        """([(x, y, w, h, score)] for every face in a BGR image largest first, detector tier)"""
+        return self.detector.detect(image)
+
+    @staticmethod
+    def crop(gray, box, margin=0.1):
+        """Square-ish grayscale crop around a face box with a small margin"""
+        x, y, w, h = box[:4]
+        dx, dy = int(w * margin), int(h * margin)
+        top, left = max(0, y - dy), max(0, x - dx)
+        return gray[top:y + h + dy, left:x + w + dx]
+
+    def classify(self, crops):
+        """Emotion percentages for each grayscale crop, in one forward pass"""
+        import cv2
+        import numpy as np
+
+        if not crops:
+            return []
+        blob = cv2.dnn.blobFromImages(
+            [cv2.resize(crop, (FERPLUS_INPUT_SIZE, FERPLUS_INPUT_SIZE), interpolation=cv2.INTER_AREA)
+             for crop in crops],
+            scalefactor=1.0, size=(FERPLUS_INPUT_SIZE, FERPLUS_INPUT_SIZE), mean=0, swapRB=False, crop=False
+        )
+        with self._classify_lock:
+            self.classifier.setInput(blob)
+            logits = self.classifier.forward().reshape(len(crops), -1)
+
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities = exp / exp.sum(axis=1, keepdims=True)
+
+        results = []
+        for row in probabilities:
+            emotions = dict.fromkeys(EMOTION_LABELS, 0.0)
+            for label, p in zip(FERPLUS_LABELS, row):
+                emotions[label] += float(p) * 100
+            results.append({label: round(score, 2) for label, score in emotions.items()})
+        return results
+
+    def analyze_faces(self, image, max_faces=None):
+        """Every face in a BGR image (largest first), classified in one batch; (faces, detector tier)"""
+        import cv2
+
+        boxes, tier = self.detect(image)
+        if max_faces:
+            boxes = boxes[:max_faces]
+        if not boxes:
+            return [], tier
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        faces = []
+        for (x, y, w, h, score), emotions in zip(boxes, self.classify([self.crop(gray, box) for box in boxes])):
+            dominant = max(emotions, key=emotions.get)
+            faces.append({
+                'dominant_emotion': dominant,
+                'emotions': emotions,
+                'confidence': emotions[dominant],
+                'region': {'x': x, 'y': y, 'w': w, 'h': h},
+                'detection_score': round(score, 4)
+            })
+        return faces, tier
+
+    def analyze_image(self, image):
+        import cv2
+
+        boxes, tier = self.detect(image)
+        if not boxes:
+            return {'error': 'No face detected', 'detector_tier': tier}
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        emotions = self.classify([self.crop(gray, boxes[0])])[0]
+        dominant = max(emotions, key=emotions.get)
+        x, y, w, h, score = boxes[0]
+        return {
+            'dominant_emotion': dominant,
+            'emotions': emotions,
+            'confidence': emotions[dominant],
+            'face_detected': True,
+            'faces_found': len(boxes),
+            'region': {'x': x, 'y': y, 'w': w, 'h': h},
+            'detection_score': round(score, 4),
+            'detector_tier': tier,
+            'backend': 'opencv-dnn'
+        }
+
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = DnnFaceAnalyzer(_setting('FACE_DNN_CLASSIFIER'))
+    return _analyzer
+
+
+def analyze_face_image(image):
+    """Analyze a BGR frame the route has already decoded"""
+    try:
+        return get_analyzer().analyze_image(image)
+    except Exception as e:
+        return {'error': f'Face analysis failed: {e}'}
+
+
+def analyze_face_from_b64(image_b64):
+    """Same contract as services.face_analysis.analyze_face_from_b64"""
+    try:
+        image = decode_frame(image_b64, 640)
+    except Exception as e:
+        return {'error': f'Face analysis failed: {e}'}
+    if image is None:
+        return {'error': 'Invalid image data'}
+    return analyze_face_image(image)
+
+
+def get_emotion_labels():
+    return list(EMOTION_LABELS)
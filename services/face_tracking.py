@@ -0,0 +1,296 @@
+"""
+Face tracks across live-class frames, so still faces are not re-classified.
+
+A classroom camera sends a frame every few seconds and most students barely
+move between them. Each live-class session keeps a FaceTracker:
+
+* full detection (the tiered detectors) runs every LIVECLASS_TRACK_DETECT_EVERY
+  frames, when nothing is tracked, or when the previous frame is more than
+  LIVECLASS_TRACK_FLOW_MAX_GAP_SECONDS old; detections are matched to
+  tracks by IoU, then by centroid distance for faces that moved further
+  than their own size overlaps allow
+* in between, track boxes are moved by pyramidal Lucas-Kanade optical flow
+  on a small grid of points per face, all tracks in one calcOpticalFlowPyrLK
+  call. Flow assumes small motion between frames (a 21x21 window over four
+  pyramid levels follows roughly 100 px), which only holds at video-like
+  cadences, so at the default 3 s camera interval every frame gets a full
+  detection and flow only takes over when frames come faster than the gap
+* the emotion classifier only runs, batched, for tracks that are new, whose
+  24x24 crop thumbnail changed by more than LIVECLASS_TRACK_CHANGE_THRESHOLD
+  grey levels on average, or that have gone LIVECLASS_TRACK_STALE_FRAMES
+  frames without being classified
+* each track keeps an exponential moving average of its emotion scores
+
+Trackers live in this worker's memory, in an LRU of at most
+LIVECLASS_TRACK_SESSIONS sessions that expire after
+LIVECLASS_TRACK_SESSION_TTL_SECONDS idle. Frames of one session must reach
+the same worker (sticky sessions, or a single worker for the classroom
+camera); a frame landing elsewhere simply starts a fresh tracker there.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from services.stage_metrics import stage
+
+THUMB_SIZE = 24
+FLOW_GRID = 4  # FLOW_GRID x FLOW_GRID points followed inside each face box
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a[:4]
+    bx, by, bw, bh = b[:4]
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    overlap = w * h
+    return overlap / float(aw * ah + bw * bh - overlap)
+
+
+def centroid_distance(a, b):
+    return ((a[0] + a[2] / 2 - b[0] - b[2] / 2) ** 2 + (a[1] + a[3] / 2 - b[1] - b[3] / 2) ** 2) ** 0.5
+
+
+class Track:
+    def __init__(self, track_id, box, score):
+        self.track_id = track_id
+        self.box = box
+        self.detection_score = score
+        self.thumb = None
+        self.emotions = None
+        self.last_classified = None
+        self.classified_frame = None
+        self.misses = 0
+        self.first_seen = time.monotonic()
+
+    def smooth(self, emotions, alpha):
+        if self.emotions is None:
+            self.emotions = dict(emotions)
+        else:
+            self.emotions = {label: self.emotions.get(label, 0.0) * (1 - alpha) + score * alpha
+                             for label, score in emotions.items()}
+
+    def result(self, now, reclassified):
+        emotions = {label: round(score, 2) for label, score in self.emotions.items()}
+        dominant = max(emotions, key=emotions.get)
+        x, y, w, h = self.box
+        return {
+            'track_id': self.track_id,
+            'dominant_emotion': dominant,
+            'emotions': emotions,
+            'confidence': emotions[dominant],
+            'region': {'x': x, 'y': y, 'w': w, 'h': h},
+            'detection_score': round(self.detection_score, 4),
+            'reclassified': reclassified,
+            'result_age_seconds': round(now - self.last_classified, 2),
+            'tracked_seconds': round(now - self.first_seen, 2)
+        }
+
+
+class FaceTracker:
+    def __init__(self, detect_every=5, iou_threshold=0.3, max_misses=2, change_threshold=12.0,
+                 stale_frames=10, flow_max_gap_seconds=1.0, smoothing=0.4):
+        self.detect_every = max(1, detect_every)
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.change_threshold = change_threshold
+        self.stale_frames = max(1, stale_frames)
+        self.flow_max_gap = flow_max_gap_seconds
+        self.smoothing = smoothing
+        self.tracks = []
+        self.next_id = 1
+        self.frames = 0
+        self.previous_gray = None
+        self.previous_at = None
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, image, analyzer, max_faces=None):
+        """(faces, detector tier or 'flow', counts) for one frame; analyzer is a DnnFaceAnalyzer"""
+        import cv2
+
+        with self.lock:
+            arrived = self.last_used = time.monotonic()
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Optical flow cannot bridge the motion of a multi-second gap; detect afresh instead
+            full_detection = (not self.tracks or self.previous_gray is None
+                              or self.previous_gray.shape != gray.shape or self.frames % self.detect_every == 0
+                              or arrived - self.previous_at > self.flow_max_gap)
+            if full_detection:
+                boxes, tier = analyzer.detect(image)
+                self._associate(boxes[:max_faces] if max_faces else boxes)
+            else:
+                tier = 'flow'
+                with stage('track'):
+                    self._follow(gray)
+            self.frames += 1
+            self.previous_gray = gray
+            self.previous_at = arrived
+
+            now = time.monotonic()
+            visible = [track for track in self.tracks if track.misses == 0]
+            crops = {track.track_id: analyzer.crop(gray, track.box) for track in visible}
+            thumbs = {track_id: cv2.resize(crop, (THUMB_SIZE, THUMB_SIZE), interpolation=cv2.INTER_AREA)
+                      for track_id, crop in crops.items() if crop.size}
+            pending = [track for track in visible
+                       if track.track_id in thumbs and self._needs_classification(track, thumbs[track.track_id])]
+
+            for track, emotions in zip(pending, analyzer.classify([crops[track.track_id] for track in pending])):
+                track.smooth(emotions, self.smoothing)
+                track.thumb = thumbs[track.track_id]
+                track.last_classified = now
+                track.classified_frame = self.frames
+
+            reclassified = {track.track_id for track in pending}
+            faces = [track.result(now, track.track_id in reclassified)
+                     for track in visible if track.emotions is not None]
+            return faces, tier, {
+                'tracks': len(self.tracks),
+                'visible': len(visible),
+                'classified': len(pending),
+                'full_detection': full_detection
+            }
+
+    def _needs_classification(self, track, thumb):
+        if track.thumb is None or self.frames - track.classified_frame >= self.stale_frames:
+            return True
+        import cv2
+        return cv2.absdiff(thumb, track.thumb).mean() > self.change_threshold
+
+    def _associate(self, boxes):
+        """Match fresh detections to tracks: IoU first, then nearest centroid"""
+        tracks = list(self.tracks)
+
+        pairs = sorted(((iou(track.box, box), t, b) for t, track in enumerate(tracks)
+                        for b, box in enumerate(boxes)), reverse=True)
+        used_tracks, used_boxes = set(), set()
+        for overlap, t, b in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if t in used_tracks or b in used_boxes:
+                continue
+            self._refresh(tracks[t], boxes[b])
+            used_tracks.add(t)
+            used_boxes.add(b)
+
+        # Faces that moved more than their overlap allows: closest centroid within one face width
+        for b, box in enumerate(boxes):
+            if b in used_boxes:
+                continue
+            candidates = [(centroid_distance(track.box, box), t) for t, track in enumerate(tracks)
+                          if t not in used_tracks]
+            if candidates:
+                distance, t = min(candidates)
+                if distance <= max(box[2], box[3]):
+                    self._refresh(tracks[t], box)
+                    used_tracks.add(t)
+                    used_boxes.add(b)
+                    continue
+            self.tracks.append(Track(self.next_id, tuple(box[:4]), box[4]))
+            self.next_id += 1
+
+        for t, track in enumerate(tracks):
+            if t not in used_tracks:
+                track.misses += 1
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+    @staticmethod
+    def _refresh(track, box):
+        track.box = tuple(box[:4])
+        track.detection_score = box[4]
+        track.misses = 0
+
+    def _follow(self, gray):
+        """Shift every visible track by the median optical flow of a point grid inside its box"""
+        import cv2
+        import numpy as np
+
+        visible = [track for track in self.tracks if track.misses == 0]
+        if not visible:
+            return
+        steps = (np.arange(FLOW_GRID) + 0.5) / FLOW_GRID
+        points = []
+        for track in visible:
+            x, y, w, h = track.box
+            points.extend((x + w * sx, y + h * sy) for sy in steps for sx in steps)
+        previous = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.previous_gray, gray, previous, None,
+                                                    winSize=(21, 21), maxLevel=3)
+
+        height, width = gray.shape[:2]
+        per_track = FLOW_GRID * FLOW_GRID
+        for i, track in enumerate(visible):
+            block = slice(i * per_track, (i + 1) * per_track)
+            ok = status[block].ravel() == 1
+            if ok.sum() < per_track // 2:
+                # Flow lost the face (occluded, turned away); the next detection decides
+                track.misses += 1
+                continue
+            shift = np.median((moved[block] - previous[block]).reshape(-1, 2)[ok], axis=0)
+            x, y, w, h = track.box
+            x = int(min(max(0, round(x + shift[0])), width - w))
+            y = int(min(max(0, round(y + shift[1])), height - h))
+            track.box = (x, y, w, h)
+
+
+class FaceTrackerStore:
+    def __init__(self, app=None, max_sessions=32, ttl_seconds=300):
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.settings = {}
+        self._trackers = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_sessions = app.config.get('LIVECLASS_TRACK_SESSIONS', self.max_sessions)
+        self.ttl = app.config.get('LIVECLASS_TRACK_SESSION_TTL_SECONDS', self.ttl)
+        self.settings = {
+            'detect_every': app.config.get('LIVECLASS_TRACK_DETECT_EVERY', 5),
+            'iou_threshold': app.config.get('LIVECLASS_TRACK_IOU_THRESHOLD', 0.3),
+            'max_misses': app.config.get('LIVECLASS_TRACK_MAX_MISSES', 2),
+            'change_threshold': app.config.get('LIVECLASS_TRACK_CHANGE_THRESHOLD', 12.0),
+            'stale_frames': app.config.get('LIVECLASS_TRACK_STALE_FRAMES', 10),
+            'flow_max_gap_seconds': app.config.get('LIVECLASS_TRACK_FLOW_MAX_GAP_SECONDS', 1.0),
+            'smoothing': app.config.get('LIVECLASS_TRACK_SMOOTHING', 0.4)
+        }
+        app.extensions['face_trackers'] = self
+
+    def get(self, key):
+        """The session's tracker, created on first use; expired and least recently used ones are dropped"""
+        now = time.monotonic()
+        with self._lock:
+            for stale_key in [k for k, tracker in self._trackers.items() if now - tracker.last_used > self.ttl]:
+                del self._trackers[stale_key]
+                self.evicted += 1
+
+            tracker = self._trackers.get(key)
+            if tracker is None:
+                tracker = self._trackers[key] = FaceTracker(**self.settings)
+                self.created += 1
+                while len(self._trackers) > self.max_sessions:
+                    self._trackers.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._trackers.move_to_end(key)
+            tracker.last_used = now
+            return tracker
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._trackers),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl,
+                'created': self.created,
+                'evicted': self.evicted,
+                'settings': self.settings,
+                'tracks': {key: len(tracker.tracks) for key, tracker in self._trackers.items()}
+            }
+
+
+face_trackers = FaceTrackerStore()
@@ -0,0 +1,112 @@
+"""
+Cheap decoding of incoming webcam frames.
+
+Frames arrive as base64 JPEG data URLs, often at the webcam's native
+1280x720 or more, while the emotion classifier only needs a 48x48 face
+crop. JPEG frames are decoded with OpenCV's IMREAD_REDUCED_* flags (the
+decoder skips DCT detail instead of decoding every pixel) at the smallest
+power-of-two reduction that still covers the requested size, then
+area-resized down to it. The whole face analysis (detection, crop and
+classification) then runs on that small frame: at FACE_ANALYSIS_MAX_SIDE
+a webcam face is still well over the classifier's input size.
+
+cv2/numpy are imported inside the functions to keep worker start-up
+fast (see services/lazy_loader.py).
+"""
+import base64
+import binascii
+
+# Start-of-frame markers that carry the image size (baseline, extended, progressive, lossless)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def split_data_url(image_b64):
+    """Strip a 'data:image/...;base64,' prefix if present"""
+    if image_b64.startswith('data:') and ',' in image_b64:
+        return image_b64.split(',', 1)[1]
+    return image_b64
+
+
+def decode_b64(image_b64):
+    try:
+        return base64.b64decode(split_data_url(image_b64))
+    except (binascii.Error, ValueError):
+        return None
+
+
+def jpeg_size(data):
+    """(width, height) from a JPEG header without decoding, None if not a JPEG"""
+    if len(data) < 4 or data[0:2] != b'\xff\xd8':
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = int.from_bytes(data[i + 2:i + 4], 'big')
+        if marker in _SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return width, height
+        i += 2 + length
+    return None
+
+
+def reduction_factor(width, height, max_side):
+    """Largest of 8/4/2 that keeps the decoded image at least max_side on its long edge"""
+    long_side = max(width, height)
+    for factor in (8, 4, 2):
+        if long_side // factor >= max_side:
+            return factor
+    return 1
+
+
+def downscale(image, max_side):
+    """Area-resize so the long edge is at most max_side"""
+    import cv2
+
+    height, width = image.shape[:2]
+    long_side = max(width, height)
+    if max_side <= 0 or long_side <= max_side:
+        return image
+    scale = max_side / long_side
+    return cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def decode_frame(image_b64, max_side=640):
+    """Decode a base64 frame at reduced resolution; BGR image or None"""
+    import cv2
+    import numpy as np
+
+    data = decode_b64(image_b64)
+    if not data:
+        return None
+
+    flags = cv2.IMREAD_COLOR
+    size = jpeg_size(data)
+    if size and max_side > 0:
+        flags = {
+            8: cv2.IMREAD_REDUCED_COLOR_8,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            1: cv2.IMREAD_COLOR
+        }[reduction_factor(size[0], size[1], max_side)]
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    if image is None:
+        return None
+    return downscale(image, max_side)
+
+
+def encode_jpeg_b64(image, quality=90):
+    import cv2
+
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        return None
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.tobytes()).decode('ascii')
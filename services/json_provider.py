@@ -0,0 +1,60 @@
+"""
+orjson-backed JSON provider for Flask.
+
+Encodes ObjectId, datetime (naive values are UTC) and numpy scalars/arrays
+natively, so model and route code can hand Mongo documents and model
+outputs straight to jsonify without converting them field by field.
+"""
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(value):
+    """Types orjson does not encode on its own"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    # numpy scalars that OPT_SERIALIZE_NUMPY does not cover (e.g. float16)
+    if hasattr(value, 'item') and hasattr(value, 'dtype'):
+        return value.item()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, sort_keys=False, indent=False):
+    option = ORJSON_OPTIONS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=orjson_default, option=option)
+
+
+class OrjsonProvider(JSONProvider):
+    sort_keys = False
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self._app.debug
+        return self._app.response_class(
+            dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent),
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,119 @@
+"""
+Deferred loading of the heavy ML/LLM service modules.
+
+services.face_analysis, text_analysis, voice_analysis and
+wellness_recommender pull in torch, transformers, TensorFlow/DeepFace,
+librosa and google-generativeai. Routes hold LazyModule/LazyObject
+proxies instead, so a worker can serve /login and the dashboards without
+importing any of them; the first analysis request (or warm_up()) pays the
+import cost once per process.
+"""
+import importlib
+import threading
+import time
+
+_registry = []
+_load_times = {}
+_load_hooks = []
+_load_lock = threading.RLock()
+
+
+def on_load(callback):
+    """Call ``callback()`` after any lazy module or object finishes loading"""
+    _load_hooks.append(callback)
+
+
+def _run_load_hooks():
+    for callback in list(_load_hooks):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error in lazy load hook: {e}")
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        _registry.append(self)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            with _load_lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    _load_times[self._name] = time.perf_counter() - started
+                    self._module = module
+                    _run_load_hooks()
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+class LazyObject:
+    """Singleton built by ``factory`` on first attribute access"""
+
+    def __init__(self, name, factory):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        _registry.append(self)
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def load(self):
+        if self._instance is None:
+            with _load_lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    _load_times[self._name] = time.perf_counter() - started
+                    self._instance = instance
+                    _run_load_hooks()
+        return self._instance
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+def lazy_instance(module_name, class_name, *args, **kwargs):
+    """LazyObject for ``module_name.class_name(*args, **kwargs)``"""
+    def factory():
+        return getattr(importlib.import_module(module_name), class_name)(*args, **kwargs)
+    return LazyObject(f'{module_name}.{class_name}', factory)
+
+
+def warm_up():
+    """Load every registered lazy module/object now"""
+    for proxy in list(_registry):
+        try:
+            proxy.load()
+        except Exception as e:
+            print(f"Error warming up {proxy._name}: {e}")
+
+
+def warm_up_in_background():
+    thread = threading.Thread(target=warm_up, name='ml-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def load_report():
+    """Which heavy modules this process has loaded and what each cost"""
+    return {
+        proxy._name: {
+            'loaded': proxy.loaded,
+            'load_seconds': round(_load_times[proxy._name], 3) if proxy._name in _load_times else None
+        }
+        for proxy in _registry
+    }
@@ -0,0 +1,169 @@
+"""
+Bounded, off-thread bcrypt hashing and verification.
+
+Every bcrypt call costs a few hundred ms of CPU. Hashing runs on a small
+per-process thread pool (bcrypt releases the GIL) with two caps on how many
+calls may be queued or running: BCRYPT_WORKERS + BCRYPT_MAX_QUEUE per
+process, which only matters under a threaded worker class, and
+BCRYPT_MAX_IN_FLIGHT across every worker on the machine
+(services/worker_gauge.py), which is what bounds a login rush under
+gunicorn's sync workers. Past either cap callers get PasswordHasherBusy
+right away, which the app turns into a 503 with Retry-After instead of
+letting a login rush tie up every worker.
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from services.worker_gauge import worker_gauge
+
+_COST_PATTERN = re.compile(rb'^\$2[aby]?\$(\d{2})\$')
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Password hashing is overloaded, please retry shortly')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    def __init__(self, app=None, rounds=12, workers=2, max_queue=8, max_in_flight=0, retry_after=2):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight or 2 * (os.cpu_count() or 1)
+        self.retry_after = retry_after
+        self._executor = None
+        self._executor_pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._samples = {'hash': deque(maxlen=1000), 'verify': deque(maxlen=1000)}
+        self._queue_waits = deque(maxlen=1000)
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.upgraded = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_ROUNDS', self.rounds)
+        self.workers = app.config.get('BCRYPT_WORKERS', self.workers)
+        self.max_queue = app.config.get('BCRYPT_MAX_QUEUE', self.max_queue)
+        self.max_in_flight = app.config.get('BCRYPT_MAX_IN_FLIGHT') or self.max_in_flight
+        self.retry_after = app.config.get('BCRYPT_RETRY_AFTER', self.retry_after)
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Recreate after fork so each gunicorn worker owns its own pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='bcrypt')
+                self._executor_pid = os.getpid()
+                self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+            return self._executor
+
+    def _run(self, kind, func, *args, wait=True):
+        executor = self._get_executor()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy(self.retry_after)
+        if not worker_gauge.try_acquire('bcrypt', self.max_in_flight):
+            self._slots.release()
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy(self.retry_after)
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._queue_waits.append(started - submitted)
+                    self._samples[kind].append(finished - started)
+                    self.completed += 1
+                    self.in_flight -= 1
+                self._slots.release()
+                worker_gauge.release('bcrypt')
+
+        with self._lock:
+            self.in_flight += 1
+        future = executor.submit(task)
+        return future.result() if wait else future
+
+    def hash(self, password):
+        """bcrypt hash at the configured cost"""
+        return self._run('hash', lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)))
+
+    def verify(self, password, hashed):
+        if isinstance(hashed, str):
+            hashed = hashed.encode('utf-8')
+        return self._run('verify', bcrypt.checkpw, password.encode('utf-8'), hashed)
+
+    def needs_rehash(self, hashed):
+        """True when a stored hash was made with a lower cost than configured"""
+        if isinstance(hashed, str):
+            hashed = hashed.encode('utf-8')
+        match = _COST_PATTERN.match(hashed or b'')
+        return bool(match) and int(match.group(1)) < self.rounds
+
+    def upgrade_in_background(self, users, user_id, password, old_hash):
+        """Re-hash at the current cost without delaying the login; skipped when busy.
+
+        Only replaces ``old_hash``, so a password changed meanwhile is never overwritten.
+        """
+        def rehash():
+            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+            result = users.update_one({'_id': user_id, 'password': old_hash}, {'$set': {'password': hashed}})
+            if result.modified_count:
+                with self._lock:
+                    self.upgraded += 1
+
+        try:
+            self._run('hash', rehash, wait=False)
+        except PasswordHasherBusy:
+            pass
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {'count': 0, 'p50_ms': 0, 'p95_ms': 0, 'p99_ms': 0}
+        ordered = sorted(samples)
+
+        def pick(q):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+
+        return {'count': len(ordered), 'p50_ms': pick(0.5), 'p95_ms': pick(0.95), 'p99_ms': pick(0.99)}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rounds': self.rounds,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.in_flight,
+                'machine_in_flight': worker_gauge.value('bcrypt'),
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'upgraded': self.upgraded,
+                'hash': self._percentiles(list(self._samples['hash'])),
+                'verify': self._percentiles(list(self._samples['verify'])),
+                'queue_wait': self._percentiles(list(self._queue_waits))
+            }
+
+
+password_hasher = PasswordHasher()
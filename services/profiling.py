@@ -0,0 +1,162 @@
+"""
+On-demand profiling of a single request, for admins only.
+
+An admin opts a request in with an ``X-Profile: 1`` header or a
+``?_profile=1`` query flag. That request runs under cProfile plus a
+stack sampler on a side thread; everything else pays one header lookup.
+Two files land in PROFILE_DIR per profiled request:
+
+* ``<id>.pstats`` - deterministic profile, open with ``python -m pstats``
+  or snakeviz
+* ``<id>.collapsed`` - sampled ``frame;frame;frame count`` stacks, the
+  input format of flamegraph.pl and speedscope
+
+The id is returned in the ``X-Profile-Id`` response header. Only one
+request per process is profiled at a time (cProfile cannot run twice);
+an opted-in request that finds the profiler busy is served normally with
+``X-Profile-Id: busy``. Streamed response bodies are produced after the
+profile is written and are not covered.
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request
+from flask_login import current_user
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}'
+
+
+class StackSampler:
+    """Samples one thread's Python stack every interval seconds into collapsed form"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w') as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f'{stack} {count}\n')
+
+
+class RequestProfiler:
+    def __init__(self, app=None, output_dir='profiles', sample_interval_ms=5):
+        self.enabled = True
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval_ms / 1000.0
+        self.profiled = 0
+        self.busy_skips = 0
+        self._busy = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILE_ENABLED', self.enabled)
+        self.output_dir = app.config.get('PROFILE_DIR', self.output_dir)
+        self.sample_interval = app.config.get('PROFILE_SAMPLE_INTERVAL_MS', self.sample_interval * 1000) / 1000.0
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['request_profiler'] = self
+
+    @staticmethod
+    def _requested():
+        flag = request.headers.get('X-Profile') or request.args.get('_profile')
+        return flag in ('1', 'true', 'yes')
+
+    def _before_request(self):
+        if not self.enabled or not self._requested():
+            return
+        if not (current_user.is_authenticated and current_user.role == 'admin'):
+            return
+        if not self._busy.acquire(blocking=False):
+            self.busy_skips += 1
+            g.profile_id = 'busy'
+            return
+
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        profile = cProfile.Profile()
+        g.request_profile = (profile, sampler, time.perf_counter())
+        sampler.start()
+        profile.enable()
+
+    def _finish(self):
+        state = g.pop('request_profile', None)
+        if state is None:
+            return None
+        profile, sampler, started = state
+        try:
+            profile.disable()
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unknown')
+            profile_id = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{endpoint}-{elapsed_ms:.0f}ms"
+            os.makedirs(self.output_dir, exist_ok=True)
+            profile.dump_stats(os.path.join(self.output_dir, f'{profile_id}.pstats'))
+            sampler.write(os.path.join(self.output_dir, f'{profile_id}.collapsed'))
+            self.profiled += 1
+            return profile_id
+        except Exception as e:
+            print(f"Error writing request profile: {e}")
+            return None
+        finally:
+            self._busy.release()
+
+    def _after_request(self, response):
+        profile_id = self._finish() or g.pop('profile_id', None)
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    def _teardown_request(self, exc=None):
+        # after_request is skipped when the view raised; never leave the profiler running
+        self._finish()
+
+    def list_profiles(self, limit=50):
+        if not os.path.isdir(self.output_dir):
+            return []
+        names = sorted((name for name in os.listdir(self.output_dir) if name.endswith('.pstats')), reverse=True)
+        return [name[:-len('.pstats')] for name in names[:limit]]
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'output_dir': os.path.abspath(self.output_dir),
+            'sample_interval_ms': self.sample_interval * 1000,
+            'profiled': self.profiled,
+            'busy_skips': self.busy_skips,
+            'recent': self.list_profiles(10)
+        }
+
+
+request_profiler = RequestProfiler()
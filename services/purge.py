@@ -0,0 +1,177 @@
+"""
+Background purge of a deleted user's history.
+
+Account deletion only marks the user deleted and records a job in
+purge_jobs; this worker then removes emotion_data and wellness_activities
+in bounded _id-range chunks with a pause between chunks, so a large purge
+never runs as one long delete_many. Each chunk continues after the last
+_id of the previous one on a (user_id, _id) index. Jobs are claimed with a lease, so any
+worker process (or 'flask emotion-data purge-deleted') can pick up work a
+crashed process left behind.
+
+The worker thread is started when the app boots and then looks for
+claimable jobs every PURGE_POLL_SECONDS, so failed jobs and expired leases
+are retried without waiting for the next account deletion; a deletion
+wakes it immediately.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+PURGED_COLLECTIONS = ('emotion_data', 'wellness_activities')
+
+
+def _user_id_values(user_id):
+    # Records have been written with both ObjectId and string user ids
+    user_id = str(user_id)
+    if ObjectId.is_valid(user_id):
+        return [ObjectId(user_id), user_id]
+    return [user_id]
+
+
+class PurgeWorker:
+    def __init__(self, app=None, chunk_size=1000, throttle=0.2, lease_seconds=300, poll_seconds=60):
+        self.chunk_size = chunk_size
+        self.throttle = throttle
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._thread = None
+        self._wake = threading.Event()
+        self._indexed = False
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.chunk_size = app.config.get('PURGE_CHUNK_SIZE', self.chunk_size)
+        self.throttle = app.config.get('PURGE_THROTTLE_SECONDS', self.throttle)
+        self.lease_seconds = app.config.get('PURGE_LEASE_SECONDS', self.lease_seconds)
+        self.poll_seconds = app.config.get('PURGE_POLL_SECONDS', self.poll_seconds)
+        app.extensions['purge_worker'] = self
+
+    def mark_deleted(self, db, user_id):
+        """Soft-delete a user and queue the purge of their history"""
+        now = datetime.utcnow()
+        db.users.update_one(
+            {'_id': ObjectId(str(user_id))},
+            {'$set': {'deleted': True, 'deleted_at': now}}
+        )
+        db.purge_jobs.update_one(
+            {'user_id': str(user_id)},
+            {'$setOnInsert': {
+                'user_id': str(user_id),
+                'status': 'pending',
+                'deleted_count': 0,
+                'created_at': now,
+                'lease_until': now
+            }},
+            upsert=True
+        )
+
+    def start(self, db):
+        """Run pending jobs on a background thread (one per process), or wake the running one"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._wake.set()
+                return
+            self._thread = threading.Thread(target=self._loop, args=(db,),
+                                            name='purge-worker', daemon=True)
+            self._thread.start()
+
+    def _loop(self, db):
+        while True:
+            # Cleared before the pass, so a wake-up during it triggers another pass
+            self._wake.clear()
+            try:
+                self.run_pending(db)
+            except Exception as e:
+                print(f"Purge worker pass failed: {e}")
+            self._wake.wait(self.poll_seconds)
+
+    def _claim(self, db):
+        now = datetime.utcnow()
+        return db.purge_jobs.find_one_and_update(
+            {'status': {'$in': ['pending', 'running']}, 'lease_until': {'$lte': now}},
+            {'$set': {
+                'status': 'running',
+                'lease_until': now + timedelta(seconds=self.lease_seconds),
+                'started_at': now
+            }},
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def run_pending(self, db):
+        """Process jobs until none are claimable; returns jobs completed"""
+        completed = 0
+        while True:
+            job = self._claim(db)
+            if job is None:
+                return completed
+            try:
+                self.purge_user(db, job)
+                completed += 1
+            except Exception as e:
+                print(f"Error purging user {job['user_id']}: {e}")
+                db.purge_jobs.update_one(
+                    {'_id': job['_id']},
+                    {'$set': {'status': 'pending', 'error': str(e), 'lease_until': datetime.utcnow()}}
+                )
+                return completed
+
+    def ensure_indexes(self, db):
+        """(user_id, _id) index so each chunk is an index range scan, not a collection scan"""
+        if self._indexed:
+            return
+        for name in PURGED_COLLECTIONS:
+            try:
+                db[name].create_index([('user_id', 1), ('_id', 1)])
+            except Exception as e:
+                print(f"Could not create purge index on {name}: {e}")
+        self._indexed = True
+
+    def purge_user(self, db, job):
+        user_values = _user_id_values(job['user_id'])
+        deleted = job.get('deleted_count', 0)
+        self.ensure_indexes(db)
+
+        for name in PURGED_COLLECTIONS:
+            collection = db[name]
+            last_id = None
+            while True:
+                # Resume after the previous chunk instead of rescanning from the start
+                chunk_filter = {'user_id': {'$in': user_values}}
+                if last_id is not None:
+                    chunk_filter['_id'] = {'$gt': last_id}
+                ids = [doc['_id'] for doc in collection.find(chunk_filter, {'_id': 1})
+                       .sort('_id', 1).limit(self.chunk_size)]
+                if not ids:
+                    break
+                last_id = ids[-1]
+
+                result = collection.delete_many({
+                    'user_id': {'$in': user_values},
+                    '_id': {'$gte': ids[0], '$lte': ids[-1]}
+                })
+                deleted += result.deleted_count
+                db.purge_jobs.update_one(
+                    {'_id': job['_id']},
+                    {'$set': {
+                        'deleted_count': deleted,
+                        'lease_until': datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+                    }}
+                )
+                if self.throttle:
+                    time.sleep(self.throttle)
+
+        db.users.delete_one({'_id': ObjectId(job['user_id']), 'deleted': True})
+        db.purge_jobs.update_one(
+            {'_id': job['_id']},
+            {'$set': {'status': 'done', 'finished_at': datetime.utcnow(), 'deleted_count': deleted}}
+        )
+
+
+purge_worker = PurgeWorker()
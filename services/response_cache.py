@@ -0,0 +1,154 @@
+"""
+Conditional GET and response caching for per-user dashboard APIs.
+
+Each user has version stamps in the data_versions collection, bumped on
+every emotion or wellness-activity write. The @conditional decorator
+derives an ETag from the stamps a view depends on (plus the UTC date for
+views with "today"/"last 7 days" windows), answers If-None-Match /
+If-Modified-Since with 304 before the view runs, and otherwise serves a
+per-process cached body for the same ETag instead of re-running the
+aggregations.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_login import current_user
+
+from services.db_utils import get_db
+
+VERSION_KINDS = ('emotion', 'activity')
+
+
+def bump_version(db, user_id, kind, count=1):
+    """Record that a user's ``kind`` data changed"""
+    db.data_versions.update_one(
+        {'_id': str(user_id)},
+        {'$inc': {kind: count}, '$set': {f'{kind}_at': datetime.utcnow().replace(microsecond=0)}},
+        upsert=True
+    )
+
+
+def bump_versions_bulk(db, counts, kind):
+    """bump_version for many users in one round trip ({user_id: count})"""
+    from pymongo import UpdateOne
+
+    now = datetime.utcnow().replace(microsecond=0)
+    operations = [
+        UpdateOne({'_id': str(user_id)}, {'$inc': {kind: count}, '$set': {f'{kind}_at': now}}, upsert=True)
+        for user_id, count in counts.items()
+    ]
+    if operations:
+        db.data_versions.bulk_write(operations, ordered=False)
+
+
+class ResponseCache:
+    def __init__(self, app=None, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', self.max_entries)
+        app.extensions['response_cache'] = self
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _etag_for(versions, kinds, daily):
+    parts = [str(current_user.id), request.endpoint, request.query_string.decode('latin-1')]
+    parts += [str(versions.get(kind, 0)) for kind in kinds]
+    if daily:
+        parts.append(datetime.utcnow().strftime('%Y-%m-%d'))
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _last_modified(versions, kinds):
+    stamps = [versions[f'{kind}_at'] for kind in kinds if versions.get(f'{kind}_at')]
+    return max(stamps) if stamps else None
+
+
+def conditional(kinds=('emotion',), daily=False):
+    """ETag/Last-Modified + server-side caching keyed by the user's version stamps"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if not current_app.config.get('CONDITIONAL_GET_ENABLED', True):
+                return view(*args, **kwargs)
+
+            versions = get_db().data_versions.find_one({'_id': str(current_user.id)}) or {}
+            etag = _etag_for(versions, kinds, daily)
+            last_modified = _last_modified(versions, kinds)
+
+            # Last-Modified only has second precision and no day rollover, so
+            # it is only trusted when the client sent no ETag
+            unchanged = request.if_none_match.contains_weak(etag) if request.if_none_match else (
+                not daily and last_modified is not None and request.if_modified_since is not None
+                and last_modified <= request.if_modified_since.replace(tzinfo=None)
+            )
+
+            if unchanged:
+                response = make_response('', 304)
+                response_cache.record_not_modified()
+            else:
+                cached = response_cache.get(etag)
+                if cached is not None:
+                    body, mimetype = cached
+                    response = current_app.response_class(body, mimetype=mimetype)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    payload = response.get_json(silent=True) if response.is_json else None
+                    failed = isinstance(payload, dict) and payload.get('success') is False
+                    if response.status_code != 200 or failed:
+                        return response
+                    response_cache.set(etag, (response.get_data(), response.mimetype))
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Stage-level latency histograms, Server-Timing headers and /metrics.
+
+Wrap a unit of work in ``with stage('detect'):`` anywhere during a
+request. The duration is added to a Prometheus histogram labelled by
+endpoint and stage, and listed in that response's Server-Timing header
+together with the request's Mongo time (from services/db_metrics.py) and
+total time. /metrics renders the histograms plus the counters kept by the
+other services in Prometheus text format. Values are per worker process;
+scrape each worker or aggregate by instance.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, abort, current_app, g, has_request_context, request
+from flask_login import current_user
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Histogram:
+    def __init__(self, name, documentation, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                labels = list(zip(self.label_names, label_values))
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{_label_text(labels + [("le", bound)])} {count}')
+                lines.append(f'{self.name}_bucket{_label_text(labels + [("le", "+Inf")])} {series[-1]}')
+                lines.append(f'{self.name}_sum{_label_text(labels)} {series[-2]:.6f}')
+                lines.append(f'{self.name}_count{_label_text(labels)} {series[-1]}')
+        return lines
+
+
+def _endpoint():
+    return (request.endpoint or 'unknown') if has_request_context() else 'background'
+
+
+class StageMetrics:
+    def __init__(self, app=None):
+        self.stages = Histogram('hemanx_stage_duration_seconds',
+                                'Time spent in a processing stage.', ('endpoint', 'stage'))
+        self.requests = Histogram('hemanx_request_duration_seconds',
+                                  'Total request handling time.', ('endpoint', 'status'))
+        self.db = Histogram('hemanx_request_db_seconds',
+                            'MongoDB time per request.', ('endpoint',))
+        self._collectors = []
+        self.server_timing = True
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.server_timing = app.config.get('SERVER_TIMING_ENABLED', True)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['stage_metrics'] = self
+        if not self._collectors:
+            self.register_collector(service_metrics)
+
+    def register_collector(self, collector):
+        """collector() -> iterable of (metric_name, type, help, [(labels, value)])"""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages.observe(elapsed, _endpoint(), name)
+            if has_request_context():
+                timings = g.setdefault('stage_timings', [])
+                timings.append((name, elapsed))
+
+    def _before_request(self):
+        g.request_started = time.perf_counter()
+
+    def _after_request(self, response):
+        started = g.pop('request_started', None)
+        if started is None or request.endpoint in ('metrics', 'static', 'assets'):
+            return response
+
+        total = time.perf_counter() - started
+        endpoint = _endpoint()
+        self.requests.observe(total, endpoint, str(response.status_code))
+
+        entries = []
+        for name, elapsed in g.pop('stage_timings', []):
+            entries.append(f'{name};dur={elapsed * 1000:.1f}')
+
+        from services.db_metrics import db_metrics
+        db_stats = db_metrics.current()
+        if db_stats is not None:
+            self.db.observe(db_stats.db_time, endpoint)
+            entries.append(f'db;dur={db_stats.db_time * 1000:.1f};desc="{db_stats.queries} queries"')
+
+        entries.append(f'total;dur={total * 1000:.1f}')
+        if self.server_timing:
+            response.headers.add('Server-Timing', ', '.join(entries))
+        return response
+
+    def render(self):
+        lines = []
+        for histogram in (self.stages, self.requests, self.db):
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            try:
+                for name, metric_type, documentation, samples in collector():
+                    lines.append(f'# HELP {name} {documentation}')
+                    lines.append(f'# TYPE {name} {metric_type}')
+                    for labels, value in samples:
+                        lines.append(f'{name}{_label_text(labels)} {value}')
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        """Prometheus scrape endpoint (bearer METRICS_TOKEN, or an admin session)"""
+        token = current_app.config.get('METRICS_TOKEN')
+        if token:
+            if request.headers.get('Authorization') != f'Bearer {token}':
+                abort(401)
+        elif not (current_user.is_authenticated and current_user.role == 'admin'):
+            abort(403)
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def service_metrics():
+    """Counters already kept by the caches, hasher and admission controller"""
+    from services.admission import admission
+    from services.password_hasher import password_hasher
+    from services.response_cache import response_cache
+    from services.user_cache import user_cache
+
+    users = user_cache.stats()
+    yield ('hemanx_user_cache_lookups_total', 'counter', 'User loader cache lookups.',
+           [([('result', 'hit')], users['hits']), ([('result', 'miss')], users['misses'])])
+    yield ('hemanx_user_cache_entries', 'gauge', 'Users currently cached.', [([], users['size'])])
+
+    responses = response_cache.stats()
+    yield ('hemanx_response_cache_lookups_total', 'counter', 'Conditional GET cache lookups.',
+           [([('result', 'hit')], responses['hits']), ([('result', 'miss')], responses['misses']),
+            ([('result', 'not_modified')], responses['not_modified'])])
+
+    hasher = password_hasher.stats()
+    yield ('hemanx_password_hasher_in_flight', 'gauge', 'bcrypt jobs queued or running.',
+           [([], hasher['in_flight'])])
+    yield ('hemanx_password_hasher_jobs_total', 'counter', 'bcrypt jobs by outcome.',
+           [([('outcome', 'completed')], hasher['completed']), ([('outcome', 'rejected')], hasher['rejected']),
+            ([('outcome', 'upgraded')], hasher['upgraded'])])
+
+    gate = admission.stats()
+    yield ('hemanx_admission_in_flight', 'gauge', 'Analysis requests in progress.',
+           [([('kind', kind)], count) for kind, count in sorted(gate['in_flight'].items())])
+    decisions = [([('kind', kind), ('decision', 'admitted'), ('bucket', '')], count)
+                 for kind, count in sorted(gate['admitted'].items())]
+    for key, count in sorted(gate['rejected'].items()):
+        kind, _, bucket = key.partition(':')
+        decisions.append(([('kind', kind), ('decision', 'rejected'), ('bucket', bucket)], count))
+    yield ('hemanx_admission_decisions_total', 'counter', 'Admission decisions by route kind.', decisions)
+
+
+stage_metrics = StageMetrics()
+stage = stage_metrics.stage
@@ -0,0 +1,166 @@
+"""
+Per-worker CPU thread budget for torch, TensorFlow, OpenCV and BLAS/OpenMP.
+
+Each of those libraries sizes its thread pools to the machine's core count,
+so N gunicorn workers on C cores start up to N x C threads per library and
+spend their time context switching. The budget gives every worker
+cores // workers threads (at least one) and hands the same number to each
+library, because only one analysis runs per request thread at a time:
+
+* OMP/MKL/OpenBLAS/NumExpr/vecLib/OpenCV environment limits, set in
+  create_app before any of them is imported (they read these once, at
+  load time; TF_NUM_INTRAOP/INTEROP_THREADS likewise for TensorFlow)
+* torch.set_num_threads / set_num_interop_threads, cv2.setNumThreads and,
+  when threadpoolctl is installed, the BLAS pools it finds, re-applied each
+  time a lazy ML module finishes loading (services/lazy_loader.py)
+
+The plan is printed at startup and the effective values are printed again
+whenever a library is first seen; /admin/api/thread-budget returns both.
+"""
+import os
+import sys
+import threading
+
+ENV_LIMITS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS',
+              'VECLIB_MAXIMUM_THREADS', 'OPENCV_FOR_THREADS_NUM')
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def native_thread_count():
+    """OS threads in this process (Python and native pools), None where /proc is missing"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class ThreadBudget:
+    def __init__(self, app=None):
+        self.enabled = True
+        self.cores = available_cores()
+        self.workers = 1
+        self.intra_op = 1
+        self.inter_op = 1
+        self.opencv = 1
+        self._configured = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('THREAD_BUDGET_ENABLED', True)
+        self.cores = app.config.get('THREAD_BUDGET_CORES') or available_cores()
+        self.workers = max(1, app.config.get('THREAD_BUDGET_WORKERS') or 1)
+        per_worker = app.config.get('THREAD_BUDGET_PER_WORKER') or max(1, self.cores // self.workers)
+        self.intra_op = per_worker
+        self.inter_op = app.config.get('THREAD_BUDGET_INTEROP', 1)
+        self.opencv = app.config.get('THREAD_BUDGET_OPENCV') or per_worker
+        app.extensions['thread_budget'] = self
+
+        if self.enabled:
+            self.apply_environment()
+            self.apply_loaded_libraries()
+            print(f"Thread budget: {self.cores} cores / {self.workers} workers -> "
+                  f"intra-op {self.intra_op}, inter-op {self.inter_op}, OpenCV {self.opencv} per worker")
+
+            from services.lazy_loader import on_load
+            on_load(self.apply_loaded_libraries)
+
+    def apply_environment(self):
+        """Limits read by the native libraries when they load; explicit env settings win"""
+        for name in ENV_LIMITS:
+            value = self.opencv if name == 'OPENCV_FOR_THREADS_NUM' else self.intra_op
+            os.environ.setdefault(name, str(value))
+        os.environ.setdefault('TF_NUM_INTRAOP_THREADS', str(self.intra_op))
+        os.environ.setdefault('TF_NUM_INTEROP_THREADS', str(self.inter_op))
+
+    def apply_loaded_libraries(self):
+        """Configure every budgeted library that has been imported since the last call"""
+        if not self.enabled:
+            return
+        with self._lock:
+            newly = []
+            if 'torch' in sys.modules and 'torch' not in self._configured:
+                self._configure_torch(sys.modules['torch'])
+                newly.append('torch')
+            if 'tensorflow' in sys.modules and 'tensorflow' not in self._configured:
+                self._configure_tensorflow(sys.modules['tensorflow'])
+                newly.append('tensorflow')
+            if 'cv2' in sys.modules and 'cv2' not in self._configured:
+                sys.modules['cv2'].setNumThreads(self.opencv)
+                newly.append('cv2')
+            # torch and TF bring their own OpenMP/MKL copies, so limit native pools again after them
+            if 'numpy' in sys.modules and (newly or 'blas' not in self._configured):
+                if self._configure_blas() and 'blas' not in self._configured:
+                    newly.append('blas')
+            self._configured.update(newly)
+        if newly:
+            print(f"Thread budget applied to {', '.join(newly)}: {self.effective()}")
+
+    def _configure_torch(self, torch):
+        torch.set_num_threads(self.intra_op)
+        try:
+            torch.set_num_interop_threads(self.inter_op)
+        except RuntimeError:
+            # Only allowed before the first inter-op parallel work; the env limits cover that case
+            pass
+
+    def _configure_tensorflow(self, tf):
+        try:
+            tf.config.threading.set_intra_op_parallelism_threads(self.intra_op)
+            tf.config.threading.set_inter_op_parallelism_threads(self.inter_op)
+        except RuntimeError:
+            # The runtime is already initialised; it was started with TF_NUM_*_THREADS
+            pass
+
+    def _configure_blas(self):
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            return False
+        threadpool_limits(limits=self.intra_op)
+        return True
+
+    def effective(self):
+        """Thread settings as the libraries report them now"""
+        settings = {'env': {name: os.environ.get(name) for name in ENV_LIMITS + ('TF_NUM_INTRAOP_THREADS',
+                                                                             'TF_NUM_INTEROP_THREADS')}}
+        if 'torch' in sys.modules:
+            torch = sys.modules['torch']
+            settings['torch'] = {'intra_op': torch.get_num_threads(), 'inter_op': torch.get_num_interop_threads()}
+        if 'tensorflow' in sys.modules:
+            threading_config = sys.modules['tensorflow'].config.threading
+            settings['tensorflow'] = {'intra_op': threading_config.get_intra_op_parallelism_threads(),
+                                      'inter_op': threading_config.get_inter_op_parallelism_threads()}
+        if 'cv2' in sys.modules:
+            settings['opencv'] = sys.modules['cv2'].getNumThreads()
+        if 'threadpoolctl' in sys.modules:
+            settings['native_pools'] = [
+                {'library': pool.get('internal_api'), 'threads': pool.get('num_threads')}
+                for pool in sys.modules['threadpoolctl'].threadpool_info()
+            ]
+        return settings
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'cores': self.cores,
+            'workers': self.workers,
+            'per_worker': {'intra_op': self.intra_op, 'inter_op': self.inter_op, 'opencv': self.opencv},
+            'configured': sorted(self._configured),
+            'effective': self.effective(),
+            'process_threads': native_thread_count()
+        }
+
+
+thread_budget = ThreadBudget()
@@ -0,0 +1,109 @@
+"""
+Per-process cache for the Flask-Login user loader.
+
+load_user runs on every authenticated request (including every face frame),
+so the fields User needs are kept here for a short TTL instead of hitting
+mongo.db.users each time. Writes to a user document must call invalidate().
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Fields required to build a models.user.User - never cache the password hash
+USER_CACHE_FIELDS = ('email', 'name', 'role', 'created_at', 'badges', 'level', 'wellness_score')
+
+
+class UserCache:
+    def __init__(self, app=None, ttl=60, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('USER_CACHE_MAX_SIZE', self.max_size)
+        app.extensions['user_cache'] = self
+
+    @staticmethod
+    def projection():
+        """Mongo projection that fetches only the cached fields"""
+        return {field: 1 for field in USER_CACHE_FIELDS}
+
+    def get(self, user_id):
+        """Return cached user data or None on miss/expiry"""
+        if self.ttl <= 0:
+            return None
+
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user_data = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(user_data)
+
+    def set(self, user_id, user_data):
+        """Store the User fields of a users document"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+
+        key = str(user_id)
+        cached = {'_id': user_data['_id']}
+        for field in USER_CACHE_FIELDS:
+            if field in user_data:
+                cached[field] = user_data[field]
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id):
+        """Drop a user after their document changed"""
+        with self._lock:
+            if self._entries.pop(str(user_id), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit-rate metrics - every hit is a saved users.find_one"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'mongo_lookups_saved': self.hits,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+user_cache = UserCache()
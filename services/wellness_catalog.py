@@ -0,0 +1,232 @@
+"""
+Static wellness activity catalog.
+
+Built once at import and indexed by category and by emotion, so /wellness
+and the personalized-recommendations API do dictionary lookups instead of
+rebuilding these structures per request. The catalog cannot change while
+the process runs, so each rendered HTML fragment is cached for the life of
+the worker; a deploy with a new catalog starts new workers.
+"""
+import threading
+
+from flask import render_template
+from markupsafe import Markup
+
+# Wellness activities data, by category
+ACTIVITIES = {
+    'meditation': [
+        {
+            'title': '5-Minute Morning Meditation',
+            'description': 'Start your day with calm and focus',
+            'duration': '5 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'inpok4MKVLM'
+        },
+        {
+            'title': 'Stress Relief Meditation',
+            'description': 'Release tension and find peace',
+            'duration': '10 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'z6X5oEIg6Ak'
+        },
+        {
+            'title': 'Body Scan Meditation',
+            'description': 'Deep relaxation for mind and body',
+            'duration': '15 min',
+            'difficulty': 'Intermediate',
+            'youtube_id': 'ihO02wUzgkc'
+        },
+        {
+            'title': 'Mindfulness Meditation',
+            'description': 'Cultivate present moment awareness',
+            'duration': '20 min',
+            'difficulty': 'Intermediate',
+            'youtube_id': 'ZToicYcHIOU'
+        }
+    ],
+    'yoga': [
+        {
+            'title': 'Morning Yoga Flow',
+            'description': 'Energize your body and mind',
+            'duration': '15 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'VaoV1PrYft4'
+        },
+        {
+            'title': 'Yoga for Stress Relief',
+            'description': 'Gentle poses to calm your nervous system',
+            'duration': '20 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'COp7BR_Dvps'
+        },
+        {
+            'title': 'Evening Yoga Stretch',
+            'description': 'Unwind and prepare for restful sleep',
+            'duration': '15 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'BiWDsfZ3zbo'
+        },
+        {
+            'title': 'Power Yoga Workout',
+            'description': 'Build strength and flexibility',
+            'duration': '30 min',
+            'difficulty': 'Advanced',
+            'youtube_id': 'v7AYKMP6rOE'
+        }
+    ],
+    'breathing': [
+        {
+            'title': '4-7-8 Breathing',
+            'description': 'Calm anxiety and promote sleep',
+            'duration': '3 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'gz4G31LGyog'
+        },
+        {
+            'title': 'Box Breathing',
+            'description': 'Reduce stress and improve focus',
+            'duration': '5 min',
+            'difficulty': 'Beginner',
+            'youtube_id': 'tEmt1Znux58'
+        },
+        {
+            'title': 'Alternate Nostril Breathing',
+            'description': 'Balance energy and calm the mind',
+            'duration': '7 min',
+            'difficulty': 'Intermediate',
+            'youtube_id': '8VwufJrUhic'
+        },
+        {
+            'title': 'Wim Hof Breathing',
+            'description': 'Boost energy and immune system',
+            'duration': '10 min',
+            'difficulty': 'Advanced',
+            'youtube_id': 'tybOi4hjZFQ'
+        }
+    ]
+}
+
+# Badges system
+BADGES = [
+    {'name': '7 Days', 'icon': '🔥', 'description': 'Complete activities for 7 consecutive days'},
+    {'name': 'Zen Master', 'icon': '🧘', 'description': 'Complete 20 meditation sessions'},
+    {'name': 'Yoga Pro', 'icon': '🤸', 'description': 'Complete 15 yoga sessions'},
+    {'name': 'Breath Work', 'icon': '💨', 'description': 'Complete 10 breathing exercises'},
+    {'name': 'Early Bird', 'icon': '🌅', 'description': 'Complete morning activities 5 times'},
+    {'name': 'Night Owl', 'icon': '🌙', 'description': 'Complete evening activities 5 times'},
+]
+
+# Personalized activities, by emotion
+EMOTION_ACTIVITIES = {
+    'sad': [
+        {
+            'title': 'Uplifting Meditation',
+            'description': 'Boost your mood with positive affirmations',
+            'duration': '10 min',
+            'difficulty': 'Beginner',
+            'type': 'meditation',
+            'youtube_id': 'z6X5oEIg6Ak'
+        },
+        {
+            'title': 'Energizing Yoga Flow',
+            'description': 'Move your body to lift your spirits',
+            'duration': '15 min',
+            'difficulty': 'Beginner',
+            'type': 'yoga',
+            'youtube_id': 'VaoV1PrYft4'
+        }
+    ],
+    'angry': [
+        {
+            'title': 'Anger Release Meditation',
+            'description': 'Let go of frustration and find calm',
+            'duration': '10 min',
+            'difficulty': 'Beginner',
+            'type': 'meditation',
+            'youtube_id': 'z6X5oEIg6Ak'
+        },
+        {
+            'title': 'Calming Breathwork',
+            'description': 'Cool down with controlled breathing',
+            'duration': '5 min',
+            'difficulty': 'Beginner',
+            'type': 'breathing',
+            'youtube_id': 'tEmt1Znux58'
+        }
+    ],
+    'anxious': [
+        {
+            'title': 'Anxiety Relief Meditation',
+            'description': 'Ground yourself and find peace',
+            'duration': '15 min',
+            'difficulty': 'Beginner',
+            'type': 'meditation',
+            'youtube_id': 'ihO02wUzgkc'
+        },
+        {
+            'title': '4-7-8 Breathing',
+            'description': 'Calm your nervous system instantly',
+            'duration': '3 min',
+            'difficulty': 'Beginner',
+            'type': 'breathing',
+            'youtube_id': 'gz4G31LGyog'
+        }
+    ],
+    'happy': [
+        {
+            'title': 'Gratitude Meditation',
+            'description': 'Amplify your positive emotions',
+            'duration': '10 min',
+            'difficulty': 'Beginner',
+            'type': 'meditation',
+            'youtube_id': 'inpok4MKVLM'
+        },
+        {
+            'title': 'Joyful Yoga Flow',
+            'description': 'Celebrate your happiness with movement',
+            'duration': '20 min',
+            'difficulty': 'Intermediate',
+            'type': 'yoga',
+            'youtube_id': 'v7AYKMP6rOE'
+        }
+    ]
+}
+
+DEFAULT_EMOTION = 'happy'
+
+# Labels produced by the face/text/voice models that share a catalog entry
+EMOTION_ALIASES = {
+    'joy': 'happy',
+    'sadness': 'sad',
+    'anger': 'angry',
+    'fear': 'anxious'
+}
+
+ACTIVITIES_BY_CATEGORY = ACTIVITIES
+ACTIVITIES_BY_EMOTION = dict(EMOTION_ACTIVITIES)
+for _alias, _emotion in EMOTION_ALIASES.items():
+    ACTIVITIES_BY_EMOTION.setdefault(_alias, EMOTION_ACTIVITIES[_emotion])
+
+FRAGMENT_TEMPLATES = {
+    'activities': 'partials/wellness_activities.html',
+    'badges': 'partials/wellness_badges.html'
+}
+
+_fragments = {}
+_fragments_lock = threading.Lock()
+
+
+def activities_for_emotion(emotion):
+    """Catalog activities for an emotion (O(1) lookup)"""
+    return ACTIVITIES_BY_EMOTION.get((emotion or '').lower(), ACTIVITIES_BY_EMOTION[DEFAULT_EMOTION])
+
+
+def render_fragment(name):
+    """Rendered catalog HTML, rendered once per worker"""
+    fragment = _fragments.get(name)
+    if fragment is None:
+        fragment = Markup(render_template(FRAGMENT_TEMPLATES[name],
+                                          activities=ACTIVITIES_BY_CATEGORY, badges=BADGES))
+        with _fragments_lock:
+            _fragments[name] = fragment
+    return fragment
@@ -0,0 +1,54 @@
+"""
+Wellness scores (1-10) from face, text and voice emotion results.
+
+Kept free of Flask and model imports so the offline benchmarks can time
+the same scoring the comprehensive route uses.
+"""
+
+
+def calculate_comprehensive_wellness_score(emotion_data: dict) -> int:
+    """Calculate comprehensive wellness score from multiple emotion sources"""
+    scores = []
+    weights = []
+    
+    if 'face_emotion' in emotion_data:
+        emotion = emotion_data['face_emotion'].get('dominant_emotion', 'neutral')
+        confidence = emotion_data['face_emotion'].get('confidence', 50) / 100
+        scores.append(emotion_to_score(emotion))
+        weights.append(confidence)
+    
+    if 'text_emotion' in emotion_data:
+        emotion = emotion_data['text_emotion'].get('dominant_emotion', 'neutral')
+        confidence = emotion_data['text_emotion'].get('confidence', 0.5)
+        scores.append(emotion_to_score(emotion))
+        weights.append(confidence)
+    
+    if 'voice_emotion' in emotion_data:
+        emotion = emotion_data['voice_emotion'].get('dominant_emotion', 'neutral')
+        confidence = emotion_data['voice_emotion'].get('confidence', 0.5)
+        scores.append(emotion_to_score(emotion))
+        weights.append(confidence)
+    
+    if not scores:
+        return 5
+    
+    # Weighted average
+    weighted_sum = sum(score * weight for score, weight in zip(scores, weights))
+    total_weight = sum(weights)
+    
+    return int(weighted_sum / total_weight)
+
+
+def emotion_to_score(emotion: str) -> int:
+    """Convert emotion to wellness score (1-10)"""
+    emotion = emotion.lower()
+    
+    positive_emotions = ['joy', 'surprise', 'happy']
+    negative_emotions = ['anger', 'disgust', 'fear', 'sadness', 'sad', 'angry']
+    
+    if emotion in positive_emotions:
+        return 8
+    elif emotion in negative_emotions:
+        return 3
+    else:  # neutral
+        return 5
@@ -0,0 +1,122 @@
+"""
+In-flight counters shared by every worker process on this machine.
+
+Under gunicorn's sync workers each process serves one request at a time,
+so a per-process in-flight count never goes above 1 and says nothing about
+load. The gauge keeps one row per (name, pid) in a small SQLite file:
+a process only ever changes its own rows, readers sum the rows of
+processes that are still alive, and try_acquire checks the machine-wide
+total and increments in one BEGIN IMMEDIATE transaction. A process drops
+any rows left under its pid (a reused pid) the first time it connects.
+
+The file is scratch state (synchronous=OFF). When it is locked for longer
+than the timeout, reads fall back to None, acquires fail open and the
+error is printed, so a slow disk never turns into failed requests.
+"""
+import os
+import sqlite3
+import threading
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WorkerGauge:
+    def __init__(self, app=None, path='/tmp/hemanx_gauges.sqlite3', timeout=0.5):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ready_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.path = app.config.get('WORKER_GAUGE_PATH', self.path)
+        self._ready_pid = None
+        app.extensions['worker_gauge'] = self
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid() or self._local.path != self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            self._local.path = self.path
+        with self._lock:
+            if self._ready_pid != os.getpid():
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS gauges (name TEXT, pid INTEGER, count INTEGER, '
+                    'PRIMARY KEY (name, pid))'
+                )
+                connection.execute('DELETE FROM gauges WHERE pid = ?', (os.getpid(),))
+                self._ready_pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _total(connection, name):
+        rows = connection.execute('SELECT pid, count FROM gauges WHERE name = ?', (name,)).fetchall()
+        return sum(count for pid, count in rows if pid == os.getpid() or _alive(pid))
+
+    @staticmethod
+    def _change(connection, name, delta):
+        connection.execute(
+            'INSERT INTO gauges (name, pid, count) VALUES (?, ?, MAX(0, ?)) '
+            'ON CONFLICT (name, pid) DO UPDATE SET count = MAX(0, count + ?)',
+            (name, os.getpid(), delta, delta)
+        )
+
+    def add(self, name, delta):
+        """Change this process's count for ``name``"""
+        try:
+            self._change(self._connect(), name, delta)
+        except sqlite3.Error as e:
+            print(f"Worker gauge {name} not updated: {e}")
+
+    def value(self, name):
+        """Machine-wide count for ``name``; None when the gauge file cannot be read"""
+        try:
+            return self._total(self._connect(), name)
+        except sqlite3.Error as e:
+            print(f"Worker gauge {name} not readable: {e}")
+            return None
+
+    def try_acquire(self, name, limit):
+        """Increment ``name`` unless the machine-wide count is already at ``limit``"""
+        try:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            print(f"Worker gauge {name} unavailable, admitting: {e}")
+            self.add(name, 1)
+            return True
+        try:
+            if self._total(connection, name) >= limit:
+                connection.execute('ROLLBACK')
+                return False
+            self._change(connection, name, 1)
+            connection.execute('COMMIT')
+            return True
+        except sqlite3.Error as e:
+            connection.execute('ROLLBACK')
+            print(f"Worker gauge {name} unavailable, admitting: {e}")
+            self.add(name, 1)
+            return True
+
+    def release(self, name):
+        self.add(name, -1)
+
+
+worker_gauge = WorkerGauge()